@@ -0,0 +1,295 @@
+import re
+from functools import lru_cache
+from text_normalisierung import normalisiere_wort, vergleichsform, zerlege_woerter
+
+# Anzahl gleichzeitig vorgehaltener, kompilierter Matcher (je Frage einer)
+MATCHER_CACHE_GROESSE = 65536
+
+# Bis zu dieser Anzahl Begriffe ist eine Schleife mit 'in' schneller als ein regulärer Ausdruck
+MAX_BEGRIFFE_OHNE_MUSTER = 40
+
+# Kürzere Begriffe werden nie unscharf verglichen ("ohr" soll nicht "ohne" treffen)
+FUZZY_MIN_LAENGE = 5
+
+# Bis zu so vielen Wörtern werden für ein Synonym alle Schreibweisen (getrennt oder
+# zusammen je Wortgrenze) erzeugt; längere nur ganz getrennt und ganz zusammen
+MAX_WOERTER_SCHREIBWEISEN = 4
+
+def _schreibweisen(woerter):
+    """
+    Schreibweisen eines mehrteiligen Begriffs für den Vergleich mit der Antwort.
+
+    Zwischen zwei Wörtern des Synonyms darf die Antwort getrennt oder
+    zusammen schreiben ("blut druck" trifft "Blut Druck" und "Blutdruck").
+    """
+    if len(woerter) > MAX_WOERTER_SCHREIBWEISEN:
+        return {' '.join(woerter), ''.join(woerter)}
+    formen = {woerter[0]}
+    for wort in woerter[1:]:
+        formen = {form + trenner + wort for form in formen for trenner in (' ', '')}
+    return formen
+
+def _zeichen_masken(muster):
+    """Bitmasken je Zeichen: Bit i ist gesetzt, wenn muster[i] dieses Zeichen ist."""
+    masken = {}
+    for i, zeichen in enumerate(muster):
+        masken[zeichen] = masken.get(zeichen, 0) | (1 << i)
+    return masken
+
+def _bitparallele_distanz(masken, laenge, text):
+    """Levenshtein-Distanz zwischen einem vorbereiteten Muster und text (Myers/Hyyrö)."""
+    if not laenge:
+        return len(text)
+    voll = (1 << laenge) - 1
+    oberstes_bit = 1 << (laenge - 1)
+    plus, minus, distanz = voll, 0, laenge
+    for zeichen in text:
+        gleich = masken.get(zeichen, 0)
+        xv = gleich | minus
+        xh = (((gleich & plus) + plus) ^ plus) | gleich
+        h_plus = minus | (~(xh | plus) & voll)
+        h_minus = plus & xh
+        if h_plus & oberstes_bit:
+            distanz += 1
+        elif h_minus & oberstes_bit:
+            distanz -= 1
+        h_plus = ((h_plus << 1) | 1) & voll
+        h_minus = (h_minus << 1) & voll
+        plus = h_minus | (~(xv | h_plus) & voll)
+        minus = h_plus & xv
+    return distanz
+
+def levenshtein(a, b):
+    """
+    Berechnet die Levenshtein-Distanz zweier Wörter.
+
+    Bit-paralleler Algorithmus nach Myers/Hyyrö: Jede Spalte der DP-Matrix
+    wird als Bitvektor in einer Ganzzahl geführt, sodass je Zeichen von b
+    nur eine Handvoll Ganzzahloperationen anfallen statt len(a) Zellen.
+    """
+    return _bitparallele_distanz(_zeichen_masken(a), len(a), b)
+
+def _bigramme(wort):
+    return set(zip(wort, wort[1:]))
+
+class _BKKnoten:
+    __slots__ = ('begriff', 'masken', 'bigramme', 'kinder')
+
+    def __init__(self, begriff):
+        self.begriff = begriff
+        self.masken = _zeichen_masken(begriff)
+        self.bigramme = _bigramme(begriff)
+        self.kinder = {}
+
+    def distanz(self, wort):
+        return _bitparallele_distanz(self.masken, len(self.begriff), wort)
+
+class BKBaum:
+    """
+    Burkhard-Keller-Bäume über die Begriffe einer Frage für unscharfe Suche.
+
+    Kinder eines Knotens sind nach ihrer Distanz zum Knoten einsortiert.
+    Wegen der Dreiecksungleichung müssen bei einer Suche mit Toleranz d
+    nur Kinder mit Distanz im Bereich [k - d, k + d] besucht werden.
+    Zusätzlich gibt es je Wortlänge einen eigenen Baum: Ein Wort der Länge n
+    kann nur Begriffen der Länge n - d bis n + d ähneln. Vor jeder
+    Distanzberechnung werden außerdem die Bigramme verglichen: Jede
+    Bearbeitung erzeugt höchstens zwei neue Bigramme, fehlen einem Begriff
+    mehr als 2·d Bigramme des Worts, kann er nicht ähnlich genug sein.
+    """
+    __slots__ = ('_wurzeln', 'max_laenge')
+
+    def __init__(self, begriffe):
+        self._wurzeln = {}
+        self.max_laenge = max((len(b) for b in begriffe), default=0)
+        for begriff in begriffe:
+            self._einfuegen(begriff)
+
+    def _einfuegen(self, begriff):
+        knoten = self._wurzeln.get(len(begriff))
+        if knoten is None:
+            self._wurzeln[len(begriff)] = _BKKnoten(begriff)
+            return
+        while True:
+            distanz = knoten.distanz(begriff)
+            if distanz == 0:
+                return
+            kind = knoten.kinder.get(distanz)
+            if kind is None:
+                knoten.kinder[distanz] = _BKKnoten(begriff)
+                return
+            knoten = kind
+
+    def enthaelt_aehnliches(self, wort, max_distanz):
+        """Prüft, ob ein Begriff höchstens max_distanz Bearbeitungsschritte von wort entfernt ist."""
+        offen = [
+            self._wurzeln[laenge]
+            for laenge in range(len(wort) - max_distanz, len(wort) + max_distanz + 1)
+            if laenge in self._wurzeln
+        ]
+        if not offen:
+            return False
+        bigramme = _bigramme(wort)
+        erlaubt_fehlend = 2 * max_distanz
+        while offen:
+            knoten = offen.pop()
+            if len(knoten.bigramme - bigramme) > erlaubt_fehlend:
+                # Sicher zu weit entfernt; ohne genaue Distanz alle Kinder prüfen
+                offen.extend(knoten.kinder.values())
+                continue
+            distanz = knoten.distanz(wort)
+            if distanz <= max_distanz:
+                return True
+            for kind_distanz, kind in knoten.kinder.items():
+                if distanz - max_distanz <= kind_distanz <= distanz + max_distanz:
+                    offen.append(kind)
+        return False
+
+class AntwortMatcher:
+    """
+    Vorkompilierter Matcher für die Schlüsselwörter einer Frage.
+
+    Alle Synonyme (bzw. im Rückfall die Wörter der Musterlösung mit mehr als
+    zwei Zeichen) werden einmalig normalisiert (siehe text_normalisierung)
+    und zu einem einzigen
+    regulären Ausdruck zusammengefasst. Die Alternativen sind als Präfixbaum
+    verschachtelt (z.B. "blut(?:druck|zucker)"), sodass je Position der
+    Antwort nur ein Pfad verfolgt wird statt jedes Synonym einzeln. Bei
+    wenigen Begriffen genügt die vorbereitete Liste ohne Muster.
+    """
+    __slots__ = ('begriffe', 'stemming', 'max_tippfehler', '_muster', '_bk_baum')
+
+    def __init__(self, korrekte_antwort, synonyme, stemming=False, max_tippfehler=0):
+        """
+        Args:
+            korrekte_antwort (str): Die korrekte Antwort (für den Rückfall ohne Synonyme)
+            synonyme (Sequence): Liste der Synonym-Schlüsselwörter
+            stemming (bool): Ob zusätzlich häufige Wortendungen ignoriert werden
+            max_tippfehler (int): Erlaubte Levenshtein-Distanz je Begriff (0 = nur exakte Treffer)
+        """
+        self.stemming = stemming
+        self.max_tippfehler = max_tippfehler
+        if not synonyme or not synonyme[0]:
+            # Rückfall: Teile der korrekten Antwort mit mehr als zwei Zeichen
+            begriffe = {wort for wort in zerlege_woerter(korrekte_antwort, stemming) if len(wort) > 2}
+        else:
+            # Synonyme liegen mit Wortgrenzen vor (normalisiere_synonym), gekürzt wird je Wort.
+            # Leerzeichen und Bindestriche zählen nur innerhalb eines Synonyms nicht
+            begriffe = set()
+            for synonym in synonyme:
+                if not synonym or not synonym.strip():
+                    continue
+                woerter = zerlege_woerter(synonym, stemming)
+                if woerter:
+                    begriffe.update(_schreibweisen(woerter))
+                if stemming and len(woerter) > 1:
+                    # Auch zusammengeschrieben gekürzt ("kinderbetten" -> "kinderbett" neben "kindbett")
+                    begriffe.add(normalisiere_wort(''.join(zerlege_woerter(synonym)), stemming))
+
+        self.begriffe = tuple(sorted(begriffe, key=len, reverse=True))
+        self._muster = None
+        if len(self.begriffe) > MAX_BEGRIFFE_OHNE_MUSTER:
+            self._muster = re.compile(_praefixbaum_muster(self.begriffe))
+
+        self._bk_baum = None
+        if max_tippfehler > 0:
+            # Die Fenster in _passt_unscharf sind zusammengeschrieben, getrennte Schreibweisen entfallen
+            self._bk_baum = BKBaum([b for b in self.begriffe if len(b) >= FUZZY_MIN_LAENGE and ' ' not in b])
+
+    def passt(self, user_antwort):
+        """
+        Prüft, ob eines der Schlüsselwörter in der normalisierten Antwort vorkommt.
+
+        Ist max_tippfehler gesetzt und gibt es keinen exakten Treffer, wird
+        zusätzlich geprüft, ob eine Folge von Antwortwörtern einem Begriff
+        (ab FUZZY_MIN_LAENGE Zeichen) bis auf wenige Tippfehler entspricht.
+
+        Args:
+            user_antwort (str): Die Antwort des Benutzers
+
+        Returns:
+            bool: True wenn die Antwort als korrekt bewertet wird
+        """
+        if not user_antwort or not isinstance(user_antwort, str):
+            return False
+        text, woerter = vergleichsform(user_antwort, self.stemming)
+        return self.passt_form(text, woerter)
+
+    def passt_form(self, text, woerter):
+        """
+        Wie passt(), aber für eine bereits mit vergleichsform() aufbereitete Antwort.
+
+        Args:
+            text (str): Vergleichsform der Antwort (mit gleichem stemming)
+            woerter (tuple): Normalisierte Wörter der Antwort
+
+        Returns:
+            bool: True wenn die Antwort als korrekt bewertet wird
+        """
+        if self._muster is not None:
+            if self._muster.search(text) is not None:
+                return True
+        elif any(begriff in text for begriff in self.begriffe):
+            return True
+        return self._bk_baum is not None and self._passt_unscharf(woerter)
+
+    def _passt_unscharf(self, woerter):
+        """
+        Sucht Fenster aus aufeinanderfolgenden Antwortwörtern im BK-Baum.
+
+        Ein Fenster wird so lange verlängert, wie es noch einem Begriff ähneln
+        kann; so werden auch auseinandergeschriebene Komposita gefunden.
+        """
+        grenze = self._bk_baum.max_laenge + self.max_tippfehler
+        for start in range(len(woerter)):
+            fenster = ''
+            for wort in woerter[start:]:
+                fenster += wort
+                if len(fenster) > grenze:
+                    break
+                if self._bk_baum.enthaelt_aehnliches(fenster, self.max_tippfehler):
+                    return True
+        return False
+
+def _praefixbaum_muster(begriffe):
+    """Baut aus den Begriffen einen Präfixbaum und daraus einen regulären Ausdruck."""
+    baum = {}
+    for begriff in begriffe:
+        knoten = baum
+        for zeichen in begriff:
+            knoten = knoten.setdefault(zeichen, {})
+        knoten[''] = {}  # Markiert das Ende eines Begriffs
+
+    def als_muster(knoten):
+        zweige = [re.escape(zeichen) + als_muster(kind) for zeichen, kind in sorted(knoten.items()) if zeichen]
+        if not zweige:
+            return ''
+        ist_ende = '' in knoten
+        if len(zweige) == 1 and not ist_ende:
+            return zweige[0]
+        gruppe = '(?:' + '|'.join(zweige) + ')'
+        return gruppe + '?' if ist_ende else gruppe
+
+    return als_muster(baum)
+
+@lru_cache(maxsize=MATCHER_CACHE_GROESSE)
+def _kompilierter_matcher(korrekte_antwort, synonyme, stemming, max_tippfehler):
+    return AntwortMatcher(korrekte_antwort, synonyme, stemming, max_tippfehler)
+
+def hole_matcher(korrekte_antwort, synonyme, stemming=False, max_tippfehler=0):
+    """
+    Gibt den kompilierten Matcher einer Frage zurück.
+
+    Jede Kombination aus Musterlösung und Synonymen wird nur einmal
+    kompiliert und danach aus einem begrenzten LRU-Cache bedient.
+
+    Args:
+        korrekte_antwort (str): Die korrekte Antwort
+        synonyme (Sequence): Liste der Synonym-Schlüsselwörter
+        stemming (bool): Ob zusätzlich häufige Wortendungen ignoriert werden
+        max_tippfehler (int): Erlaubte Levenshtein-Distanz je Begriff (0 = nur exakte Treffer)
+
+    Returns:
+        AntwortMatcher: Der Matcher der Frage
+    """
+    return _kompilierter_matcher(korrekte_antwort or "", tuple(synonyme or ()), stemming, max_tippfehler)
@@ -1,10 +1,12 @@
 import streamlit as st
-import os
-import zipfile
-import tempfile
-import shutil
-from file_handler import lade_fragen_aus_ordnern, lade_fragen_aus_upload
-from quiz_logic import QuizSession
+import instrumentierung
+from instrumentierung import gemessen
+from fragenstatistik import hole_fragenstatistik
+from katalog import FrageNichtVerfuegbar, aktualisiere_geteilten_katalog, hole_themen_index, lade_geteilten_katalog, lade_upload_katalog
+from pruefungsplan import STANDARD_PRUEFUNG_FRAGEN, Pruefungsplan
+from quiz_logic import QuizSession, WiederholungsSession
+from sitzungsbudget import hole_sitzungsregister
+from sitzungsspeicher import hole_sitzungsspeicher, neues_token
 
 # Sprachdaten für die Benutzeroberfläche
 SPRACHEN = {
@@ -30,6 +32,7 @@ SPRACHEN = {
         'navigation_help': '(a) Antwort eingeben, (z) Zurück, (ü) Themenübersicht, (s) Startseite',
         'correct': '✅ Richtig!',
         'incorrect': '❌ Falsch.',
+        'question_unavailable': 'Diese Frage ist nicht mehr verfügbar, weil sich ihr Thema geändert hat. Bitte Fragen neu laden und ein neues Quiz starten.',
         'model_answer': 'Musterlösung:',
         'results_title': '📊 Quiz-Ergebnisse',
         'score': 'Ergebnis',
@@ -51,6 +54,35 @@ SPRACHEN = {
         'load_from_folder': 'Fragen aus Ordner laden',
         'upload_new': 'Neue Fragen hochladen',
         'reload_questions': 'Fragen neu laden',
+        'topics_added': 'Neue Themen',
+        'topics_removed': 'Entfernte Themen',
+        'topics_updated': 'Aktualisierte Themen',
+        'no_changes': 'Keine Änderungen an den Fragen gefunden',
+        'start_repetition': 'Wiederholen',
+        'repetition_help': 'Karteikasten: Unsichere Fragen kommen öfter, gelernte seltener',
+        'learned': 'gelernt',
+        'statistics': 'Fragenstatistik',
+        'statistics_help': 'Welche Fragen und Themen allen Lernenden schwerfallen',
+        'statistics_empty': 'Noch keine Antworten erfasst',
+        'statistics_attempts': 'Erfasste Antworten',
+        'statistics_questions': 'Beantwortete Fragen',
+        'statistics_topics': 'Erfolgsquote je Thema',
+        'statistics_hardest': 'Schwierigste Fragen',
+        'statistics_missed': 'Am häufigsten falsch beantwortet',
+        'exam_size': 'Anzahl Prüfungsfragen',
+        'exam_distribution': 'Verteilung auf die Themen',
+        'distribution_proportional': 'Proportional zur Themengröße',
+        'distribution_custom': 'Eigene Quoten je Thema',
+        'exam_quota_rest': 'Verbleibende Fragen werden proportional auf Themen ohne Quote verteilt.',
+        'exam_seed': 'Seed (optional, gleiche Zahl = gleiche Prüfung)',
+        'debug_panel': 'Messwerte',
+        'debug_durations': 'Laufzeiten',
+        'debug_counters': 'Zähler',
+        'debug_download': 'Als Prometheus-Text herunterladen',
+        'debug_reset': 'Messwerte zurücksetzen',
+        'debug_sessions': 'Sitzungen',
+        'debug_sessions_total': 'Speicher aller Sitzungen',
+        'session_expired': 'Die Quiz-Sitzung war ruhend und passt nicht mehr zu den aktuellen Fragen. Bitte starte sie neu.',
         'further_options': 'Weitere Optionen',
         'topic_learning_help': 'Lerne gezielt einzelne Themen',
         'exam_help': 'Simulation einer echten Prüfung mit gemischten Fragen',
@@ -88,6 +120,7 @@ SPRACHEN = {
         'navigation_help': '(a) Cevap gir, (z) Geri, (ü) Konu genel bakışı, (s) Ana sayfa',
         'correct': '✅ Doğru!',
         'incorrect': '❌ Yanlış.',
+        'question_unavailable': 'Bu soru artık mevcut değil, çünkü konusu değişti. Lütfen soruları yeniden yükleyin ve yeni bir sınav başlatın.',
         'model_answer': 'Örnek çözüm:',
         'results_title': '📊 Quiz sonuçları',
         'score': 'Sonuç',
@@ -109,6 +142,35 @@ SPRACHEN = {
         'load_from_folder': 'Klasörden soru yükle',
         'upload_new': 'Yeni sorular yükle',
         'reload_questions': 'Soruları yeniden yükle',
+        'topics_added': 'Yeni konular',
+        'topics_removed': 'Kaldırılan konular',
+        'topics_updated': 'Güncellenen konular',
+        'no_changes': 'Sorularda değişiklik bulunamadı',
+        'start_repetition': 'Tekrarla',
+        'repetition_help': 'Kart kutusu: Emin olunmayan sorular daha sık, öğrenilenler daha seyrek gelir',
+        'learned': 'öğrenildi',
+        'statistics': 'Soru istatistikleri',
+        'statistics_help': 'Tüm öğrencilerin zorlandığı sorular ve konular',
+        'statistics_empty': 'Henüz cevap kaydedilmedi',
+        'statistics_attempts': 'Kaydedilen cevaplar',
+        'statistics_questions': 'Cevaplanan sorular',
+        'statistics_topics': 'Konu başına başarı oranı',
+        'statistics_hardest': 'En zor sorular',
+        'statistics_missed': 'En sık yanlış cevaplanan',
+        'exam_size': 'Sınav soru sayısı',
+        'exam_distribution': 'Konulara dağılım',
+        'distribution_proportional': 'Konu büyüklüğüne orantılı',
+        'distribution_custom': 'Konu başına özel kotalar',
+        'exam_quota_rest': 'Kalan sorular kotası olmayan konulara orantılı olarak dağıtılır.',
+        'exam_seed': 'Seed (isteğe bağlı, aynı sayı = aynı sınav)',
+        'debug_panel': 'Ölçüm değerleri',
+        'debug_durations': 'Süreler',
+        'debug_counters': 'Sayaçlar',
+        'debug_download': 'Prometheus metni olarak indir',
+        'debug_reset': 'Ölçüm değerlerini sıfırla',
+        'debug_sessions': 'Oturumlar',
+        'debug_sessions_total': 'Tüm oturumların belleği',
+        'session_expired': 'Quiz oturumu beklemedeydi ve artık güncel sorulara uymuyor. Lütfen yeniden başlat.',
         'further_options': 'Diğer Seçenekler',
         'topic_learning_help': 'Belirli konuları hedefli olarak öğren',
         'exam_help': 'Karışık sorularla gerçek sınav simülasyonu',
@@ -134,12 +196,19 @@ def init_session_state():
         st.session_state.alle_fragen = []
     if 'current_mode' not in st.session_state:
         st.session_state.current_mode = 'menu'
-    if 'temp_dir' not in st.session_state:
-        st.session_state.temp_dir = None
     if 'language' not in st.session_state:
         st.session_state.language = 'de'
     if 'quiz_ergebnisse' not in st.session_state:
         st.session_state.quiz_ergebnisse = None
+    if 'sitzung_token' not in st.session_state:
+        st.session_state.sitzung_token = None
+    if 'sitzungs_id' not in st.session_state:
+        # Kennung für das prozessweite Sitzungsregister (Speicherbudget)
+        st.session_state.sitzungs_id = neues_token()
+
+def get_themen_index():
+    """Gibt den vorberechneten Themenindex der geladenen Fragen zurück."""
+    return hole_themen_index(st.session_state.alle_fragen)
 
 def get_text(key):
     """Hilfsfunktion zum Abrufen von lokalisierten Texten."""
@@ -161,59 +230,43 @@ def show_language_selector():
         st.session_state.language = current_lang
         st.rerun()
 
-def cleanup_temp_dir():
-    """Bereinigt temporäre Verzeichnisse."""
-    if st.session_state.temp_dir and os.path.exists(st.session_state.temp_dir):
-        try:
-            shutil.rmtree(st.session_state.temp_dir)
-            st.session_state.temp_dir = None
-        except Exception:
-            pass
-
 def load_questions_from_directory():
-    """Lädt Fragen aus dem pflegepool-Verzeichnis."""
-    fragen = lade_fragen_aus_ordnern()
+    """Lädt Fragen aus dem pflegepool-Verzeichnis (prozessweit geteilt)."""
+    fragen = lade_geteilten_katalog()
     if fragen:
         st.session_state.alle_fragen = fragen
-        st.success(f"✅ {len(fragen)} {get_text('questions_loaded')} - {len(set(f['thema'] for f in fragen))} {get_text('available_topics').lower()}")
+        st.success(f"✅ {len(fragen)} {get_text('questions_loaded')} - {hole_themen_index(fragen).anzahl_themen} {get_text('available_topics').lower()}")
         return True
     else:
         st.error(f"❌ {get_text('no_questions')}")
         return False
 
+def reload_questions_from_directory():
+    """Übernimmt geänderte Themen in den geteilten Katalog und meldet die Änderungen."""
+    fragen, aenderungen = aktualisiere_geteilten_katalog()
+    if not fragen:
+        st.session_state.alle_fragen = []
+        st.error(f"❌ {get_text('no_questions')}")
+        return False
+    
+    st.session_state.alle_fragen = fragen
+    gemeldet = False
+    for schluessel, text_key in (('hinzugefuegt', 'topics_added'), ('entfernt', 'topics_removed'), ('aktualisiert', 'topics_updated')):
+        if aenderungen[schluessel]:
+            st.info(f"{get_text(text_key)}: {', '.join(sorted(aenderungen[schluessel]))}")
+            gemeldet = True
+    if not gemeldet:
+        st.info(get_text('no_changes'))
+    return True
+
+@gemessen('auswertung')
 def analyze_quiz_results(quiz_session):
-    """Analysiert die Quiz-Ergebnisse für detailliertes Feedback."""
-    if not quiz_session or not quiz_session.antwort_historie:
+    """Gibt die laufend in der QuizSession gepflegte Auswertung nach Themen zurück."""
+    if not quiz_session:
         return None
-    
-    results = {
-        'total_questions': len(quiz_session.antwort_historie),
-        'correct_answers': quiz_session.richtige_antworten,
-        'percentage': (quiz_session.richtige_antworten / len(quiz_session.antwort_historie)) * 100,
-        'topic_analysis': {}
-    }
-    
-    # Themen-spezifische Analyse
-    for i, (correct, question) in enumerate(zip(quiz_session.antwort_historie, quiz_session.fragen)):
-        thema = question['thema']
-        if thema not in results['topic_analysis']:
-            results['topic_analysis'][thema] = {'total': 0, 'correct': 0}
-        
-        results['topic_analysis'][thema]['total'] += 1
-        if correct:
-            results['topic_analysis'][thema]['correct'] += 1
-    
-    # Schwache Bereiche identifizieren
-    weak_topics = []
-    for thema, stats in results['topic_analysis'].items():
-        percentage = (stats['correct'] / stats['total']) * 100
-        if percentage < 70:  # Weniger als 70% richtig
-            weak_topics.append((thema, percentage, stats['total'] - stats['correct']))
-    
-    results['weak_topics'] = sorted(weak_topics, key=lambda x: x[1])  # Sortiert nach Prozentsatz
-    
-    return results
+    return quiz_session.auswertung()
 
+@gemessen('ansicht', ansicht='upload')
 def handle_file_upload():
     """Behandelt den Upload von Fragendateien."""
     st.subheader(f"📁 {get_text('mode_upload')}")
@@ -227,23 +280,8 @@ def handle_file_upload():
     
     if uploaded_file is not None:
         try:
-            # Cleanup previous temp directory
-            cleanup_temp_dir()
-            
-            # Create new temp directory
-            temp_dir = tempfile.mkdtemp()
-            st.session_state.temp_dir = temp_dir
-            
-            # Extract ZIP file
-            zip_path = os.path.join(temp_dir, "uploaded.zip")
-            with open(zip_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-            
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # Load questions from extracted files
-            fragen = lade_fragen_aus_upload(temp_dir)
+            # Fragen direkt aus dem Puffer lesen; identische Uploads teilen sich einen Katalog
+            fragen = lade_upload_katalog(uploaded_file.getbuffer())
             
             if fragen:
                 st.session_state.alle_fragen = fragen
@@ -256,6 +294,7 @@ def handle_file_upload():
         except Exception as e:
             st.error(f"❌ Fehler beim Verarbeiten der Datei: {str(e)}")
 
+@gemessen('ansicht', ansicht='menu')
 def show_main_menu():
     """Zeigt das Hauptmenü der Anwendung."""
     st.header(f"📋 {get_text('main_menu')}")
@@ -274,15 +313,14 @@ def show_main_menu():
         return
     
     # Statistiken anzeigen
-    themen = list(set(f['thema'] for f in st.session_state.alle_fragen))
+    index = get_themen_index()
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric(f"📚 {get_text('available_topics')}", len(themen))
+        st.metric(f"📚 {get_text('available_topics')}", index.anzahl_themen)
     with col2:
-        st.metric(f"❓ {get_text('total_questions')}", len(st.session_state.alle_fragen))
+        st.metric(f"❓ {get_text('total_questions')}", index.gesamt)
     with col3:
-        durchschnitt = len(st.session_state.alle_fragen) / len(themen) if themen else 0
-        st.metric(f"📊 {get_text('avg_per_topic')}", f"{durchschnitt:.1f}")
+        st.metric(f"📊 {get_text('avg_per_topic')}", f"{index.durchschnitt:.1f}")
     
     st.header(f"🎯 {get_text('mode_select')}")
     
@@ -310,8 +348,13 @@ def show_main_menu():
     
     with col2:
         if st.button(f"🔄 {get_text('reload_questions')}", use_container_width=True):
-            load_questions_from_directory()
+            reload_questions_from_directory()
+    
+    if st.button(f"📈 {get_text('statistics')}", use_container_width=True, help=get_text('statistics_help')):
+        st.session_state.current_mode = 'statistik'
+        st.rerun()
 
+@gemessen('ansicht', ansicht='lernmodus')
 def show_lernmodus():
     """Zeigt die Themenauswahl für den Lernmodus."""
     st.title(f"🎯 {get_text('mode_topic')} - {get_text('topic_overview')}")
@@ -322,7 +365,8 @@ def show_lernmodus():
     
     st.markdown("---")
     
-    themen = sorted(list(set(f['thema'] for f in st.session_state.alle_fragen)))
+    index = get_themen_index()
+    themen = index.themen
     
     if not themen:
         st.warning(get_text('no_questions'))
@@ -332,20 +376,29 @@ def show_lernmodus():
     
     # Verbesserte Themen-Anzeige mit Details
     for i, thema in enumerate(themen, 1):
-        fragen_zum_thema = [f for f in st.session_state.alle_fragen if f['thema'] == thema]
-        
         with st.container():
-            col1, col2, col3 = st.columns([3, 1, 1])
+            col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
             
             with col1:
                 st.write(f"**{i}. {thema}**")
             
             with col2:
-                st.write(f"📚 {len(fragen_zum_thema)} Fragen")
+                st.write(f"📚 {index.anzahl(thema)} Fragen")
             
             with col3:
                 if st.button(f"🚀 Starten", key=f"start_{i}", use_container_width=True):
-                    st.session_state.quiz_session = QuizSession(fragen_zum_thema, thema)
+                    st.session_state.quiz_session = QuizSession(
+                        st.session_state.alle_fragen, thema, indizes=index.indizes[thema]
+                    )
+                    st.session_state.current_mode = 'quiz'
+                    st.rerun()
+            
+            with col4:
+                if st.button(f"🔁 {get_text('start_repetition')}", key=f"wiederholen_{i}",
+                             use_container_width=True, help=get_text('repetition_help')):
+                    st.session_state.quiz_session = WiederholungsSession(
+                        st.session_state.alle_fragen, thema, indizes=index.indizes[thema]
+                    )
                     st.session_state.current_mode = 'quiz'
                     st.rerun()
             
@@ -360,14 +413,16 @@ def show_lernmodus():
         )
         
         if selected_thema:
-            fragen_zum_thema = [f for f in st.session_state.alle_fragen if f['thema'] == selected_thema]
-            st.info(f"📚 {selected_thema}: {len(fragen_zum_thema)} {get_text('question').lower()}")
+            st.info(f"📚 {selected_thema}: {index.anzahl(selected_thema)} {get_text('question').lower()}")
             
             if st.button(f"🚀 {get_text('start_quiz')}", type="primary", use_container_width=True):
-                st.session_state.quiz_session = QuizSession(fragen_zum_thema, selected_thema)
+                st.session_state.quiz_session = QuizSession(
+                    st.session_state.alle_fragen, selected_thema, indizes=index.indizes[selected_thema]
+                )
                 st.session_state.current_mode = 'quiz'
                 st.rerun()
 
+@gemessen('ansicht', ansicht='pruefung')
 def show_pruefungssimulation():
     """Zeigt die Prüfungssimulation."""
     st.title(f"📝 {get_text('mode_exam')}")
@@ -378,19 +433,52 @@ def show_pruefungssimulation():
     
     st.markdown("---")
     
-    total_fragen = len(st.session_state.alle_fragen)
-    themen_anzahl = len(set(f['thema'] for f in st.session_state.alle_fragen))
+    index = get_themen_index()
+    total_fragen = index.gesamt
+    themen_anzahl = index.anzahl_themen
     
     st.subheader(f"🎲 {get_text('all_topics')}")
     st.info(f"📊 {total_fragen} {get_text('question').lower()} - {themen_anzahl} {get_text('available_topics').lower()}")
     
     st.warning(f"⚠️ **{get_text('simulation_info')}**")
     
+    if total_fragen == 0:
+        return
+    
+    # Prüfungsplan: Umfang, Verteilung und Seed
+    gesamt = st.number_input(
+        get_text('exam_size'),
+        min_value=1,
+        max_value=total_fragen,
+        value=min(STANDARD_PRUEFUNG_FRAGEN, total_fragen)
+    )
+    verteilung = st.radio(
+        get_text('exam_distribution'),
+        ['proportional', 'custom'],
+        format_func=lambda x: get_text(f'distribution_{x}'),
+        horizontal=True
+    )
+    quoten = {}
+    if verteilung == 'custom':
+        st.caption(get_text('exam_quota_rest'))
+        for thema in index.themen:
+            anzahl = st.number_input(thema, min_value=0, max_value=index.anzahl(thema), value=0, key=f"quote_{thema}")
+            if anzahl:
+                quoten[thema] = anzahl
+    seed_text = st.text_input(get_text('exam_seed'))
+    seed = int(seed_text) if seed_text.strip().isdigit() else None
+    
     if st.button(f"🚀 {get_text('start_quiz')}", type="primary", use_container_width=True):
-        st.session_state.quiz_session = QuizSession(st.session_state.alle_fragen, get_text('mode_exam'), shuffle=True)
+        plan = Pruefungsplan(max(gesamt, sum(quoten.values())), quoten, seed)
+        # Bereits gemischt (mit dem Seed des Plans), daher ohne shuffle
+        st.session_state.quiz_session = QuizSession(
+            st.session_state.alle_fragen, get_text('mode_exam'), indizes=plan.ziehe_indizes(index)
+        )
+        st.session_state.pruefung_seed = plan.seed
         st.session_state.current_mode = 'quiz'
         st.rerun()
 
+@gemessen('ansicht', ansicht='quiz')
 def show_quiz():
     """Zeigt das Quiz-Interface."""
     if not st.session_state.quiz_session:
@@ -402,6 +490,8 @@ def show_quiz():
     
     # Header mit Fortschritt
     st.title(f"📚 {quiz.modus}")
+    if quiz.modus == get_text('mode_exam') and st.session_state.get('pruefung_seed') is not None:
+        st.caption(f"🎲 Seed: {st.session_state.pruefung_seed}")
     
     # Navigation Buttons (erweitert)
     nav_col1, nav_col2, nav_col3, nav_col4 = st.columns(4)
@@ -424,17 +514,11 @@ def show_quiz():
                 st.rerun()
     
     with nav_col3:
-        if quiz.current_index > 0:
+        # In der Wiederholung ist die Frage bereits neu eingeplant, daher kein Zurück
+        if quiz.current_index > 0 and not isinstance(quiz, WiederholungsSession):
             if st.button(f"⬅️ {get_text('back')}", use_container_width=True):
-                quiz.current_index -= 1
-                if quiz.antwort_historie:
-                    quiz.antwort_historie.pop()
-                    quiz.user_antworten.pop()
-                    # Richtige Antworten entsprechend anpassen
-                    if len(quiz.antwort_historie) > 0 and quiz.antwort_historie[-1]:
-                        quiz.richtige_antworten = sum(quiz.antwort_historie)
-                    else:
-                        quiz.richtige_antworten = max(0, quiz.richtige_antworten - 1)
+                # Nimmt die Antwort der vorherigen (und ggf. der aktuellen) Frage konsistent zurück
+                quiz.undo()
                 if hasattr(st.session_state, 'show_result'):
                     del st.session_state.show_result
                 st.rerun()
@@ -448,8 +532,15 @@ def show_quiz():
         st.info(f"💡 {get_text('navigation_help')}")
     
     # Fortschrittsbalken
-    progress = quiz.current_index / len(quiz.fragen) if quiz.fragen else 0
-    st.progress(progress, text=f"{get_text('question')} {quiz.current_index + 1} {get_text('of')} {len(quiz.fragen)}")
+    if isinstance(quiz, WiederholungsSession):
+        fortschritt = quiz.get_progress()
+        st.progress(
+            fortschritt['percentage'] / 100,
+            text=f"{fortschritt['current']} {get_text('of')} {fortschritt['total']} {get_text('learned')}"
+        )
+    else:
+        progress = quiz.current_index / len(quiz.fragen) if quiz.fragen else 0
+        st.progress(progress, text=f"{get_text('question')} {quiz.current_index + 1} {get_text('of')} {len(quiz.fragen)}")
     
     # Zwischenergebnis anzeigen
     if quiz.current_index > 0:
@@ -467,7 +558,11 @@ def show_quiz():
         return
     
     # Aktuelle Frage
-    current_question = quiz.get_current_question()
+    try:
+        current_question = quiz.get_current_question()
+    except FrageNichtVerfuegbar:
+        st.error(get_text('question_unavailable'))
+        return
     
     st.subheader(f"🏷️ {get_text('topic_label')} {current_question['thema']}")
     st.markdown(f"### ❓ {current_question['frage']}")
@@ -510,6 +605,7 @@ def show_answer_feedback(quiz, question, user_answer):
         st.error(get_text('incorrect'))
         st.info(f"**{get_text('model_answer')}** {question['antwort']}")
 
+@gemessen('ansicht', ansicht='ergebnis')
 def show_quiz_results(quiz):
     """Zeigt die finalen Quiz-Ergebnisse."""
     st.title(get_text('results_title'))
@@ -557,11 +653,13 @@ def show_quiz_results(quiz):
     with col1:
         if st.button(f"🔄 {get_text('repeat_quiz')}", use_container_width=True):
             # Reset quiz session with same questions
-            st.session_state.quiz_session = QuizSession(
+            st.session_state.quiz_session = type(quiz)(
                 quiz.original_fragen, 
                 quiz.modus, 
                 shuffle=(get_text('mode_exam') in quiz.modus)
             )
+            # Neu gemischt: Die Reihenfolge entspricht nicht mehr dem Seed
+            st.session_state.pruefung_seed = None
             st.rerun()
     
     with col2:
@@ -572,38 +670,203 @@ def show_quiz_results(quiz):
                 del st.session_state.show_result
             st.rerun()
 
+@gemessen('ansicht', ansicht='statistik')
+def show_fragenstatistik():
+    """Zeigt die über alle Sitzungen gesammelte Statistik der Fragen."""
+    st.title(f"📈 {get_text('statistics')}")
+    
+    if st.button(f"← {get_text('back')} {get_text('main_menu')}"):
+        st.session_state.current_mode = 'menu'
+        st.rerun()
+    
+    statistik = hole_fragenstatistik()
+    gesamt = statistik.gesamt()
+    if not gesamt['versuche']:
+        st.info(get_text('statistics_empty'))
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(get_text('statistics_attempts'), gesamt['versuche'])
+    with col2:
+        st.metric(get_text('statistics_questions'), gesamt['fragen'])
+    with col3:
+        st.metric(get_text('percentage'), f"{(gesamt['richtig'] / gesamt['versuche']) * 100:.1f}%")
+    
+    st.subheader(get_text('statistics_topics'))
+    st.dataframe([
+        {'Thema': thema, 'n': werte['versuche'], '%': round(werte['quote'], 1)}
+        for thema, werte in statistik.themen_quoten().items()
+    ], hide_index=True)
+    
+    def als_tabelle(eintraege):
+        return [
+            {
+                'Thema': eintrag['thema'],
+                get_text('question'): eintrag['frage'],
+                'n': eintrag['versuche'],
+                '✅': eintrag['richtig'],
+                '%': round(eintrag['quote'], 1),
+            }
+            for eintrag in eintraege
+        ]
+    
+    st.subheader(get_text('statistics_hardest'))
+    st.dataframe(als_tabelle(statistik.schwierigste()), hide_index=True)
+    st.subheader(get_text('statistics_missed'))
+    st.dataframe(als_tabelle(statistik.meist_verfehlt()), hide_index=True)
+
+def resume_quiz_session():
+    """Setzt eine gespeicherte Quiz-Sitzung fort, wenn die URL ein Sitzungs-Token enthält."""
+    speicher = hole_sitzungsspeicher()
+    token = st.query_params.get('sitzung')
+    if speicher is None or not token or st.session_state.quiz_session is not None:
+        return
+    if not st.session_state.alle_fragen:
+        return
+    
+    quiz = speicher.lade(token, st.session_state.alle_fragen)
+    if quiz is None:
+        # Unbekannt oder passt nicht mehr zum Katalog
+        del st.query_params['sitzung']
+        return
+    st.session_state.quiz_session = quiz
+    st.session_state.sitzung_token = token
+    st.session_state.current_mode = 'quiz'
+
+def persist_quiz_session():
+    """Merkt die laufende Quiz-Sitzung zum Speichern vor bzw. entfernt eine beendete."""
+    speicher = hole_sitzungsspeicher()
+    if speicher is None:
+        return
+    
+    quiz = st.session_state.quiz_session
+    token = st.session_state.sitzung_token
+    if quiz is None or st.session_state.current_mode != 'quiz':
+        if token:
+            speicher.loesche(token)
+            st.session_state.sitzung_token = None
+            st.query_params.pop('sitzung', None)
+        return
+    
+    if not token:
+        token = neues_token()
+        st.session_state.sitzung_token = token
+        st.query_params['sitzung'] = token
+    speicher.speichere(token, quiz)
+
+def show_debug_panel():
+    """Zeigt die gesammelten Messwerte in der Sidebar."""
+    with st.sidebar.expander(f"🛠️ {get_text('debug_panel')}"):
+        werte = instrumentierung.messwerte()
+        if werte['dauern']:
+            st.caption(get_text('debug_durations'))
+            st.dataframe([
+                {
+                    'name': eintrag['name'],
+                    'labels': ', '.join(f"{k}={v}" for k, v in eintrag['labels'].items()),
+                    'n': eintrag['anzahl'],
+                    'ø ms': round(eintrag['mittel_ms'], 2),
+                    'max ms': round(eintrag['max_ms'], 2),
+                    'letzte ms': round(eintrag['letzte_ms'], 2),
+                }
+                for eintrag in werte['dauern']
+            ], hide_index=True)
+        if werte['zaehler']:
+            st.caption(get_text('debug_counters'))
+            st.dataframe([
+                {
+                    'name': eintrag['name'],
+                    'labels': ', '.join(f"{k}={v}" for k, v in eintrag['labels'].items()),
+                    'wert': eintrag['wert'],
+                }
+                for eintrag in werte['zaehler']
+            ], hide_index=True)
+        
+        st.download_button(
+            get_text('debug_download'),
+            instrumentierung.prometheus_text(),
+            file_name='quizmaster_metrics.txt',
+            mime='text/plain'
+        )
+        if st.button(get_text('debug_reset')):
+            instrumentierung.zuruecksetzen()
+            st.rerun()
+        
+        uebersicht = hole_sitzungsregister().uebersicht()
+        st.caption(
+            f"{get_text('debug_sessions')}: {len(uebersicht['sitzungen'])} · "
+            f"{get_text('debug_sessions_total')}: {uebersicht['gesamt_bytes'] / 1024:.1f} KB"
+        )
+        if uebersicht['sitzungen']:
+            st.dataframe([
+                {
+                    'id': eintrag['id'][:8],
+                    'KB': round(eintrag['bytes'] / 1024, 1),
+                    'leerlauf s': eintrag['leerlauf_s'],
+                    'kompaktiert': eintrag['kompaktiert'],
+                    'art': eintrag['art'],
+                    'beantwortet': eintrag['beantwortet'],
+                }
+                for eintrag in uebersicht['sitzungen']
+            ], hide_index=True)
+
+@gemessen('rerun')
 def main():
     """Hauptfunktion der Anwendung."""
     init_session_state()
     
+    # Ruhende Sitzungen werden kompaktiert; vor der Benutzung wieder entpacken
+    register = hole_sitzungsregister()
+    if not register.betrete(st.session_state.sitzungs_id):
+        st.session_state.quiz_session = None
+        st.session_state.current_mode = 'menu'
+        st.warning(get_text('session_expired'))
+    
+    try:
+        show_app()
+    finally:
+        register.verlasse(st.session_state.sitzungs_id, st.session_state.quiz_session)
+
+def show_app():
+    """Baut die Seite für den aktuellen Modus auf."""
     # Sprachauswahl in der Sidebar
     show_language_selector()
     
-    # Aufräumen von temp-Ordnern beim Exit
-    cleanup_temp_dir()
+    # Messwerte nur bei QUIZMASTER_MESSUNG=1
+    if instrumentierung.AKTIV:
+        show_debug_panel()
     
     # Automatisches Laden von Fragen beim Start
     if not st.session_state.alle_fragen:
         load_questions_from_directory()
     
+    # Nach Neuladen der Seite eine gespeicherte Quiz-Sitzung fortsetzen
+    resume_quiz_session()
+    
     # Titel und Beschreibung (lokalisiert)
     st.title(get_text('title'))
     st.markdown(f"**{get_text('subtitle')}**")
     
-    # Navigation je nach Modus
-    if st.session_state.current_mode == 'menu':
-        show_main_menu()
-    elif st.session_state.current_mode == 'upload':
-        handle_file_upload()
-        if st.button(f"← {get_text('back')} {get_text('main_menu')}"):
-            st.session_state.current_mode = 'menu'
-            st.rerun()
-    elif st.session_state.current_mode == 'lernmodus':
-        show_lernmodus()
-    elif st.session_state.current_mode == 'pruefung':
-        show_pruefungssimulation()
-    elif st.session_state.current_mode == 'quiz':
-        show_quiz()
+    # Navigation je nach Modus; der Zustand wird auch bei st.rerun() gesichert
+    try:
+        if st.session_state.current_mode == 'menu':
+            show_main_menu()
+        elif st.session_state.current_mode == 'upload':
+            handle_file_upload()
+            if st.button(f"← {get_text('back')} {get_text('main_menu')}"):
+                st.session_state.current_mode = 'menu'
+                st.rerun()
+        elif st.session_state.current_mode == 'lernmodus':
+            show_lernmodus()
+        elif st.session_state.current_mode == 'pruefung':
+            show_pruefungssimulation()
+        elif st.session_state.current_mode == 'quiz':
+            show_quiz()
+        elif st.session_state.current_mode == 'statistik':
+            show_fragenstatistik()
+    finally:
+        persist_quiz_session()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
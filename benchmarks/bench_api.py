@@ -0,0 +1,129 @@
+"""
+Lasttest der JSON-Schnittstelle (quiz_api) ohne Netzwerk.
+
+Die ASGI-Anwendung wird direkt mit nachgebildeten Nachrichten aufgerufen,
+so wie es ein ASGI-Server tut. Gemessen werden damit die Kosten der
+Anwendung selbst (Routing, JSON, Bewertung, Sitzungen), unabhängig vom
+Server. Die Fragen stammen aus einem synthetischen Pool (pool_generator).
+
+Szenarien:
+  - bewerten: einzelne POST /bewerten
+  - bewerten_stapel: POST /bewerten mit --stapel Antworten je Anfrage
+  - sitzung: Sitzung anlegen, dann antworten/weiter bis zum Ende
+
+Aufruf (aus dem Projektordner):
+    python benchmarks/bench_api.py --fragen 100000 --anfragen 20000
+
+Für einen Test über HTTP genügt ein ASGI-Server (z.B. uvicorn quiz_api:app)
+und ein beliebiges Lastwerkzeug.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import quiz_api
+from katalog import lade_geteilten_katalog
+from pool_generator import WORTSCHATZ, schreibe_pool
+
+async def anfrage(app, methode, pfad, daten=None):
+    """Schickt eine Anfrage an die ASGI-Anwendung und gibt (Status, JSON) zurück."""
+    koerper = json.dumps(daten).encode('utf-8') if daten is not None else b''
+    pfad, _, query = pfad.partition('?')
+    scope = {'type': 'http', 'method': methode, 'path': pfad, 'query_string': query.encode('ascii')}
+    empfangen = False
+    antwort = {}
+
+    async def receive():
+        nonlocal empfangen
+        if empfangen:
+            return {'type': 'http.disconnect'}
+        empfangen = True
+        return {'type': 'http.request', 'body': koerper, 'more_body': False}
+
+    async def send(nachricht):
+        if nachricht['type'] == 'http.response.start':
+            antwort['status'] = nachricht['status']
+        else:
+            antwort['body'] = nachricht.get('body', b'')
+
+    await app(scope, receive, send)
+    return antwort['status'], json.loads(antwort['body']) if antwort['body'] else None
+
+def zufalls_antwort(rng):
+    return " ".join(rng.choice(WORTSCHATZ) for _ in range(8))
+
+async def lauf(app, args, anzahl_fragen):
+    rng = random.Random(args.seed)
+    ergebnisse = {}
+
+    def eintragen(name, dauer, anfragen):
+        ergebnisse[name] = {'sekunden': round(dauer, 4), 'anfragen_pro_sekunde': round(anfragen / dauer, 1)}
+        print(f"  {name:<18} {dauer:8.3f} s  {anfragen / dauer:12,.0f} Anfragen/s", file=sys.stderr)
+
+    start = time.perf_counter()
+    for _ in range(args.anfragen):
+        status, _ = await anfrage(app, 'POST', '/bewerten',
+                                  {'index': rng.randrange(anzahl_fragen), 'antwort': zufalls_antwort(rng)})
+        assert status == 200
+    eintragen('bewerten', time.perf_counter() - start, args.anfragen)
+
+    stapel_anfragen = max(1, args.anfragen // args.stapel)
+    start = time.perf_counter()
+    for _ in range(stapel_anfragen):
+        antworten = [{'index': rng.randrange(anzahl_fragen), 'antwort': zufalls_antwort(rng)} for _ in range(args.stapel)]
+        status, _ = await anfrage(app, 'POST', '/bewerten', {'antworten': antworten})
+        assert status == 200
+    eintragen('bewerten_stapel', time.perf_counter() - start, stapel_anfragen)
+
+    anfragen = 0
+    start = time.perf_counter()
+    while anfragen < args.anfragen:
+        status, sitzung = await anfrage(app, 'POST', '/sitzungen', {'art': 'pruefung', 'anzahl': args.sitzungs_fragen})
+        assert status == 201
+        token = sitzung['token']
+        anfragen += 1
+        while True:
+            status, _ = await anfrage(app, 'POST', f'/sitzungen/{token}/antwort', {'antwort': zufalls_antwort(rng)})
+            status, stand = await anfrage(app, 'POST', f'/sitzungen/{token}/weiter')
+            anfragen += 2
+            if stand['beendet']:
+                break
+        await anfrage(app, 'DELETE', f'/sitzungen/{token}')
+        anfragen += 1
+    eintragen('sitzung', time.perf_counter() - start, anfragen)
+    return ergebnisse
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fragen', type=int, default=100000, help="Größe des synthetischen Pools")
+    parser.add_argument('--themen', type=int, default=50)
+    parser.add_argument('--anfragen', type=int, default=20000, help="Anfragen je Szenario")
+    parser.add_argument('--stapel', type=int, default=100, help="Antworten je Stapel-Anfrage")
+    parser.add_argument('--sitzungs-fragen', type=int, default=40, help="Fragen je Prüfungssitzung")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    arbeits_ordner = tempfile.mkdtemp(prefix='quizmaster-api-bench-')
+    try:
+        pool_pfad = schreibe_pool(arbeits_ordner, themen=args.themen,
+                                  fragen_je_thema=max(1, args.fragen // args.themen), seed=args.seed)
+        fragen = lade_geteilten_katalog(pool_pfad)
+        quiz_api.POOL_PFAD = pool_pfad
+        print(f"{len(fragen)} Fragen:", file=sys.stderr)
+        ergebnisse = asyncio.run(lauf(quiz_api.app, args, len(fragen)))
+    finally:
+        shutil.rmtree(arbeits_ordner, ignore_errors=True)
+    json.dump({'parameter': vars(args), 'fragen': len(fragen), 'messungen': ergebnisse}, sys.stdout, indent=2)
+    print()
+
+if __name__ == "__main__":
+    main()
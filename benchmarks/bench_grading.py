@@ -0,0 +1,92 @@
+"""
+Benchmark: Bewertungsdurchsatz von validiere_antwort() bei vielen Synonymen.
+
+Vergleicht den vorkompilierten Matcher mit der früheren Schleife über alle
+Synonyme. Da der Matcher zusätzlich normalisiert, darf er mehr Antworten
+akzeptieren, aber keine ablehnen, die die frühere Schleife akzeptiert hat.
+
+Aufruf (aus dem Projektordner):
+    python benchmarks/bench_grading.py --synonyme 50 --antworten 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_handler import validiere_antwort
+
+WORTSCHATZ = [
+    "blutdruck", "messung", "puls", "atmung", "dekubitus", "prophylaxe", "lagerung",
+    "mobilisation", "hygiene", "desinfektion", "wundversorgung", "verband", "infusion",
+    "medikament", "dosierung", "pflegeplanung", "dokumentation", "ernährung", "flüssigkeit",
+    "schmerz", "beobachtung", "kontrolle", "vitalzeichen", "temperatur", "bewusstsein",
+]
+
+def naive_validierung(user_antwort, korrekte_antwort, synonyme):
+    """Die frühere Implementierung: eine Schleife mit strip().lower() je Synonym."""
+    if not user_antwort or not isinstance(user_antwort, str):
+        return False
+    user_antwort_lower = user_antwort.lower().strip()
+    if not synonyme or not synonyme[0]:
+        korrekte_antwort_lower = korrekte_antwort.lower()
+        return any(word in user_antwort_lower for word in korrekte_antwort_lower.split() if len(word) > 2)
+    for synonym in synonyme:
+        if synonym and synonym.strip() and synonym.strip().lower() in user_antwort_lower:
+            return True
+    return False
+
+def erzeuge_daten(anzahl_fragen, anzahl_synonyme, anzahl_antworten, antwort_woerter, seed):
+    rng = random.Random(seed)
+    fragen = []
+    for i in range(anzahl_fragen):
+        synonyme = [f"{rng.choice(WORTSCHATZ)}{rng.choice(WORTSCHATZ)}{i}-{j}" for j in range(anzahl_synonyme)]
+        fragen.append(("Musterlösung " + " ".join(rng.sample(WORTSCHATZ, 5)), synonyme))
+    paare = []
+    for _ in range(anzahl_antworten):
+        antwort, synonyme = rng.choice(fragen)
+        woerter = [rng.choice(WORTSCHATZ) for _ in range(antwort_woerter)]
+        if rng.random() < 0.3:
+            woerter.insert(rng.randrange(len(woerter) + 1), rng.choice(synonyme).upper())
+        paare.append((" ".join(woerter), antwort, synonyme))
+    return paare
+
+def messe(funktion, paare):
+    start = time.perf_counter()
+    urteile = [funktion(user, antwort, synonyme) for user, antwort, synonyme in paare]
+    return time.perf_counter() - start, urteile
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fragen', type=int, default=200)
+    parser.add_argument('--synonyme', type=int, default=50)
+    parser.add_argument('--antworten', type=int, default=20000)
+    parser.add_argument('--antwort-woerter', type=int, default=25)
+    parser.add_argument('--tippfehler', type=int, default=0, help="Erlaubte Tippfehler je Synonym")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    paare = erzeuge_daten(args.fragen, args.synonyme, args.antworten, args.antwort_woerter, args.seed)
+
+    def bewerte(user_antwort, korrekte_antwort, synonyme):
+        return validiere_antwort(user_antwort, korrekte_antwort, synonyme, max_tippfehler=args.tippfehler)
+
+    # Erster Durchlauf kompiliert die Matcher, der zweite misst den eingeschwungenen Zustand
+    zeit_kalt, _ = messe(bewerte, paare)
+    zeit_warm, urteile = messe(bewerte, paare)
+    zeit_naiv, urteile_naiv = messe(naive_validierung, paare)
+
+    if any(naiv and not neu for neu, naiv in zip(urteile, urteile_naiv)):
+        print("FEHLER: Matcher lehnt Antworten ab, die die frühere Schleife akzeptiert hat")
+        sys.exit(1)
+    zusaetzlich = sum(neu and not naiv for neu, naiv in zip(urteile, urteile_naiv))
+
+    print(f"{args.antworten} Antworten, {args.synonyme} Synonyme je Frage, {args.fragen} Fragen, {args.tippfehler} Tippfehler")
+    print(f"  zusätzlich akzeptiert durch Normalisierung: {zusaetzlich}")
+    for name, dauer in (("naive Schleife", zeit_naiv), ("Matcher (kalt)", zeit_kalt), ("Matcher (warm)", zeit_warm)):
+        print(f"  {name:<16} {dauer:8.3f} s  {args.antworten / dauer:12,.0f} Antworten/s")
+
+if __name__ == "__main__":
+    main()
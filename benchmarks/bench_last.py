@@ -0,0 +1,271 @@
+"""
+Lasttest der Streamlit-App mit gleichzeitigen Nutzern (Streamlit AppTest).
+
+Jeder simulierte Nutzer ist eine eigene AppTest-Sitzung in diesem Prozess,
+wie die Browser-Sitzungen eines Servers. Er durchläuft Hauptmenü ->
+show_lernmodus -> Quiz eines Themas -> show_quiz_results -> Hauptmenü und
+wartet zwischen zwei Interaktionen eine zufällige Denkzeit.
+
+AppTest erzeugt bei jedem Durchlauf die prozessweite Streamlit-Runtime neu
+und kann daher nicht aus mehreren Threads gleichzeitig laufen. Die Nutzer
+werden deshalb von einem Scheduler bedient: Jede Interaktion ist ab dem
+Ende ihrer Denkzeit fällig und wird in der Reihenfolge der Fälligkeit
+ausgeführt. Das entspricht einem Serverprozess, in dem die GIL die
+Skriptdurchläufe ohnehin weitgehend nacheinander ausführt. Als Latenz
+zählt die Zeit von der Fälligkeit bis zum Ende des Reruns, also
+einschließlich der Wartezeit hinter anderen Nutzern.
+
+Je Stufe (Anzahl gleichzeitiger Nutzer) werden ausgegeben:
+  - Rerun-Latenz p50/p95/p99 in ms (und p95 je Schritt)
+  - Durchsatz in Reruns pro Sekunde
+  - RSS-Zuwachs je Sitzung (Prozess-RSS, solange alle Sitzungen leben)
+Die Obergrenze des Durchsatzes ist die Stufe, ab der mehr Nutzer keine
+weiteren Reruns pro Sekunde mehr bringen.
+
+Aufruf (aus dem Projektordner):
+    python benchmarks/bench_last.py --nutzer 1 10 25 50 --denkzeit 0.5 2 --ausgabe last.json
+"""
+import argparse
+import gc
+import heapq
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+PROJEKT_ORDNER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJEKT_ORDNER)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pool_generator import WORTSCHATZ, schreibe_pool
+
+try:
+    from streamlit.testing.v1 import AppTest
+except ImportError:
+    AppTest = None
+
+APP_PFAD = os.path.join(PROJEKT_ORDNER, 'app.py')
+
+def rss_bytes():
+    """Aktueller Resident Set Size des Prozesses (Linux), sonst der bisherige Höchstwert."""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for zeile in f:
+                if zeile.startswith('VmRSS:'):
+                    return int(zeile.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    maximum = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS meldet Bytes, Linux Kilobytes
+    return maximum if sys.platform == 'darwin' else maximum * 1024
+
+def perzentil(werte, p):
+    """Perzentil nach dem Nearest-Rank-Verfahren."""
+    if not werte:
+        return None
+    werte = sorted(werte)
+    return round(werte[max(0, min(len(werte) - 1, math.ceil(p / 100 * len(werte)) - 1))], 2)
+
+def finde_button(at, praefix):
+    """Letzter Button, dessen Beschriftung mit praefix beginnt."""
+    treffer = [button for button in at.button if button.label.startswith(praefix)]
+    if not treffer:
+        raise RuntimeError(f"Kein Button '{praefix}' gefunden")
+    return treffer[-1]
+
+class Nutzer:
+    """Ein simulierter Lernender mit eigener AppTest-Sitzung."""
+
+    def __init__(self, nummer, args, themen):
+        self.rng = random.Random(args.seed + nummer)
+        self.args = args
+        self.themen = themen
+        self.at = AppTest.from_file(APP_PFAD, default_timeout=args.timeout)
+        self.schritte = self.ablauf()
+        self.fehler = None
+
+    def denkzeit(self):
+        untergrenze, obergrenze = self.args.denkzeit
+        return self.rng.uniform(untergrenze, obergrenze) if obergrenze > 0 else 0.0
+
+    def ablauf(self):
+        """Liefert die Interaktionen als (Schrittname, Aktion vor dem Rerun oder None)."""
+        at = self.at
+        for _ in range(self.args.durchlaeufe):
+            yield 'menue', None
+            yield 'lernmodus', lambda: finde_button(at, '📚').click()
+            thema = self.rng.randrange(1, self.themen + 1)
+            yield 'quiz_start', lambda: at.button(key=f"start_{thema}").click()
+
+            for _ in range(self.args.max_fragen):
+                antwort_felder = [feld for feld in at.text_area if feld.key and feld.key.startswith('answer_')]
+                if not antwort_felder:
+                    break
+                antwort = " ".join(self.rng.choice(WORTSCHATZ) for _ in range(6))
+                # Wie im Browser: Das Textfeld löst beim Verlassen einen eigenen Rerun aus
+                yield 'eingabe', lambda: antwort_felder[0].input(antwort)
+                yield 'antwort', lambda: finde_button(at, '✅').click()
+                yield 'weiter', lambda: finde_button(at, '➡️').click()
+
+            yield 'hauptmenue', lambda: finde_button(at, '🏠').click()
+
+    def schritt(self):
+        """
+        Führt die nächste Interaktion samt Rerun aus.
+
+        Returns:
+            str: Name des Schritts oder None wenn der Nutzer fertig ist
+        """
+        try:
+            name, aktion = next(self.schritte)
+        except StopIteration:
+            return None
+        if aktion is not None:
+            aktion()
+        self.at.run()
+        if self.at.exception:
+            raise RuntimeError(f"{name}: {self.at.exception[0].value}")
+        return name
+
+def stufe(anzahl_nutzer, args, themen):
+    """Bedient anzahl_nutzer gleichzeitig und wertet die Reruns aus."""
+    latenzen = []
+    gc.collect()
+    rss_vorher = rss_bytes()
+
+    nutzer = [Nutzer(i, args, themen) for i in range(anzahl_nutzer)]
+    start = time.perf_counter()
+    # Fälligkeit -> Nutzer; der Start ist über die Rampe verteilt
+    faellig = [
+        (start + args.rampe * i / anzahl_nutzer, i) for i in range(anzahl_nutzer)
+    ]
+    heapq.heapify(faellig)
+    while faellig:
+        zeitpunkt, i = heapq.heappop(faellig)
+        warten = zeitpunkt - time.perf_counter()
+        if warten > 0:
+            time.sleep(warten)
+        n = nutzer[i]
+        try:
+            name = n.schritt()
+        except Exception as e:
+            n.fehler = e
+            continue
+        if name is None:
+            continue
+        ende = time.perf_counter()
+        latenzen.append((name, ende - zeitpunkt))
+        heapq.heappush(faellig, (ende + n.denkzeit(), i))
+    dauer = time.perf_counter() - start
+
+    # Alle Sitzungen leben noch: Zuwachs gegenüber vorher entspricht ihrem Speicher
+    gc.collect()
+    rss_nachher = rss_bytes()
+    fehler = [repr(n.fehler) for n in nutzer if n.fehler is not None]
+    del nutzer
+
+    werte_ms = [d * 1000 for _, d in latenzen]
+    je_schritt = {}
+    for schritt, d in latenzen:
+        je_schritt.setdefault(schritt, []).append(d * 1000)
+
+    ergebnis = {
+        'nutzer': anzahl_nutzer,
+        'reruns': len(latenzen),
+        'sekunden': round(dauer, 3),
+        'reruns_pro_sekunde': round(len(latenzen) / dauer, 2) if dauer else None,
+        'p50_ms': perzentil(werte_ms, 50),
+        'p95_ms': perzentil(werte_ms, 95),
+        'p99_ms': perzentil(werte_ms, 99),
+        'schritte_p95_ms': {schritt: perzentil(w, 95) for schritt, w in sorted(je_schritt.items())},
+        'rss_vorher_mb': round(rss_vorher / 2 ** 20, 1),
+        'rss_nachher_mb': round(rss_nachher / 2 ** 20, 1),
+        'rss_je_sitzung_kb': round((rss_nachher - rss_vorher) / anzahl_nutzer / 1024, 1),
+        'fehler': fehler,
+    }
+    print(
+        f"  {anzahl_nutzer:>4} Nutzer: {ergebnis['reruns_pro_sekunde'] or 0:8.1f} Reruns/s  "
+        f"p50 {ergebnis['p50_ms'] or 0:7.1f} ms  p95 {ergebnis['p95_ms'] or 0:7.1f} ms  "
+        f"p99 {ergebnis['p99_ms'] or 0:7.1f} ms  RSS/Sitzung {ergebnis['rss_je_sitzung_kb']:8.1f} KB"
+        + (f"  Fehler: {len(fehler)}" if fehler else ""),
+        file=sys.stderr
+    )
+    return ergebnis
+
+def obergrenze(stufen, min_zuwachs=0.1):
+    """
+    Stufe, ab der mehr Nutzer den Durchsatz um weniger als min_zuwachs steigern.
+
+    Returns:
+        dict: 'nutzer' und 'reruns_pro_sekunde' der gesättigten Stufe
+    """
+    beste = None
+    for eintrag in stufen:
+        if not eintrag['reruns_pro_sekunde']:
+            continue
+        if beste is not None and eintrag['reruns_pro_sekunde'] < beste['reruns_pro_sekunde'] * (1 + min_zuwachs):
+            break
+        beste = eintrag
+    if beste is None:
+        return None
+    return {'nutzer': beste['nutzer'], 'reruns_pro_sekunde': beste['reruns_pro_sekunde']}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--nutzer', type=int, nargs='+', default=[1, 5, 10, 25],
+                        help="Gleichzeitige Nutzer je Stufe")
+    parser.add_argument('--denkzeit', type=float, nargs=2, default=[0.5, 2.0], metavar=('MIN', 'MAX'),
+                        help="Denkzeit zwischen Interaktionen in Sekunden (0 0 = ohne Pause)")
+    parser.add_argument('--rampe', type=float, default=2.0, help="Sekunden, über die die Nutzer einer Stufe starten")
+    parser.add_argument('--durchlaeufe', type=int, default=1, help="Quiz-Durchläufe je Nutzer")
+    parser.add_argument('--max-fragen', type=int, default=10, help="Höchstens so viele Fragen je Quiz")
+    parser.add_argument('--themen', type=int, default=20)
+    parser.add_argument('--fragen-je-thema', type=int, default=10)
+    parser.add_argument('--timeout', type=float, default=60, help="Höchstdauer eines Reruns in Sekunden")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--ausgabe', default=None, help="JSON-Datei (Standard: stdout)")
+    args = parser.parse_args()
+
+    if AppTest is None:
+        sys.exit("Streamlit ist nicht installiert (streamlit.testing.v1.AppTest fehlt)")
+
+    arbeits_ordner = tempfile.mkdtemp(prefix='quizmaster-last-')
+    try:
+        # Die App lädt den synthetischen Pool über finde_pflegepool_pfad()
+        os.environ['QUIZMASTER_POOL_PFAD'] = schreibe_pool(
+            arbeits_ordner, themen=args.themen, fragen_je_thema=args.fragen_je_thema, seed=args.seed
+        )
+        bericht = {
+            'zeitpunkt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'plattform': platform.platform(),
+            'parameter': vars(args),
+            'stufen': [],
+        }
+        # Aufwärmen: Importe und Katalog sollen nicht in den RSS-Zuwachs der ersten Stufe eingehen
+        AppTest.from_file(APP_PFAD, default_timeout=args.timeout).run()
+        for anzahl in args.nutzer:
+            bericht['stufen'].append(stufe(anzahl, args, args.themen))
+        bericht['obergrenze'] = obergrenze(bericht['stufen'])
+    finally:
+        shutil.rmtree(arbeits_ordner, ignore_errors=True)
+
+    if bericht['obergrenze']:
+        print(f"Obergrenze: {bericht['obergrenze']['reruns_pro_sekunde']} Reruns/s "
+              f"bei {bericht['obergrenze']['nutzer']} Nutzern", file=sys.stderr)
+    if args.ausgabe:
+        with open(args.ausgabe, 'w', encoding='utf-8') as f:
+            json.dump(bericht, f, indent=2, ensure_ascii=False)
+        print(f"Ergebnisse geschrieben: {args.ausgabe}")
+    else:
+        json.dump(bericht, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark-Suite: Laden, Bewerten und Auswerten bei wachsender Poolgröße.
+
+Für jede Größe wird ein synthetischer Pool erzeugt (siehe pool_generator)
+und gemessen:
+  - lade_fragen_aus_pfad (sequentiell und mit Threads)
+  - lade_fragen_aus_upload auf einem entpackten ZIP sowie lade_fragen_aus_zip
+  - validiere_antwort auf einer Stichprobe von Antworten
+  - QuizSession-Erstellung mit und ohne Mischen
+  - analyze_quiz_results nach einem beantworteten Quiz (höchstens --quiz-antworten Fragen)
+
+Fortschritt wird auf stderr ausgegeben, die Ergebnisse als JSON, damit
+Läufe verglichen werden können. analyze_quiz_results liegt in app.py und
+wird übersprungen, wenn Streamlit nicht installiert ist.
+
+Aufruf (aus dem Projektordner):
+    python benchmarks/bench_suite.py --groessen 1000 100000 --ausgabe bench.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from file_handler import (
+    STANDARD_LADE_THREADS, lade_fragen_aus_pfad, lade_fragen_aus_upload,
+    lade_fragen_aus_zip, validiere_antwort
+)
+from pool_generator import WORTSCHATZ, erzeuge_pool_zip, schreibe_pool
+from quiz_logic import QuizSession
+
+try:
+    from app import analyze_quiz_results
+except ImportError:
+    analyze_quiz_results = None
+
+def messe(funktion, wiederholungen):
+    """Führt funktion mehrmals aus und gibt die beste Zeit und das letzte Ergebnis zurück."""
+    beste = None
+    ergebnis = None
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        ergebnis = funktion()
+        dauer = time.perf_counter() - start
+        beste = dauer if beste is None else min(beste, dauer)
+    return beste, ergebnis
+
+def erzeuge_antworten(fragen, anzahl, rng):
+    """Zufällige Antworten, etwa ein Drittel enthält ein Synonym der Frage."""
+    paare = []
+    for _ in range(anzahl):
+        frage = fragen[rng.randrange(len(fragen))]
+        woerter = [rng.choice(WORTSCHATZ) for _ in range(8)]
+        if frage['synonyme'] and rng.random() < 0.33:
+            woerter.append(rng.choice(frage['synonyme']))
+        paare.append((frage, " ".join(woerter)))
+    return paare
+
+def benchmark_groesse(anzahl_fragen, args, arbeits_ordner):
+    """Misst alle Szenarien für einen Pool mit anzahl_fragen Fragen."""
+    themen = max(1, min(args.themen, anzahl_fragen))
+    optionen = dict(
+        themen=themen, fragen_je_thema=anzahl_fragen // themen,
+        synonyme_je_frage=args.synonyme, woerter_je_frage=args.frage_woerter,
+        woerter_je_antwort=args.antwort_woerter, seed=args.seed
+    )
+    messungen = {}
+
+    def eintragen(name, dauer, einheiten):
+        messungen[name] = {'sekunden': round(dauer, 6), 'pro_sekunde': round(einheiten / dauer, 1) if dauer else None}
+        print(f"  {name:<28} {dauer:9.4f} s  {messungen[name]['pro_sekunde'] or 0:14,.0f} /s", file=sys.stderr)
+
+    ordner = os.path.join(arbeits_ordner, f"pool_{anzahl_fragen}")
+    pool_pfad = schreibe_pool(ordner, **optionen)
+    zip_daten = erzeuge_pool_zip(**optionen)
+
+    dauer, fragen = messe(lambda: lade_fragen_aus_pfad(pool_pfad), args.wiederholungen)
+    eintragen('lade_fragen_aus_pfad', dauer, len(fragen))
+    dauer, _ = messe(lambda: lade_fragen_aus_pfad(pool_pfad, max_threads=STANDARD_LADE_THREADS), args.wiederholungen)
+    eintragen('lade_fragen_aus_pfad_threads', dauer, len(fragen))
+
+    def upload_entpacken_und_laden():
+        temp_dir = tempfile.mkdtemp(dir=arbeits_ordner)
+        try:
+            with zipfile.ZipFile(io.BytesIO(zip_daten)) as archiv:
+                archiv.extractall(temp_dir)
+            return lade_fragen_aus_upload(temp_dir)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    dauer, _ = messe(upload_entpacken_und_laden, args.wiederholungen)
+    eintragen('lade_fragen_aus_upload', dauer, len(fragen))
+    dauer, _ = messe(lambda: lade_fragen_aus_zip(zip_daten), args.wiederholungen)
+    eintragen('lade_fragen_aus_zip', dauer, len(fragen))
+
+    rng = random.Random(args.seed)
+    paare = erzeuge_antworten(fragen, args.antworten, rng)
+    dauer, _ = messe(
+        lambda: [validiere_antwort(antwort, frage['antwort'], frage['synonyme']) for frage, antwort in paare],
+        args.wiederholungen
+    )
+    eintragen('validiere_antwort', dauer, len(paare))
+
+    dauer, _ = messe(lambda: QuizSession(fragen, "Lernmodus"), args.wiederholungen)
+    eintragen('quiz_session', dauer, len(fragen))
+    dauer, quiz = messe(lambda: QuizSession(fragen, "Prüfungssimulation", shuffle=True), args.wiederholungen)
+    eintragen('quiz_session_shuffle', dauer, len(fragen))
+
+    # Ein vollständig beantwortetes Quiz als Grundlage für die Auswertung
+    antworten = [paare[i % len(paare)][1] for i in range(min(len(quiz.fragen), args.quiz_antworten))]
+    start = time.perf_counter()
+    for antwort in antworten:
+        quiz.submit_answer(antwort)
+        quiz.next_question()
+    eintragen('quiz_durchlauf', time.perf_counter() - start, len(antworten))
+
+    if analyze_quiz_results is not None:
+        dauer, _ = messe(lambda: analyze_quiz_results(quiz), args.wiederholungen)
+        eintragen('analyze_quiz_results', dauer, len(antworten))
+    else:
+        print("  analyze_quiz_results         übersprungen (Streamlit nicht installiert)", file=sys.stderr)
+
+    shutil.rmtree(ordner, ignore_errors=True)
+    return {'fragen': len(fragen), 'themen': themen, 'messungen': messungen}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--groessen', type=int, nargs='+', default=[1000, 100000, 1000000],
+                        help="Anzahl Fragen je Lauf")
+    parser.add_argument('--themen', type=int, default=50)
+    parser.add_argument('--synonyme', type=int, default=3, help="Synonyme je Frage")
+    parser.add_argument('--frage-woerter', type=int, default=12, help="Wörter je Fragezeile")
+    parser.add_argument('--antwort-woerter', type=int, default=20, help="Wörter je Antwortzeile")
+    parser.add_argument('--antworten', type=int, default=20000, help="Stichprobe für validiere_antwort")
+    parser.add_argument('--quiz-antworten', type=int, default=100000,
+                        help="Höchstens so viele Fragen werden vor der Auswertung beantwortet")
+    parser.add_argument('--wiederholungen', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--ausgabe', default=None, help="JSON-Datei (Standard: stdout)")
+    args = parser.parse_args()
+
+    bericht = {
+        'zeitpunkt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'plattform': platform.platform(),
+        'parameter': vars(args),
+        'laeufe': [],
+    }
+    arbeits_ordner = tempfile.mkdtemp(prefix='quizmaster-bench-')
+    try:
+        for anzahl in args.groessen:
+            print(f"{anzahl} Fragen:", file=sys.stderr)
+            bericht['laeufe'].append(benchmark_groesse(anzahl, args, arbeits_ordner))
+    finally:
+        shutil.rmtree(arbeits_ordner, ignore_errors=True)
+
+    if args.ausgabe:
+        with open(args.ausgabe, 'w', encoding='utf-8') as f:
+            json.dump(bericht, f, indent=2, ensure_ascii=False)
+        print(f"Ergebnisse geschrieben: {args.ausgabe}")
+    else:
+        json.dump(bericht, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Erzeugt synthetische 'pflegepool'-Bäume für Lasttests und Benchmarks.
+
+Jedes Thema erhält einen eigenen Ordner mit fragen.txt, antworten.txt und
+synonyme.txt im gleichen Format wie der echte Pool. Die Inhalte sind
+zufällig, aber über den Seed reproduzierbar.
+
+Aufruf (aus dem Projektordner):
+    python benchmarks/pool_generator.py /tmp/pool --themen 20 --fragen-je-thema 500
+"""
+import argparse
+import io
+import os
+import random
+import zipfile
+
+WORTSCHATZ = [
+    "blutdruck", "messung", "puls", "atmung", "dekubitus", "prophylaxe", "lagerung",
+    "mobilisation", "hygiene", "desinfektion", "wundversorgung", "verband", "infusion",
+    "medikament", "dosierung", "pflegeplanung", "dokumentation", "ernährung", "flüssigkeit",
+    "schmerz", "beobachtung", "kontrolle", "vitalzeichen", "temperatur", "bewusstsein",
+    "übergabe", "händedesinfektion", "sturzprophylaxe", "körperpflege", "ausscheidung",
+]
+
+def _zeile(rng, woerter):
+    return " ".join(rng.choice(WORTSCHATZ) for _ in range(woerter))
+
+def erzeuge_themen(themen, fragen_je_thema, synonyme_je_frage=3, woerter_je_frage=12,
+                   woerter_je_antwort=20, seed=42):
+    """
+    Erzeugt die Dateiinhalte eines synthetischen Pools.
+
+    Args:
+        themen (int): Anzahl der Themenordner
+        fragen_je_thema (int): Fragen je Thema
+        synonyme_je_frage (int): Synonyme je Frage (0 = leere synonyme.txt-Zeilen)
+        woerter_je_frage (int): Wörter je Fragezeile
+        woerter_je_antwort (int): Wörter je Antwortzeile
+        seed (int): Startwert des Zufallsgenerators
+
+    Yields:
+        tuple: (Themenname, {Dateiname: Inhalt})
+    """
+    rng = random.Random(seed)
+    for t in range(themen):
+        fragen, antworten, synonyme = [], [], []
+        for i in range(fragen_je_thema):
+            fragen.append(f"Frage {t}.{i}: {_zeile(rng, woerter_je_frage)}?")
+            antworten.append(_zeile(rng, woerter_je_antwort))
+            synonyme.append(", ".join(
+                f"{rng.choice(WORTSCHATZ)} {rng.choice(WORTSCHATZ)}" for _ in range(synonyme_je_frage)
+            ))
+        yield f"thema_{t:04d}", {
+            'fragen.txt': "\n".join(fragen) + "\n",
+            'antworten.txt': "\n".join(antworten) + "\n",
+            'synonyme.txt': "\n".join(synonyme) + "\n",
+        }
+
+def schreibe_pool(ziel_ordner, **optionen):
+    """
+    Schreibt einen synthetischen Pool als Ordnerbaum.
+
+    Args:
+        ziel_ordner (str): Ordner, in dem 'pflegepool' angelegt wird
+        **optionen: Siehe erzeuge_themen()
+
+    Returns:
+        str: Pfad zum erzeugten 'pflegepool'-Ordner
+    """
+    pool_pfad = os.path.join(ziel_ordner, 'pflegepool')
+    for thema, dateien in erzeuge_themen(**optionen):
+        themen_pfad = os.path.join(pool_pfad, thema)
+        os.makedirs(themen_pfad, exist_ok=True)
+        for datei_name, inhalt in dateien.items():
+            with open(os.path.join(themen_pfad, datei_name), 'w', encoding='utf-8') as f:
+                f.write(inhalt)
+    return pool_pfad
+
+def erzeuge_pool_zip(**optionen):
+    """
+    Erzeugt einen synthetischen Pool als ZIP-Archiv im Speicher (wie ein Upload).
+
+    Returns:
+        bytes: Inhalt der ZIP-Datei mit 'pflegepool/' auf oberster Ebene
+    """
+    puffer = io.BytesIO()
+    with zipfile.ZipFile(puffer, 'w', zipfile.ZIP_DEFLATED) as archiv:
+        for thema, dateien in erzeuge_themen(**optionen):
+            for datei_name, inhalt in dateien.items():
+                archiv.writestr(f"pflegepool/{thema}/{datei_name}", inhalt)
+    return puffer.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('ziel', help="Zielordner (darin wird 'pflegepool' angelegt)")
+    parser.add_argument('--themen', type=int, default=20)
+    parser.add_argument('--fragen-je-thema', type=int, default=50)
+    parser.add_argument('--synonyme', type=int, default=3, help="Synonyme je Frage")
+    parser.add_argument('--frage-woerter', type=int, default=12, help="Wörter je Fragezeile")
+    parser.add_argument('--antwort-woerter', type=int, default=20, help="Wörter je Antwortzeile")
+    parser.add_argument('--zip', action='store_true', help="Als pflegepool.zip statt als Ordner schreiben")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    optionen = dict(
+        themen=args.themen, fragen_je_thema=args.fragen_je_thema, synonyme_je_frage=args.synonyme,
+        woerter_je_frage=args.frage_woerter, woerter_je_antwort=args.antwort_woerter, seed=args.seed
+    )
+    if args.zip:
+        os.makedirs(args.ziel, exist_ok=True)
+        ziel = os.path.join(args.ziel, 'pflegepool.zip')
+        with open(ziel, 'wb') as f:
+            f.write(erzeuge_pool_zip(**optionen))
+    else:
+        ziel = schreibe_pool(args.ziel, **optionen)
+    print(f"{args.themen * args.fragen_je_thema} Fragen in {args.themen} Themen geschrieben: {ziel}")
+
+if __name__ == "__main__":
+    main()
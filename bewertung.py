@@ -0,0 +1,178 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from file_handler import validiere_antwort
+from instrumentierung import messe, zaehle
+
+# Wo bewertet wird: 'inline' (im aufrufenden Thread), 'thread' oder 'prozess'
+BEWERTUNG_BACKEND = os.environ.get('QUIZMASTER_BEWERTUNG', 'inline').strip().lower() or 'inline'
+
+# Höchstdauer einer Bewertung in Sekunden, danach gilt das einfache Teilwort-Urteil (0 = ohne Grenze)
+BEWERTUNG_TIMEOUT_S = float(os.environ.get('QUIZMASTER_BEWERTUNG_TIMEOUT_S', '2.0'))
+
+# Anzahl der Threads bzw. Prozesse (Standard: Anzahl CPU-Kerne)
+BEWERTUNG_WORKER = int(os.environ.get('QUIZMASTER_BEWERTUNG_WORKER', '0')) or os.cpu_count() or 1
+
+BACKENDS = ('inline', 'thread', 'prozess')
+
+def einfaches_urteil(user_antwort, korrekte_antwort, synonyme):
+    """
+    Rückfall-Urteil: Kommt eines der Synonyme in der Antwort vor?
+
+    Ohne Stemming und Tippfehlertoleranz, daher immer schnell.
+    """
+    return validiere_antwort(user_antwort, korrekte_antwort, synonyme)
+
+def _bewerte(user_antwort, korrekte_antwort, synonyme, stemming, max_tippfehler):
+    # Auf oberster Ebene, damit sie an Worker-Prozesse übergeben werden kann
+    return validiere_antwort(user_antwort, korrekte_antwort, synonyme, stemming, max_tippfehler)
+
+class BewertungsExecutor:
+    """
+    Führt Bewertungen im gewählten Backend aus.
+
+    'inline' bewertet direkt im aufrufenden Thread (bisheriges Verhalten).
+    'thread' verlagert die Bewertung in einen Thread-Pool, sodass der
+    Aufrufer nach dem Timeout weiterarbeiten kann. 'prozess' nutzt einen
+    Prozess-Pool: Aufwendige Vergleiche laufen auf eigenen Kernen und halten
+    nicht die GIL des Servers. Jeder Worker-Prozess hält seinen eigenen
+    Matcher-Cache.
+
+    Überschreitet eine Bewertung den Timeout oder schlägt sie fehl, gilt
+    das einfache Teilwort-Urteil (einfaches_urteil); das wird als Zähler
+    'bewertung_rueckfall' erfasst.
+    """
+
+    def __init__(self, backend=BEWERTUNG_BACKEND, timeout=BEWERTUNG_TIMEOUT_S, worker=BEWERTUNG_WORKER):
+        """
+        Args:
+            backend (str): 'inline', 'thread' oder 'prozess'
+            timeout (float): Sekunden bis zum Rückfall (0 oder None = ohne Grenze)
+            worker (int): Anzahl Threads bzw. Prozesse
+        """
+        if backend not in BACKENDS:
+            print(f"Warnung: Unbekanntes Bewertungs-Backend '{backend}', verwende 'inline'")
+            backend = 'inline'
+        self.backend = backend
+        self.timeout = timeout or None
+        self.worker = max(1, worker)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _hole_pool(self):
+        with self._lock:
+            if self._pool is None:
+                if self.backend == 'thread':
+                    self._pool = ThreadPoolExecutor(max_workers=self.worker, thread_name_prefix='bewertung')
+                else:
+                    # spawn statt fork: Der Server hat bereits Threads, die ein fork nicht sauber übernimmt
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.worker, mp_context=multiprocessing.get_context('spawn')
+                    )
+            return self._pool
+
+    def _verwerfe_pool(self, pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def bewerte_async(self, user_antwort, korrekte_antwort, synonyme, stemming=False, max_tippfehler=0):
+        """
+        Startet eine Bewertung und kehrt sofort zurück.
+
+        Returns:
+            Future: Liefert das Urteil (bool); beim Backend 'inline' bereits erledigt
+        """
+        if self.backend == 'inline':
+            future = Future()
+            try:
+                future.set_result(_bewerte(user_antwort, korrekte_antwort, synonyme, stemming, max_tippfehler))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        pool = self._hole_pool()
+        try:
+            return pool.submit(_bewerte, user_antwort, korrekte_antwort, tuple(synonyme or ()),
+                               stemming, max_tippfehler)
+        except (BrokenProcessPool, RuntimeError) as e:
+            # Abgestürzter Worker oder bereits geschlossener Pool: beim nächsten Mal neu anlegen
+            self._verwerfe_pool(pool)
+            future = Future()
+            future.set_exception(e)
+            return future
+
+    def ergebnis(self, future, user_antwort, korrekte_antwort, synonyme, timeout=None):
+        """
+        Wartet auf eine mit bewerte_async() gestartete Bewertung.
+
+        Args:
+            future (Future): Die laufende Bewertung
+            user_antwort, korrekte_antwort, synonyme: Wie beim Start (für den Rückfall)
+            timeout (float): Abweichender Timeout in Sekunden (None = der des Executors)
+
+        Returns:
+            bool: Das Urteil oder bei Timeout/Fehler das einfache Teilwort-Urteil
+        """
+        if timeout is None:
+            timeout = self.timeout
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            print(f"Warnung: Bewertung dauerte länger als {timeout} s, verwende einfaches Urteil")
+            zaehle('bewertung_rueckfall', grund='timeout', backend=self.backend)
+        except BrokenProcessPool as e:
+            if self._pool is not None:
+                self._verwerfe_pool(self._pool)
+            print(f"Warnung: Bewertungsprozess abgestürzt ({e}), verwende einfaches Urteil")
+            zaehle('bewertung_rueckfall', grund='fehler', backend=self.backend)
+        except Exception as e:
+            print(f"Warnung: Fehler bei der Bewertung ({e}), verwende einfaches Urteil")
+            zaehle('bewertung_rueckfall', grund='fehler', backend=self.backend)
+        return einfaches_urteil(user_antwort, korrekte_antwort, synonyme)
+
+    def bewerte(self, user_antwort, korrekte_antwort, synonyme, stemming=False, max_tippfehler=0):
+        """
+        Bewertet eine Antwort wie validiere_antwort(), aber im gewählten Backend.
+
+        Die Dauer wird im aufrufenden Prozess als 'bewertung' erfasst, samt
+        Warten auf den Pool und Rückfall, damit alle Backends gleich (und auch
+        bei Worker-Prozessen überhaupt) in den Messwerten erscheinen.
+
+        Returns:
+            bool: Das Urteil oder bei Timeout/Fehler das einfache Teilwort-Urteil
+        """
+        with messe('bewertung', backend=self.backend):
+            future = self.bewerte_async(user_antwort, korrekte_antwort, synonyme, stemming, max_tippfehler)
+            return self.ergebnis(future, user_antwort, korrekte_antwort, synonyme)
+
+    def schliessen(self):
+        """Beendet Threads bzw. Worker-Prozesse."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def hole_bewertungs_executor():
+    """
+    Gibt den prozessweiten Bewertungs-Executor zurück (Backend aus QUIZMASTER_BEWERTUNG).
+
+    Returns:
+        BewertungsExecutor: Der gemeinsame Executor
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BewertungsExecutor()
+                atexit.register(_executor.schliessen)
+    return _executor
@@ -1,11 +1,82 @@
+import io
 import os
 import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from antwort_matcher import hole_matcher
+from instrumentierung import gemessen, messe, zaehle
+from text_normalisierung import normalisiere_synonym, vergleichsform
+
+# Obergrenze für parallele Lesezugriffe beim Laden großer Pools (I/O-gebunden)
+STANDARD_LADE_THREADS = 8
+
+class Frage:
+    """
+    Speichersparendes Fragen-Objekt mit festen Feldern.
+    
+    Verhält sich beim Lesen wie das frühere Dictionary (frage['thema'] usw.),
+    benötigt durch __slots__ aber kein eigenes __dict__. Themennamen und
+    Synonyme werden interniert und als Tupel gespeichert, sodass gleiche
+    Texte im ganzen Katalog nur einmal im Speicher liegen.
+    """
+    __slots__ = ('frage', 'antwort', 'synonyme', 'thema')
+    
+    def __init__(self, frage, antwort, synonyme, thema):
+        self.frage = frage
+        self.antwort = antwort
+        self.synonyme = tuple(sys.intern(synonym) for synonym in synonyme)
+        self.thema = sys.intern(thema)
+    
+    def __getitem__(self, feld):
+        try:
+            return getattr(self, feld)
+        except (AttributeError, TypeError):
+            raise KeyError(feld) from None
+    
+    def get(self, feld, standard=None):
+        return getattr(self, feld, standard) if feld in self.__slots__ else standard
+    
+    def keys(self):
+        return self.__slots__
+    
+    def __eq__(self, other):
+        if not isinstance(other, Frage):
+            return NotImplemented
+        return all(getattr(self, feld) == getattr(other, feld) for feld in self.__slots__)
+    
+    __hash__ = None
+    
+    @property
+    def matcher(self):
+        """Der vorkompilierte Antwort-Matcher dieser Frage."""
+        return hole_matcher(self.antwort, self.synonyme)
+    
+    def __repr__(self):
+        return f"Frage(thema={self.thema!r}, frage={self.frage!r})"
 
 def lade_fragen_aus_ordnern():
     """
     Sucht intelligent nach dem 'pflegepool'-Ordner, der sich neben dem Skript befinden muss.
     Angepasst für Streamlit-Umgebung.
     """
+    haupt_ordner_pfad = finde_pflegepool_pfad()
+    if os.path.isfile(haupt_ordner_pfad):
+        return lade_fragen_aus_zip(haupt_ordner_pfad)
+    return lade_fragen_aus_pfad(haupt_ordner_pfad)
+
+def finde_pflegepool_pfad():
+    """
+    Ermittelt den Pfad zum 'pflegepool'-Ordner neben dem Skript bzw. der .exe.
+    
+    Returns:
+        str: Pfad zum Ordner oder, falls nur dieses existiert, zu 'pflegepool.zip'
+    """
+    # Abweichender Pool, z.B. für Lasttests mit synthetischen Fragen
+    pool_pfad = os.environ.get('QUIZMASTER_POOL_PFAD', '').strip()
+    if pool_pfad:
+        return pool_pfad
+    
     try:
         # Finde heraus, wo das Skript ausgeführt wird (funktioniert als .py und als .exe)
         if getattr(sys, 'frozen', False):
@@ -21,7 +92,11 @@ def lade_fragen_aus_ordnern():
     # Baue den Pfad zum 'pflegepool'-Ordner relativ zum Skript-Standort zusammen
     haupt_ordner_pfad = os.path.join(skript_ordner, 'pflegepool')
     
-    return lade_fragen_aus_pfad(haupt_ordner_pfad)
+    # Ohne Ordner wird ein gepacktes 'pflegepool.zip' direkt verwendet
+    zip_pfad = haupt_ordner_pfad + '.zip'
+    if not os.path.isdir(haupt_ordner_pfad) and os.path.isfile(zip_pfad):
+        return zip_pfad
+    return haupt_ordner_pfad
 
 def lade_fragen_aus_upload(temp_dir):
     """
@@ -48,9 +123,17 @@ def lade_fragen_aus_upload(temp_dir):
     
     return lade_fragen_aus_pfad(pflegepool_pfad)
 
-def lade_fragen_aus_pfad(haupt_ordner_pfad):
+@gemessen('lade_pool', quelle='ordner')
+def lade_fragen_aus_pfad(haupt_ordner_pfad, max_threads=1):
     """
     Lädt Fragen aus einem gegebenen Pflegepool-Ordner.
+    
+    Args:
+        haupt_ordner_pfad (str): Pfad zum 'pflegepool'-Ordner
+        max_threads (int): Anzahl paralleler Lese-Threads (1 = sequentiell)
+    
+    Returns:
+        list: Fragenkatalog in Ordnerreihenfolge oder None bei Fehlern
     """
     gesamter_fragenkatalog = []
     
@@ -58,80 +141,274 @@ def lade_fragen_aus_pfad(haupt_ordner_pfad):
         return None
 
     try:
-        for themen_name in os.listdir(haupt_ordner_pfad):
-            themen_pfad = os.path.join(haupt_ordner_pfad, themen_name)
-            if os.path.isdir(themen_pfad):
-                # Dateipfade für das aktuelle Thema
-                fragen_datei = os.path.join(themen_pfad, 'fragen.txt')
-                antworten_datei = os.path.join(themen_pfad, 'antworten.txt')
-                synonyme_datei = os.path.join(themen_pfad, 'synonyme.txt')
-                
-                if os.path.exists(fragen_datei) and os.path.exists(antworten_datei):
-                    try:
-                        # Fragen laden
-                        with open(fragen_datei, 'r', encoding='utf-8') as f:
-                            fragen_zeilen = f.readlines()
-                        
-                        # Antworten laden
-                        with open(antworten_datei, 'r', encoding='utf-8') as f:
-                            antworten_zeilen = f.readlines()
-                        
-                        # Synonyme laden (optional)
-                        synonyme_zeilen = []
-                        if os.path.exists(synonyme_datei):
-                            with open(synonyme_datei, 'r', encoding='utf-8') as f:
-                                synonyme_zeilen = f.readlines()
-                        
-                        # Prüfen ob Fragen und Antworten gleiche Länge haben
-                        if len(fragen_zeilen) == len(antworten_zeilen):
-                            for i in range(len(fragen_zeilen)):
-                                # Synonyme für diese Zeile verarbeiten
-                                synonyme_text = synonyme_zeilen[i].strip() if i < len(synonyme_zeilen) else ""
-                                synonyme_liste = [syn.strip().lower() for syn in synonyme_text.split(',') if syn.strip()]
-                                
-                                frage_objekt = {
-                                    "frage": fragen_zeilen[i].strip(),
-                                    "antwort": antworten_zeilen[i].strip(),
-                                    "synonyme": synonyme_liste,
-                                    "thema": themen_name
-                                }
-                                gesamter_fragenkatalog.append(frage_objekt)
-                        else:
-                            print(f"Warnung: In '{themen_name}' haben die Dateien eine unterschiedliche Zeilenanzahl. Block wird übersprungen.")
-                    except Exception as e:
-                        print(f"Fehler beim Lesen der Dateien im Ordner {themen_name}: {e}")
+        themen = [
+            (os.path.join(haupt_ordner_pfad, themen_name), themen_name)
+            for themen_name in os.listdir(haupt_ordner_pfad)
+            if os.path.isdir(os.path.join(haupt_ordner_pfad, themen_name))
+        ]
+        
+        if max_threads > 1 and len(themen) > 1:
+            # map() liefert die Ergebnisse in Eingabereihenfolge, unabhängig von der Fertigstellung
+            with ThreadPoolExecutor(max_workers=min(max_threads, len(themen))) as executor:
+                ergebnisse = list(executor.map(lambda thema: lade_fragen_aus_thema(*thema), themen))
+        else:
+            ergebnisse = [lade_fragen_aus_thema(*thema) for thema in themen]
+        
+        for fragen_zum_thema in ergebnisse:
+            if fragen_zum_thema:
+                gesamter_fragenkatalog.extend(fragen_zum_thema)
     except Exception as e:
         print(f"Fehler beim Durchsuchen des Hauptordners: {e}")
         return None
     
     return gesamter_fragenkatalog
 
-def validiere_antwort(user_antwort, korrekte_antwort, synonyme):
+def vergleiche_ladezeiten(haupt_ordner_pfad, max_threads=STANDARD_LADE_THREADS):
+    """
+    Misst die Ladezeit eines Pools sequentiell und parallel.
+    
+    Args:
+        haupt_ordner_pfad (str): Pfad zum 'pflegepool'-Ordner
+        max_threads (int): Anzahl paralleler Lese-Threads
+    
+    Returns:
+        dict: Laufzeiten in Sekunden, Beschleunigung und ob beide Ergebnisse übereinstimmen
+    """
+    start = time.perf_counter()
+    sequentiell = lade_fragen_aus_pfad(haupt_ordner_pfad)
+    dauer_sequentiell = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    parallel = lade_fragen_aus_pfad(haupt_ordner_pfad, max_threads=max_threads)
+    dauer_parallel = time.perf_counter() - start
+    
+    return {
+        'sequentiell_s': dauer_sequentiell,
+        'parallel_s': dauer_parallel,
+        'threads': max_threads,
+        'beschleunigung': dauer_sequentiell / dauer_parallel if dauer_parallel > 0 else 0,
+        'identisch': sequentiell == parallel
+    }
+
+def lade_fragen_aus_thema(themen_pfad, themen_name):
+    """
+    Lädt die Fragen eines einzelnen Themenordners.
+    
+    Args:
+        themen_pfad (str): Pfad zum Themenordner
+        themen_name (str): Name des Themas
+    
+    Returns:
+        list: Frage-Objekte des Themas oder None wenn der Ordner übersprungen wird
+    """
+    # Dateipfade für das aktuelle Thema
+    fragen_datei = os.path.join(themen_pfad, 'fragen.txt')
+    antworten_datei = os.path.join(themen_pfad, 'antworten.txt')
+    synonyme_datei = os.path.join(themen_pfad, 'synonyme.txt')
+    
+    if not (os.path.exists(fragen_datei) and os.path.exists(antworten_datei)):
+        return None
+    
+    try:
+        with messe('lade_thema', thema=themen_name):
+            # Fragen laden
+            with open(fragen_datei, 'r', encoding='utf-8') as f:
+                fragen_zeilen = f.readlines()
+        
+            # Antworten laden
+            with open(antworten_datei, 'r', encoding='utf-8') as f:
+                antworten_zeilen = f.readlines()
+        
+            # Synonyme laden (optional)
+            synonyme_zeilen = []
+            if os.path.exists(synonyme_datei):
+                with open(synonyme_datei, 'r', encoding='utf-8') as f:
+                    synonyme_zeilen = f.readlines()
+        
+            return erstelle_fragen_aus_zeilen(themen_name, fragen_zeilen, antworten_zeilen, synonyme_zeilen)
+    except Exception as e:
+        print(f"Fehler beim Lesen der Dateien im Ordner {themen_name}: {e}")
+        return None
+
+def erstelle_fragen_aus_zeilen(themen_name, fragen_zeilen, antworten_zeilen, synonyme_zeilen):
+    """
+    Baut die Fragen-Objekte eines Themas aus den gelesenen Dateizeilen.
+    
+    Args:
+        themen_name (str): Name des Themas
+        fragen_zeilen (list): Zeilen aus fragen.txt
+        antworten_zeilen (list): Zeilen aus antworten.txt
+        synonyme_zeilen (list): Zeilen aus synonyme.txt (darf kürzer sein oder leer)
+    
+    Returns:
+        list: Frage-Objekte oder None wenn die Zeilenanzahl nicht übereinstimmt
+    """
+    # Prüfen ob Fragen und Antworten gleiche Länge haben
+    if len(fragen_zeilen) != len(antworten_zeilen):
+        print(f"Warnung: In '{themen_name}' haben die Dateien eine unterschiedliche Zeilenanzahl. Block wird übersprungen.")
+        zaehle('zeilen_abweichungen', thema=themen_name)
+        return None
+    
+    fragen_zum_thema = []
+    for i in range(len(fragen_zeilen)):
+        # Synonyme für diese Zeile verarbeiten
+        synonyme_text = synonyme_zeilen[i].strip() if i < len(synonyme_zeilen) else ""
+        # Synonyme einmalig normalisieren (Groß-/Kleinschreibung, Umlaute, Bindestriche), Wortgrenzen bleiben
+        synonyme_liste = [normalisiere_synonym(syn) for syn in synonyme_text.split(',') if syn.strip()]
+        synonyme_liste = [syn for syn in synonyme_liste if syn]
+        
+        frage_objekt = Frage(
+            frage=fragen_zeilen[i].strip(),
+            antwort=antworten_zeilen[i].strip(),
+            synonyme=synonyme_liste,
+            thema=themen_name
+        )
+        fragen_zum_thema.append(frage_objekt)
+    return fragen_zum_thema
+
+@gemessen('lade_pool', quelle='zip')
+def lade_fragen_aus_zip(quelle):
+    """
+    Lädt Fragen direkt aus einem ZIP-Archiv, ohne es zu entpacken.
+    
+    Wie bei lade_fragen_aus_upload() wird der 'pflegepool'-Ordner auf oberster
+    Ebene oder eine Ebene tiefer gesucht.
+    
+    Args:
+        quelle: Pfad zur ZIP-Datei, Bytes oder ein dateiähnliches Objekt
+    
+    Returns:
+        list: Fragenkatalog oder None wenn kein 'pflegepool'-Ordner gefunden wurde
+    """
+    if isinstance(quelle, (bytes, bytearray, memoryview)):
+        quelle = io.BytesIO(quelle)
+    
+    try:
+        with zipfile.ZipFile(quelle, 'r') as zip_ref:
+            namen = [info.filename for info in zip_ref.infolist() if not info.is_dir()]
+            praefix = _finde_pflegepool_praefix(namen)
+            if praefix is None:
+                return None
+            
+            # Themen -> {Dateiname: Mitgliedsname}, in Archivreihenfolge
+            themen = {}
+            for name in namen:
+                if not name.startswith(praefix):
+                    continue
+                teile = name[len(praefix):].split('/')
+                if len(teile) == 2 and teile[1] in ('fragen.txt', 'antworten.txt', 'synonyme.txt'):
+                    themen.setdefault(teile[0], {})[teile[1]] = name
+            
+            gesamter_fragenkatalog = []
+            for themen_name, dateien in themen.items():
+                if 'fragen.txt' not in dateien or 'antworten.txt' not in dateien:
+                    continue
+                try:
+                    with messe('lade_thema', thema=themen_name):
+                        zeilen = {
+                            datei: _lese_zip_zeilen(zip_ref, mitglied)
+                            for datei, mitglied in dateien.items()
+                        }
+                        fragen_zum_thema = erstelle_fragen_aus_zeilen(
+                            themen_name,
+                            zeilen['fragen.txt'],
+                            zeilen['antworten.txt'],
+                            zeilen.get('synonyme.txt', [])
+                        )
+                    if fragen_zum_thema:
+                        gesamter_fragenkatalog.extend(fragen_zum_thema)
+                except Exception as e:
+                    print(f"Fehler beim Lesen der Dateien im Ordner {themen_name}: {e}")
+    except (zipfile.BadZipFile, OSError) as e:
+        print(f"Fehler beim Öffnen des ZIP-Archivs: {e}")
+        return None
+    
+    return gesamter_fragenkatalog
+
+def _finde_pflegepool_praefix(namen):
+    """Sucht 'pflegepool/' auf oberster Ebene, sonst in einem Unterordner."""
+    if any(name.startswith('pflegepool/') for name in namen):
+        return 'pflegepool/'
+    for name in namen:
+        teile = name.split('/')
+        if len(teile) > 2 and teile[1] == 'pflegepool':
+            return f"{teile[0]}/pflegepool/"
+    return None
+
+def _lese_zip_zeilen(zip_ref, mitglied):
+    """Liest ein Archivmitglied wie open(..., 'r', encoding='utf-8').readlines()."""
+    return io.StringIO(zip_ref.read(mitglied).decode('utf-8'), newline=None).readlines()
+
+def validiere_antwort(user_antwort, korrekte_antwort, synonyme, stemming=False, max_tippfehler=0):
     """
     Validiert eine Benutzerantwort basierend auf Synonymen.
     
+    Antwort und Synonyme werden vor dem Vergleich normalisiert, sodass z.B.
+    das Synonym "Blut-Druck Messung" auch "blutdruckmessung" und "Blutdruckmeßung"
+    trifft. Wortgrenzen der Antwort bleiben erhalten: "bar mitte" enthält nicht "arm".
+    
     Args:
         user_antwort (str): Die Antwort des Benutzers
         korrekte_antwort (str): Die korrekte Antwort (für Referenz)
         synonyme (list): Liste der Synonym-Schlüsselwörter
+        stemming (bool): Ob zusätzlich häufige Wortendungen ignoriert werden
+        max_tippfehler (int): Erlaubte Tippfehler (Levenshtein-Distanz) je Synonym, 0 = aus
     
     Returns:
         bool: True wenn die Antwort als korrekt bewertet wird, False sonst
     """
-    if not user_antwort or not isinstance(user_antwort, str):
-        return False
+    # Die Synonyme werden je Frage einmalig zu einem Muster kompiliert
+    return hole_matcher(korrekte_antwort, synonyme, stemming, max_tippfehler).passt(user_antwort)
+
+def bewerte_antworten(paare, stemming=False, max_tippfehler=0):
+    """
+    Bewertet viele Antworten auf einmal, z.B. exportierte Prüfungsbögen.
     
-    user_antwort_lower = user_antwort.lower().strip()
+    Liefert dieselben Urteile wie validiere_antwort(), vermeidet aber die
+    Kosten je Aufruf: Die Paare werden nach Musterlösung und Synonymen
+    gruppiert, sodass der Matcher jeder Frage nur einmal je Stapel
+    nachgeschlagen wird, und gleiche Antworttexte werden nur einmal zerlegt.
+    
+    Args:
+        paare (iterable): Paare aus (Frage-Objekt, Benutzerantwort)
+        stemming (bool): Ob zusätzlich häufige Wortendungen ignoriert werden
+        max_tippfehler (int): Erlaubte Tippfehler (Levenshtein-Distanz) je Synonym, 0 = aus
+    
+    Returns:
+        dict: 'ergebnisse' (Liste von bool in Eingabereihenfolge), 'total',
+              'correct' und 'themen' (Thema -> {'total', 'correct', 'percentage'})
+    """
+    paare = list(paare)
+    ergebnisse = [False] * len(paare)
+    themen = {}
+    # Paare nach Frageinhalt gruppieren: Musterlösung und Synonyme statt id(frage),
+    # weil z.B. ein Snapshot für dieselbe Frage verschiedene Objekte liefern kann
+    gruppen = {}
     
-    # Wenn keine Synonyme definiert sind, einfache Textübereinstimmung
-    if not synonyme or not synonyme[0]:
-        # Fallback: Prüfe ob ein Teil der korrekten Antwort enthalten ist
-        korrekte_antwort_lower = korrekte_antwort.lower()
-        return any(word in user_antwort_lower for word in korrekte_antwort_lower.split() if len(word) > 2)
+    for position, (frage, user_antwort) in enumerate(paare):
+        schluessel = (frage['antwort'], tuple(frage['synonyme'] or ()))
+        zaehler = themen.get(frage['thema'])
+        if zaehler is None:
+            zaehler = themen[frage['thema']] = [0, 0]
+        zaehler[0] += 1
+        gruppen.setdefault(schluessel, []).append((position, user_antwort, zaehler))
     
-    # Prüfe Synonyme
-    for synonym in synonyme:
-        if synonym and synonym.strip() and synonym.strip().lower() in user_antwort_lower:
-            return True
+    for (antwort, synonyme), antworten in gruppen.items():
+        matcher = hole_matcher(antwort, synonyme, stemming, max_tippfehler)
+        for position, user_antwort, zaehler in antworten:
+            if user_antwort and isinstance(user_antwort, str):
+                # Gleiche Antworttexte werden nur einmal zerlegt (auch über Stapel hinweg)
+                korrekt = matcher.passt_form(*vergleichsform(user_antwort, stemming))
+                ergebnisse[position] = korrekt
+                zaehler[1] += korrekt
     
-    return False
+    richtige = sum(ergebnisse)
+    return {
+        'ergebnisse': ergebnisse,
+        'total': len(ergebnisse),
+        'correct': richtige,
+        'themen': {
+            thema: {'total': total, 'correct': correct, 'percentage': (correct / total) * 100}
+            for thema, (total, correct) in themen.items()
+        }
+    }
@@ -0,0 +1,338 @@
+import atexit
+import heapq
+import os
+import sqlite3
+import threading
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install .[statistik]
+    np = None
+
+# Zusätzlich dauerhaft in SQLite, wenn ein Pfad gesetzt ist, z.B. QUIZMASTER_STATISTIK_DB=statistik.db
+STATISTIK_DB = os.environ.get('QUIZMASTER_STATISTIK_DB', '').strip()
+
+# Abstand der gesammelten Schreibvorgänge in Sekunden
+FLUSH_INTERVALL_S = float(os.environ.get('QUIZMASTER_STATISTIK_FLUSH_S', '5.0'))
+
+# Fragen mit weniger Versuchen erscheinen nicht in der Schwierigkeitsrangliste
+MIN_VERSUCHE = 5
+
+class FragenStatistik:
+    """
+    Prozessweite Versuche und richtige Antworten je Frage über alle Sitzungen.
+
+    Jede Frage (Thema und Fragetext) erhält beim ersten Versuch eine feste
+    Nummer; Versuche und Treffer stehen in zwei Ganzzahl-Arrays an dieser
+    Stelle, das Thema als Nummer in einem dritten. Ein Versuch kostet damit
+    eine Dictionary-Abfrage und zwei Additionen, der Speicher wächst mit der
+    Zahl der Fragen und nicht mit der Zahl der Versuche. Die Auswertungen
+    arbeiten auf Kopien dieser Arrays, mit NumPy vektorisiert.
+
+    Mit Datenbank werden nur die Änderungen seit dem letzten Durchlauf von
+    einem Hintergrund-Thread in einer Transaktion aufaddiert, sodass auch
+    mehrere Prozesse dieselbe Datei nutzen können.
+    """
+
+    def __init__(self, pfad=None, flush_intervall=FLUSH_INTERVALL_S):
+        """
+        Args:
+            pfad (str): Pfad der SQLite-Datenbank (None = nur im Speicher)
+            flush_intervall (float): Sekunden zwischen zwei Schreibvorgängen
+        """
+        self.pfad = pfad
+        self.flush_intervall = flush_intervall
+        self._lock = threading.Lock()
+        self._nummern = {}          # (Thema, Frage) -> Nummer
+        self._fragen = []           # Nummer -> (Thema, Frage)
+        self._themen_nummern = {}   # Thema -> Themennummer
+        self._themen = []           # Themennummer -> Thema
+        self._thema_von = array('I')
+        self._versuche = array('q')
+        self._richtig = array('q')
+        self._ausstehend = {}       # Nummer -> [Versuche, Richtig] seit dem letzten flush()
+
+        self._verbindung = None
+        self._thread = None
+        if pfad:
+            self._verbindung = sqlite3.connect(pfad, check_same_thread=False, isolation_level=None)
+            self._verbindung.execute("PRAGMA journal_mode=WAL")
+            self._verbindung.execute("PRAGMA synchronous=NORMAL")
+            self._verbindung.execute(
+                "CREATE TABLE IF NOT EXISTS fragenstatistik ("
+                "thema TEXT NOT NULL, frage TEXT NOT NULL, versuche INTEGER NOT NULL, "
+                "richtig INTEGER NOT NULL, PRIMARY KEY (thema, frage))"
+            )
+            zeilen = self._verbindung.execute("SELECT thema, frage, versuche, richtig FROM fragenstatistik")
+            for thema, frage, versuche, richtig in zeilen:
+                nummer = self._nummer((thema, frage))
+                self._versuche[nummer] = versuche
+                self._richtig[nummer] = richtig
+
+            self._db_lock = threading.Lock()
+            self._stopp = threading.Event()
+            self._thread = threading.Thread(target=self._flush_schleife, name='fragenstatistik', daemon=True)
+            self._thread.start()
+            atexit.register(self.schliessen)
+
+    def _nummer(self, schluessel):
+        """Gibt die Nummer einer Frage zurück und legt sie bei Bedarf an (unter _lock)."""
+        nummer = self._nummern.get(schluessel)
+        if nummer is None:
+            thema = schluessel[0]
+            themen_nummer = self._themen_nummern.get(thema)
+            if themen_nummer is None:
+                themen_nummer = self._themen_nummern[thema] = len(self._themen)
+                self._themen.append(thema)
+            nummer = self._nummern[schluessel] = len(self._fragen)
+            self._fragen.append(schluessel)
+            self._thema_von.append(themen_nummer)
+            self._versuche.append(0)
+            self._richtig.append(0)
+        return nummer
+
+    def erfasse(self, frage, korrekt, richtung=1):
+        """
+        Zählt einen Versuch für eine Frage.
+
+        Args:
+            frage (dict): Fragen-Objekt mit 'thema' und 'frage'
+            korrekt (bool): Ob die Antwort richtig war
+            richtung (int): 1 für einen neuen Versuch, -1 um ihn zurückzunehmen (undo)
+        """
+        richtig = richtung if korrekt else 0
+        with self._lock:
+            nummer = self._nummer((frage['thema'], frage['frage']))
+            self._versuche[nummer] += richtung
+            self._richtig[nummer] += richtig
+            if self._verbindung is not None:
+                delta = self._ausstehend.get(nummer)
+                if delta is None:
+                    self._ausstehend[nummer] = [richtung, richtig]
+                else:
+                    delta[0] += richtung
+                    delta[1] += richtig
+
+    def _momentaufnahme(self):
+        # Die Listen wachsen nur am Ende, daher genügen Referenzen; die Zähler werden kopiert
+        with self._lock:
+            return (
+                self._fragen, self._themen[:], array('I', self._thema_von),
+                array('q', self._versuche), array('q', self._richtig)
+            )
+
+    @staticmethod
+    def _eintrag(schluessel, versuche, richtig):
+        thema, frage = schluessel
+        return {
+            'thema': thema,
+            'frage': frage,
+            'versuche': versuche,
+            'richtig': richtig,
+            'quote': (richtig / versuche) * 100 if versuche else 0.0,
+        }
+
+    def schwierigste(self, anzahl=20, min_versuche=MIN_VERSUCHE, thema=None):
+        """
+        Rangliste der Fragen mit der niedrigsten Erfolgsquote.
+
+        Args:
+            anzahl (int): Länge der Liste
+            min_versuche (int): Nur Fragen mit mindestens so vielen Versuchen
+            thema (str): Nur Fragen dieses Themas (None = alle)
+
+        Returns:
+            list: Dicts mit 'thema', 'frage', 'versuche', 'richtig', 'quote' (Prozent),
+                  schwierigste zuerst
+        """
+        return self._rangliste(anzahl, min_versuche, thema, nach_fehlern=False)
+
+    def meist_verfehlt(self, anzahl=20, thema=None):
+        """
+        Rangliste der Fragen mit den meisten falschen Antworten.
+
+        Args:
+            anzahl (int): Länge der Liste
+            thema (str): Nur Fragen dieses Themas (None = alle)
+
+        Returns:
+            list: Dicts wie bei schwierigste(), meiste Fehler zuerst
+        """
+        return self._rangliste(anzahl, 1, thema, nach_fehlern=True)
+
+    def _rangliste(self, anzahl, min_versuche, thema, nach_fehlern):
+        fragen, _, thema_von, versuche, richtig = self._momentaufnahme()
+        themen_nummer = None
+        if thema is not None:
+            themen_nummer = self._themen_nummern.get(thema)
+            if themen_nummer is None:
+                return []
+        min_versuche = max(1, min_versuche)
+
+        if np is not None:
+            v = np.frombuffer(versuche, dtype=np.int64)
+            r = np.frombuffer(richtig, dtype=np.int64)
+            maske = v >= min_versuche
+            if nach_fehlern:
+                maske &= v > r
+            if themen_nummer is not None:
+                maske &= np.frombuffer(thema_von, dtype=np.uint32) == themen_nummer
+            kandidaten = np.flatnonzero(maske)
+            # Fehler negiert, damit aufsteigend sortiert werden kann
+            if nach_fehlern:
+                schluessel = r[kandidaten] - v[kandidaten]
+            else:
+                schluessel = r[kandidaten] / v[kandidaten]
+            if 0 < anzahl < len(kandidaten):
+                # Alle Kandidaten bis einschließlich des anzahl-ten Werts, damit Gleichstände vollständig sind
+                grenze = np.partition(schluessel, anzahl - 1)[anzahl - 1]
+                teil = schluessel <= grenze
+                kandidaten, schluessel = kandidaten[teil], schluessel[teil]
+            # Bei Gleichstand zuerst die Frage mit mehr Versuchen, dann die zuerst erfasste
+            reihenfolge = kandidaten[np.lexsort((kandidaten, -v[kandidaten], schluessel))][:max(anzahl, 0)]
+            nummern = reihenfolge.tolist()
+        else:
+            def gefiltert():
+                for nummer in range(len(versuche)):
+                    if versuche[nummer] < min_versuche:
+                        continue
+                    if nach_fehlern and versuche[nummer] <= richtig[nummer]:
+                        continue
+                    if themen_nummer is not None and thema_von[nummer] != themen_nummer:
+                        continue
+                    yield nummer
+            if nach_fehlern:
+                sortierung = lambda n: (richtig[n] - versuche[n], -versuche[n], n)
+            else:
+                sortierung = lambda n: (richtig[n] / versuche[n], -versuche[n], n)
+            nummern = heapq.nsmallest(max(anzahl, 0), gefiltert(), key=sortierung)
+
+        return [self._eintrag(fragen[n], versuche[n], richtig[n]) for n in nummern]
+
+    def themen_quoten(self):
+        """
+        Erfolgsquote je Thema über alle erfassten Versuche.
+
+        Returns:
+            dict: Thema -> {'versuche', 'richtig', 'quote'}, niedrigste Quote zuerst
+        """
+        _, themen, thema_von, versuche, richtig = self._momentaufnahme()
+        if np is not None:
+            nummern = np.frombuffer(thema_von, dtype=np.uint32)
+            summe_versuche = np.bincount(nummern, weights=np.frombuffer(versuche, dtype=np.int64),
+                                         minlength=len(themen)).astype(np.int64).tolist()
+            summe_richtig = np.bincount(nummern, weights=np.frombuffer(richtig, dtype=np.int64),
+                                        minlength=len(themen)).astype(np.int64).tolist()
+        else:
+            summe_versuche = [0] * len(themen)
+            summe_richtig = [0] * len(themen)
+            for nummer, themen_nummer in enumerate(thema_von):
+                summe_versuche[themen_nummer] += versuche[nummer]
+                summe_richtig[themen_nummer] += richtig[nummer]
+
+        quoten = {}
+        for themen_nummer, thema in enumerate(themen):
+            v, r = summe_versuche[themen_nummer], summe_richtig[themen_nummer]
+            if v > 0:
+                quoten[thema] = {'versuche': v, 'richtig': r, 'quote': (r / v) * 100}
+        return dict(sorted(quoten.items(), key=lambda x: x[1]['quote']))
+
+    def gesamt(self):
+        """
+        Returns:
+            dict: 'fragen' (mit mindestens einem Versuch), 'versuche', 'richtig'
+        """
+        _, _, _, versuche, richtig = self._momentaufnahme()
+        if np is not None:
+            v = np.frombuffer(versuche, dtype=np.int64)
+            return {'fragen': int(np.count_nonzero(v > 0)), 'versuche': int(v.sum()),
+                    'richtig': int(np.frombuffer(richtig, dtype=np.int64).sum())}
+        return {'fragen': sum(1 for v in versuche if v > 0), 'versuche': sum(versuche), 'richtig': sum(richtig)}
+
+    def flush(self):
+        """
+        Addiert alle seit dem letzten Aufruf erfassten Versuche in der Datenbank.
+
+        Returns:
+            int: Anzahl geänderter Fragen
+        """
+        if self._verbindung is None:
+            return 0
+        with self._lock:
+            if not self._ausstehend:
+                return 0
+            stapel = self._ausstehend
+            self._ausstehend = {}
+            zeilen = [
+                (*self._fragen[nummer], versuche, richtig)
+                for nummer, (versuche, richtig) in stapel.items() if versuche or richtig
+            ]
+
+        try:
+            with self._db_lock:
+                self._verbindung.execute("BEGIN")
+                try:
+                    self._verbindung.executemany(
+                        "INSERT INTO fragenstatistik (thema, frage, versuche, richtig) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(thema, frage) DO UPDATE SET versuche = versuche + excluded.versuche, "
+                        "richtig = richtig + excluded.richtig",
+                        zeilen
+                    )
+                    self._verbindung.execute("COMMIT")
+                except sqlite3.Error:
+                    self._verbindung.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            print(f"Warnung: Fragenstatistik konnte nicht gespeichert werden: {e}")
+            with self._lock:
+                # Nicht verlieren: Beim nächsten Durchlauf mit neueren Versuchen zusammen schreiben
+                for nummer, (versuche, richtig) in stapel.items():
+                    delta = self._ausstehend.setdefault(nummer, [0, 0])
+                    delta[0] += versuche
+                    delta[1] += richtig
+            return 0
+        return len(zeilen)
+
+    def _flush_schleife(self):
+        while not self._stopp.wait(self.flush_intervall):
+            self.flush()
+
+    def schliessen(self):
+        """Schreibt ausstehende Versuche und schließt die Datenbank."""
+        if self._verbindung is None or self._stopp.is_set():
+            return
+        self._stopp.set()
+        self._thread.join()
+        self.flush()
+        with self._db_lock:
+            self._verbindung.close()
+
+_statistik = None
+_statistik_lock = threading.Lock()
+
+def hole_fragenstatistik():
+    """
+    Gibt die prozessweite Fragenstatistik zurück.
+
+    Ist QUIZMASTER_STATISTIK_DB gesetzt, aber nicht zu öffnen, wird nur im
+    Speicher gezählt.
+
+    Returns:
+        FragenStatistik: Die gemeinsame Statistik
+    """
+    global _statistik
+    if _statistik is not None:
+        return _statistik
+    with _statistik_lock:
+        if _statistik is None:
+            try:
+                _statistik = FragenStatistik(STATISTIK_DB or None)
+            except sqlite3.Error as e:
+                print(f"Warnung: Statistikdatenbank '{STATISTIK_DB}' kann nicht geöffnet werden: {e}")
+                _statistik = FragenStatistik()
+        return _statistik
+
+def erfasse_antwort(frage, korrekt, richtung=1):
+    """Zählt einen Versuch in der prozessweiten Fragenstatistik (siehe FragenStatistik.erfasse)."""
+    hole_fragenstatistik().erfasse(frage, korrekt, richtung)
@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+
+# Messungen nur bei QUIZMASTER_MESSUNG=1; ausgeschaltet bleiben die gemessenen Funktionen unverändert
+AKTIV = os.environ.get('QUIZMASTER_MESSUNG', '').strip().lower() in ('1', 'true', 'ja', 'yes', 'on')
+
+METRIK_PRAEFIX = 'quizmaster_'
+
+_lock = threading.Lock()
+_dauern = {}   # (Name, Labels) -> [Anzahl, Summe, Maximum, letzte Dauer] in Sekunden
+_zaehler = {}  # (Name, Labels) -> Wert
+_LEERER_KONTEXT = nullcontext()
+
+def _schluessel(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+def erfasse_dauer(name, sekunden, **labels):
+    """
+    Trägt eine gemessene Dauer ein.
+
+    Args:
+        name (str): Name der Messreihe (z.B. 'ansicht')
+        sekunden (float): Gemessene Dauer
+        **labels: Zusätzliche Merkmale der Messreihe (z.B. ansicht='quiz')
+    """
+    schluessel = _schluessel(name, labels)
+    with _lock:
+        werte = _dauern.get(schluessel)
+        if werte is None:
+            _dauern[schluessel] = [1, sekunden, sekunden, sekunden]
+        else:
+            werte[0] += 1
+            werte[1] += sekunden
+            if sekunden > werte[2]:
+                werte[2] = sekunden
+            werte[3] = sekunden
+
+def zaehle(name, wert=1, **labels):
+    """Erhöht einen Zähler (z.B. für übersprungene Themen). Ohne Wirkung wenn nicht AKTIV."""
+    if not AKTIV:
+        return
+    schluessel = _schluessel(name, labels)
+    with _lock:
+        _zaehler[schluessel] = _zaehler.get(schluessel, 0) + wert
+
+class _Stoppuhr:
+    __slots__ = ('name', 'labels', 'start')
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        erfasse_dauer(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+def messe(name, **labels):
+    """
+    Kontextmanager, der die Dauer seines Blocks erfasst.
+
+    Ist die Messung ausgeschaltet, wird ein gemeinsamer leerer Kontext
+    zurückgegeben, sodass kaum Kosten entstehen.
+    """
+    if not AKTIV:
+        return _LEERER_KONTEXT
+    return _Stoppuhr(name, labels)
+
+def gemessen(name, **labels):
+    """
+    Dekorator, der jede Ausführung der Funktion als Dauer erfasst.
+
+    Ist die Messung ausgeschaltet, wird die Funktion unverändert
+    zurückgegeben. Auch Ausnahmen (z.B. st.rerun()) werden mitgemessen.
+    """
+    def dekorator(funktion):
+        if not AKTIV:
+            return funktion
+
+        @wraps(funktion)
+        def gemessene_funktion(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return funktion(*args, **kwargs)
+            finally:
+                erfasse_dauer(name, time.perf_counter() - start, **labels)
+        return gemessene_funktion
+    return dekorator
+
+def messwerte():
+    """
+    Gibt eine Momentaufnahme aller Messreihen zurück.
+
+    Returns:
+        dict: 'dauern' (Liste mit name, labels, anzahl, summe_ms, mittel_ms,
+              max_ms, letzte_ms) und 'zaehler' (Liste mit name, labels, wert)
+    """
+    with _lock:
+        dauern = [(name, labels, list(werte)) for (name, labels), werte in _dauern.items()]
+        zaehler = [(name, labels, wert) for (name, labels), wert in _zaehler.items()]
+
+    return {
+        'dauern': [
+            {
+                'name': name,
+                'labels': dict(labels),
+                'anzahl': anzahl,
+                'summe_ms': summe * 1000,
+                'mittel_ms': summe / anzahl * 1000,
+                'max_ms': maximum * 1000,
+                'letzte_ms': letzte * 1000,
+            }
+            for name, labels, (anzahl, summe, maximum, letzte) in sorted(dauern)
+        ],
+        'zaehler': [
+            {'name': name, 'labels': dict(labels), 'wert': wert}
+            for name, labels, wert in sorted(zaehler)
+        ],
+    }
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    teile = []
+    for schluessel, wert in labels:
+        wert = str(wert).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        teile.append(f'{schluessel}="{wert}"')
+    return '{' + ','.join(teile) + '}'
+
+def prometheus_text():
+    """
+    Gibt alle Messreihen im Textformat von Prometheus aus.
+
+    Dauern erscheinen als Summary (_count, _sum) plus Gauges für Maximum und
+    letzte Messung, Zähler als Counter mit Endung _total.
+
+    Returns:
+        str: Text zum Abruf durch einen Scraper oder zur Anzeige
+    """
+    with _lock:
+        dauern = sorted((name, labels, list(werte)) for (name, labels), werte in _dauern.items())
+        zaehler = sorted((name, labels, wert) for (name, labels), wert in _zaehler.items())
+
+    # Prometheus verlangt, dass alle Werte einer Metrik zusammenhängend stehen
+    familien = {}
+    for name, labels, (anzahl, summe, maximum, letzte) in dauern:
+        basis = f"{METRIK_PRAEFIX}{name}_seconds"
+        label_text = _label_text(labels)
+        familien.setdefault((basis, 'summary'), []).extend((
+            f"{basis}_count{label_text} {anzahl}",
+            f"{basis}_sum{label_text} {summe:.9f}",
+        ))
+        familien.setdefault((basis + '_max', 'gauge'), []).append(f"{basis}_max{label_text} {maximum:.9f}")
+        familien.setdefault((basis + '_last', 'gauge'), []).append(f"{basis}_last{label_text} {letzte:.9f}")
+    for name, labels, wert in zaehler:
+        basis = f"{METRIK_PRAEFIX}{name}_total"
+        familien.setdefault((basis, 'counter'), []).append(f"{basis}{_label_text(labels)} {wert}")
+
+    zeilen = []
+    for (basis, typ), werte in familien.items():
+        zeilen.append(f"# TYPE {basis} {typ}")
+        zeilen.extend(werte)
+    return '\n'.join(zeilen) + '\n'
+
+def zuruecksetzen():
+    """Verwirft alle bisher erfassten Messwerte."""
+    with _lock:
+        _dauern.clear()
+        _zaehler.clear()
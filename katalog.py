@@ -0,0 +1,775 @@
+import bisect
+import hashlib
+import os
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from file_handler import STANDARD_LADE_THREADS, finde_pflegepool_pfad, lade_fragen_aus_thema, lade_fragen_aus_zip
+from instrumentierung import zaehle
+from katalog_snapshot import lade_fragen_mit_snapshot
+
+# Prozessweiter Zwischenspeicher: normierter Pool-Pfad -> KatalogEintrag
+_geteilte_kataloge = {}
+_katalog_lock = threading.Lock()
+
+# Grenzen für den Zwischenspeicher hochgeladener Pools (per Umgebungsvariable anpassbar)
+UPLOAD_CACHE_MAX_EINTRAEGE = int(os.environ.get('QUIZMASTER_UPLOAD_CACHE_EINTRAEGE', '32'))
+UPLOAD_CACHE_MAX_BYTES = int(os.environ.get('QUIZMASTER_UPLOAD_CACHE_BYTES', str(256 * 1024 * 1024)))
+
+# Ordner-Pools nur indexieren und Themen erst beim ersten Zugriff einlesen (QUIZMASTER_LAZY_LADEN=1)
+LAZY_LADEN = os.environ.get('QUIZMASTER_LAZY_LADEN', '').strip().lower() in ('1', 'true', 'ja', 'yes', 'on')
+
+def berechne_themen_signaturen(haupt_ordner_pfad):
+    """
+    Berechnet je Themenordner eine Signatur aus Änderungszeiten und Dateigrößen.
+
+    Ändert sich eine Datei eines Themas (oder wird eine hinzugefügt bzw.
+    entfernt), ändert sich auch die Signatur dieses Themas.
+
+    Args:
+        haupt_ordner_pfad (str): Pfad zum 'pflegepool'-Ordner
+
+    Returns:
+        dict: Thema -> Signatur oder None wenn der Ordner fehlt
+    """
+    signaturen = {}
+    try:
+        with os.scandir(haupt_ordner_pfad) as themen:
+            for thema in themen:
+                if not thema.is_dir():
+                    continue
+                eintraege = [('', thema.stat().st_mtime_ns)]
+                with os.scandir(thema.path) as dateien:
+                    for datei in dateien:
+                        info = datei.stat()
+                        eintraege.append((datei.name, info.st_mtime_ns, info.st_size))
+                signaturen[thema.name] = tuple(sorted(eintraege))
+    except OSError:
+        return None
+    return signaturen
+
+def _zip_signatur(zip_pfad):
+    """Signatur eines gepackten Pools aus Änderungszeit und Größe des Archivs."""
+    try:
+        info = os.stat(zip_pfad)
+    except OSError:
+        return None
+    return (info.st_mtime_ns, info.st_size)
+
+class Fragenkatalog(list):
+    """
+    Liste von Fragen, die ihren Themenindex selbst trägt (siehe hole_themen_index).
+
+    Eine einfache list nimmt keine Attribute an; geteilte und hochgeladene
+    Kataloge werden deshalb als Fragenkatalog gehalten.
+    """
+    __slots__ = ('themen_index',)
+
+def _als_katalog(fragen):
+    """Gibt eine Liste als Fragenkatalog zurück; andere Sequenzen bleiben unverändert."""
+    if isinstance(fragen, list) and not isinstance(fragen, Fragenkatalog):
+        return Fragenkatalog(fragen)
+    return fragen
+
+def _themen_bereiche(fragen):
+    """Ermittelt Thema -> (erster Index, Anzahl) für einen nach Themen gruppierten Katalog."""
+    if hasattr(fragen, 'themen_bereiche'):
+        return {thema: (start, anzahl) for thema, start, anzahl in fragen.themen_bereiche()}
+
+    bereiche = {}
+    for i, frage in enumerate(fragen):
+        thema = frage['thema']
+        start, anzahl = bereiche.get(thema, (i, 0))
+        bereiche[thema] = (start, anzahl + 1)
+    return bereiche
+
+def _katalog_stand(signaturen):
+    """Kurze Kennung einer Katalogversion aus den Signaturen (in allen Prozessen gleich)."""
+    daten = repr(sorted(signaturen.items()) if isinstance(signaturen, dict) else signaturen)
+    return hashlib.sha1(daten.encode('utf-8')).hexdigest()[:16]
+
+def _zaehle_zeilen(datei_pfad):
+    """
+    Zählt die Zeilen einer Datei wie readlines() im Textmodus (\\n, \\r\\n und \\r).
+
+    Die Datei wird dabei wie beim Einlesen als UTF-8 dekodiert, damit ein
+    Thema, das sich nicht einlesen lässt, schon beim Indexieren auffällt.
+
+    Raises:
+        UnicodeDecodeError: Wenn die Datei kein gültiges UTF-8 ist
+    """
+    with open(datei_pfad, 'rb') as f:
+        daten = f.read()
+    daten.decode('utf-8')
+    if not daten:
+        return 0
+    anzahl = daten.count(b'\n') + daten.count(b'\r') - daten.count(b'\r\n')
+    if not daten.endswith((b'\n', b'\r')):
+        anzahl += 1
+    return anzahl
+
+class FrageNichtVerfuegbar(LookupError):
+    """Die Frage liegt in einem Thema, das sich seit dem Indexieren nicht mehr einlesen lässt."""
+
+class LazyKatalog(Sequence):
+    """
+    Fragenkatalog eines Ordner-Pools, dessen Themen erst bei Bedarf eingelesen werden.
+
+    Beim Anlegen werden nur die Themennamen und die Zeilenanzahl der
+    Fragen- und Antwortdateien ermittelt. Die Fragen eines Themas werden
+    beim ersten Zugriff mit lade_fragen_aus_thema() eingelesen und danach
+    zwischengespeichert. copy() und die Iteration laden alle Themen.
+
+    Die Aufteilung (Länge und Bereich jedes Themas) ändert sich während der
+    Lebensdauer des Katalogs nie, weil laufende Sitzungen Indizes in ihn
+    halten. Passt ein Thema beim Einlesen nicht mehr zum Index, wird es
+    verworfen: Zugriffe auf seine Plätze lösen FrageNichtVerfuegbar aus,
+    Iteration und themen_bereiche() lassen es aus. Entfernt wird es erst
+    im neuen Katalog, den die nächste Aktualisierung baut.
+    """
+
+    def __init__(self, haupt_ordner_pfad):
+        self.pfad = haupt_ordner_pfad
+        self._lock = threading.Lock()
+        self._geparst = {}   # Thema -> eingelesene Fragen
+        self._anzahlen = {}  # Thema -> Anzahl Fragen laut Index, in Ordnerreihenfolge
+        self._verworfen = set()  # Themen, die nicht zum Index passten
+        for thema in os.listdir(haupt_ordner_pfad):
+            if os.path.isdir(os.path.join(haupt_ordner_pfad, thema)):
+                anzahl = self._indexiere_thema(thema)
+                if anzahl:
+                    self._anzahlen[thema] = anzahl
+        self._berechne_starts()
+
+    def _indexiere_thema(self, thema):
+        """Ermittelt die Fragenanzahl eines Themas, ohne es einzulesen (None = wird übersprungen)."""
+        themen_pfad = os.path.join(self.pfad, thema)
+        fragen_datei = os.path.join(themen_pfad, 'fragen.txt')
+        antworten_datei = os.path.join(themen_pfad, 'antworten.txt')
+        if not (os.path.exists(fragen_datei) and os.path.exists(antworten_datei)):
+            return None
+        synonyme_datei = os.path.join(themen_pfad, 'synonyme.txt')
+        try:
+            anzahl_fragen = _zaehle_zeilen(fragen_datei)
+            anzahl_antworten = _zaehle_zeilen(antworten_datei)
+            if os.path.exists(synonyme_datei):
+                _zaehle_zeilen(synonyme_datei)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Fehler beim Lesen der Dateien im Ordner {thema}: {e}")
+            return None
+        if anzahl_fragen != anzahl_antworten:
+            print(f"Warnung: In '{thema}' haben die Dateien eine unterschiedliche Zeilenanzahl. Block wird übersprungen.")
+            zaehle('zeilen_abweichungen', thema=thema)
+            return None
+        return anzahl_fragen
+
+    def _berechne_starts(self):
+        themen = list(self._anzahlen)
+        starts = []
+        gesamt = 0
+        for thema in themen:
+            starts.append(gesamt)
+            gesamt += self._anzahlen[thema]
+        self._themen, self._starts, self._anzahl = themen, starts, gesamt
+
+    def _lade_thema(self, thema):
+        """
+        Gibt die Fragen eines Themas zurück und liest sie beim ersten Zugriff ein.
+
+        Returns:
+            list: Die Fragen oder None wenn das Thema unbekannt oder verworfen ist
+        """
+        fragen = self._geparst.get(thema)
+        if fragen is None:
+            with self._lock:
+                fragen = self._geparst.get(thema)
+                if fragen is None:
+                    if thema not in self._anzahlen or thema in self._verworfen:
+                        return None
+                    fragen = lade_fragen_aus_thema(os.path.join(self.pfad, thema), thema) or []
+                    if not self._pruefe_anzahl(thema, fragen):
+                        return None
+                    self._geparst[thema] = fragen
+        return fragen
+
+    def _pruefe_anzahl(self, thema, fragen):
+        """
+        Gleicht ein eingelesenes Thema mit dem Index ab (Aufruf unter self._lock).
+
+        Hat sich das Thema seit dem Indexieren geändert oder lässt es sich
+        nicht mehr einlesen, wird es verworfen. Die Plätze der übrigen
+        Themen bleiben unverändert; nur der Themenindex wird ohne das
+        Thema neu berechnet, damit keine neue Sitzung darauf startet.
+
+        Returns:
+            bool: True wenn das Thema zum Index passt
+        """
+        if len(fragen) == self._anzahlen.get(thema, 0):
+            return True
+        print(f"Warnung: Thema '{thema}' hat sich seit dem Indexieren geändert und wird übersprungen. Bitte Fragen neu laden.")
+        zaehle('zeilen_abweichungen', thema=thema)
+        self._verworfen.add(thema)
+        if self.themen_index is not None:
+            # Den Themenindex ohne das Thema neu bauen; der Stand bleibt derselbe (siehe inhalts_stand)
+            self.themen_index = ThemenIndex(self, stand=self.themen_index.stand)
+        return False
+
+    def verworfene_themen(self):
+        """Themen, die beim Einlesen nicht zum Index passten (siehe _pruefe_anzahl)."""
+        return set(self._verworfen)
+
+    def __len__(self):
+        return self._anzahl
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._anzahl))]
+        if index < 0:
+            index += self._anzahl
+        if not 0 <= index < self._anzahl:
+            raise IndexError("Fragenindex außerhalb des Katalogs")
+        position = bisect.bisect_right(self._starts, index) - 1
+        thema = self._themen[position]
+        fragen = self._lade_thema(thema)
+        if fragen is None:
+            raise FrageNichtVerfuegbar(f"Thema '{thema}' lässt sich nicht mehr einlesen. Bitte Fragen neu laden.")
+        return fragen[index - self._starts[position]]
+
+    def __iter__(self):
+        self.alle_laden()
+        for thema in self._themen:
+            if thema not in self._verworfen:
+                yield from self._geparst[thema]
+
+    def alle_laden(self, max_threads=STANDARD_LADE_THREADS):
+        """
+        Liest alle noch nicht geladenen Themen ein (z.B. für die Prüfungssimulation).
+
+        Args:
+            max_threads (int): Anzahl paralleler Lese-Threads
+        """
+        fehlend = [thema for thema in self._themen if thema not in self._geparst and thema not in self._verworfen]
+        if not fehlend:
+            return
+        with ThreadPoolExecutor(max_workers=max(1, min(max_threads, len(fehlend)))) as executor:
+            ergebnisse = list(executor.map(
+                lambda thema: lade_fragen_aus_thema(os.path.join(self.pfad, thema), thema),
+                fehlend
+            ))
+        with self._lock:
+            for thema, fragen in zip(fehlend, ergebnisse):
+                if thema not in self._geparst and thema not in self._verworfen and self._pruefe_anzahl(thema, fragen or []):
+                    self._geparst[thema] = fragen
+
+    def copy(self):
+        """Gibt eine veränderbare Liste aller Fragen zurück (wie list.copy()); lädt alle Themen."""
+        return list(self)
+
+    def fragen_zum_thema(self, thema):
+        """Gibt die Fragen eines Themas zurück und liest nur dieses Thema ein."""
+        return list(self._lade_thema(thema) or [])
+
+    def themen_bereiche(self):
+        """
+        Gibt die Themen mit ihrem Fragenbereich im Katalog zurück.
+
+        Returns:
+            list: Tupel (Thema, erster Index, Anzahl Fragen) in Katalogreihenfolge, ohne verworfene Themen
+        """
+        return [
+            (thema, start, self._anzahlen[thema]) for thema, start in zip(self._themen, self._starts)
+            if thema not in self._verworfen
+        ]
+
+    def geladene_themen(self):
+        """Anzahl der bereits eingelesenen Themen."""
+        return len(self._geparst)
+
+    def themen_neu_indexieren(self, themen):
+        """
+        Gibt einen neuen Katalog zurück, in dem geänderte Themen neu gezählt sind.
+
+        Bereits eingelesene, unveränderte Themen werden übernommen. Dieser
+        Katalog selbst bleibt unverändert, sodass die Indizes laufender
+        Sitzungen weiter auf dieselben Fragen zeigen.
+
+        Args:
+            themen (iterable): Namen geänderter, neuer oder entfernter Themen
+
+        Returns:
+            LazyKatalog: Der aktualisierte Katalog
+        """
+        neu = LazyKatalog.__new__(LazyKatalog)
+        neu.pfad = self.pfad
+        neu._lock = threading.Lock()
+        neu._verworfen = set()
+        with self._lock:
+            neu._geparst = dict(self._geparst)
+            neu._anzahlen = dict(self._anzahlen)
+            # Verworfene Themen werden im neuen Katalog neu gezählt
+            themen = set(themen) | self._verworfen
+        for thema in themen:
+            neu._geparst.pop(thema, None)
+            anzahl = None
+            if os.path.isdir(os.path.join(self.pfad, thema)):
+                anzahl = neu._indexiere_thema(thema)
+            if anzahl:
+                neu._anzahlen[thema] = anzahl
+            else:
+                neu._anzahlen.pop(thema, None)
+        neu._berechne_starts()
+        return neu
+
+class ThemenIndex:
+    """
+    Vorberechneter Themenindex eines Fragenkatalogs.
+
+    Hält je Thema die Indizes seiner Fragen (als range, wenn sie zusammen-
+    hängend liegen, sonst als kompaktes array), die sortierte Themenliste
+    und die Gesamtzahl. Ansichten lesen daraus, statt bei jedem Rerun den
+    ganzen Katalog zu durchlaufen. stand kennzeichnet den Inhalt des
+    Katalogs, sofern er bekannt ist (siehe inhalts_stand).
+    """
+
+    def __init__(self, fragen, bereiche=None, stand=None):
+        """
+        Baut den Index einmalig auf.
+
+        Args:
+            fragen (Sequence): Der Fragenkatalog
+            bereiche (dict): Bereits bekannte Thema -> (erster Index, Anzahl), falls vorhanden
+            stand (str): Kennung des Katalog-Inhalts, falls bekannt
+        """
+        self.stand = stand
+        if bereiche is None and hasattr(fragen, 'themen_bereiche'):
+            bereiche = _themen_bereiche(fragen)
+
+        if bereiche is not None:
+            self.indizes = {thema: range(start, start + anzahl) for thema, (start, anzahl) in bereiche.items()}
+        else:
+            gesammelt = {}
+            for i, frage in enumerate(fragen):
+                gesammelt.setdefault(frage['thema'], []).append(i)
+            self.indizes = {}
+            for thema, indizes in gesammelt.items():
+                if indizes[-1] - indizes[0] + 1 == len(indizes):
+                    self.indizes[thema] = range(indizes[0], indizes[-1] + 1)
+                else:
+                    self.indizes[thema] = array('I', indizes)
+
+        self.themen = sorted(self.indizes)
+        # Ohne Plätze verworfener Themen (siehe LazyKatalog)
+        self.gesamt = sum(len(indizes) for indizes in self.indizes.values())
+
+    @property
+    def anzahl_themen(self):
+        return len(self.themen)
+
+    @property
+    def durchschnitt(self):
+        """Durchschnittliche Anzahl Fragen pro Thema."""
+        return self.gesamt / len(self.themen) if self.themen else 0
+
+    def anzahl(self, thema):
+        """Anzahl der Fragen eines Themas."""
+        return len(self.indizes.get(thema, ()))
+
+    def fragen_zum_thema(self, fragen, thema):
+        """
+        Gibt die Fragen eines Themas aus dem zugehörigen Katalog zurück.
+
+        Args:
+            fragen (Sequence): Der Katalog, aus dem der Index gebaut wurde
+            thema (str): Name des Themas
+
+        Returns:
+            list: Fragen des Themas in Katalogreihenfolge
+        """
+        if hasattr(fragen, 'fragen_zum_thema'):
+            # Ein LazyKatalog liest dabei nur dieses eine Thema ein
+            return fragen.fragen_zum_thema(thema)
+        return [fragen[i] for i in self.indizes.get(thema, ())]
+
+class KatalogEintrag:
+    """
+    Geteilter Fragenkatalog eines Pools mit Änderungserkennung je Thema.
+
+    Bei einer Aktualisierung werden nur die Themenordner neu eingelesen,
+    deren Signatur sich geändert hat. Geändert wird dabei nie der bisherige
+    Katalog, sondern eine Kopie, die ihn danach ersetzt (copy-on-write):
+    Laufende Sitzungen halten Indizes in ihren Katalog und behalten ihn
+    deshalb unverändert, bis sie enden. stand kennzeichnet die Version.
+    """
+
+    def __init__(self, haupt_ordner_pfad, lazy=LAZY_LADEN):
+        self.pfad = haupt_ordner_pfad
+        # Ein gepackter Pool ('pflegepool.zip') wird direkt aus dem Archiv gelesen
+        self.ist_zip = os.path.isfile(haupt_ordner_pfad)
+        if self.ist_zip:
+            self.signaturen = _zip_signatur(haupt_ordner_pfad)
+            self.fragen = _als_katalog(lade_fragen_aus_zip(haupt_ordner_pfad))
+        else:
+            self.signaturen = berechne_themen_signaturen(haupt_ordner_pfad) or {}
+            if lazy and self.signaturen:
+                self.fragen = LazyKatalog(haupt_ordner_pfad)
+            else:
+                self.fragen = _als_katalog(lade_fragen_mit_snapshot(haupt_ordner_pfad))
+        self.bereiche = _themen_bereiche(self.fragen) if self.fragen else {}
+        self.stand = _katalog_stand(self.signaturen)
+        _merke_index(self.fragen, ThemenIndex(self.fragen or [], self.bereiche, self.stand))
+
+    @property
+    def index(self):
+        """Themenindex des aktuellen Katalogs (ohne verworfene Themen)."""
+        return hole_themen_index(self.fragen or [])
+
+    def aktualisieren(self):
+        """
+        Liest geänderte, neue und entfernte Themen ein und passt den Katalog an.
+
+        Returns:
+            dict: Listen der Themen unter 'hinzugefuegt', 'entfernt' und 'aktualisiert'
+        """
+        if self.ist_zip:
+            aenderungen = self._aktualisiere_zip()
+        else:
+            aenderungen = self._aktualisiere_ordner()
+        if any(aenderungen.values()):
+            self.stand = _katalog_stand(self.signaturen)
+            _merke_index(self.fragen, ThemenIndex(self.fragen, self.bereiche, self.stand))
+        return aenderungen
+
+    def _aktualisiere_ordner(self):
+        """Liest geänderte Themenordner neu ein und ersetzt deren Fragenbereiche."""
+        aenderungen = {'hinzugefuegt': [], 'entfernt': [], 'aktualisiert': []}
+        neue_signaturen = berechne_themen_signaturen(self.pfad)
+        if neue_signaturen is None:
+            neue_signaturen = {}
+
+        betroffen = [t for t in neue_signaturen if self.signaturen.get(t) != neue_signaturen[t]]
+        betroffen += [t for t in self.signaturen if t not in neue_signaturen]
+        if isinstance(self.fragen, LazyKatalog):
+            # Beim Einlesen verworfene Themen fallen erst im neuen Katalog heraus
+            betroffen += [t for t in self.fragen.verworfene_themen() if t not in betroffen]
+        if not betroffen:
+            return aenderungen
+
+        if isinstance(self.fragen, LazyKatalog):
+            # Nur neu zählen; eingelesen wird erst beim nächsten Zugriff
+            self.fragen = self.fragen.themen_neu_indexieren(betroffen)
+            neue_bereiche = _themen_bereiche(self.fragen)
+            for thema in betroffen:
+                if thema in neue_bereiche and thema in self.bereiche:
+                    aenderungen['aktualisiert'].append(thema)
+                elif thema in neue_bereiche:
+                    aenderungen['hinzugefuegt'].append(thema)
+                elif thema in self.bereiche:
+                    aenderungen['entfernt'].append(thema)
+            self.bereiche = neue_bereiche
+            self.signaturen = neue_signaturen
+            return aenderungen
+
+        # Änderungen gehen in eine Kopie; der bisherige Katalog (auch ein Snapshot) bleibt unverändert
+        self.fragen = Fragenkatalog(self.fragen or [])
+        self.bereiche = dict(self.bereiche)
+
+        for thema in betroffen:
+            neue_fragen = None
+            if thema in neue_signaturen:
+                neue_fragen = lade_fragen_aus_thema(os.path.join(self.pfad, thema), thema)
+            war_vorhanden = thema in self.bereiche
+            self._ersetze_thema(thema, neue_fragen or [])
+
+            if neue_fragen and war_vorhanden:
+                aenderungen['aktualisiert'].append(thema)
+            elif neue_fragen:
+                aenderungen['hinzugefuegt'].append(thema)
+            elif war_vorhanden:
+                aenderungen['entfernt'].append(thema)
+
+        self.signaturen = neue_signaturen
+        return aenderungen
+
+    def _aktualisiere_zip(self):
+        """Liest ein geändertes Archiv neu ein und vergleicht die Themen inhaltlich."""
+        aenderungen = {'hinzugefuegt': [], 'entfernt': [], 'aktualisiert': []}
+        neue_signatur = _zip_signatur(self.pfad)
+        if neue_signatur == self.signaturen:
+            return aenderungen
+
+        neue_fragen = Fragenkatalog(lade_fragen_aus_zip(self.pfad) or [])
+        neue_bereiche = _themen_bereiche(neue_fragen)
+        for thema, (start, anzahl) in neue_bereiche.items():
+            if thema not in self.bereiche:
+                aenderungen['hinzugefuegt'].append(thema)
+                continue
+            alt_start, alt_anzahl = self.bereiche[thema]
+            if self.fragen[alt_start:alt_start + alt_anzahl] != neue_fragen[start:start + anzahl]:
+                aenderungen['aktualisiert'].append(thema)
+        aenderungen['entfernt'] = [thema for thema in self.bereiche if thema not in neue_bereiche]
+
+        self.fragen = neue_fragen
+        self.bereiche = neue_bereiche
+        self.signaturen = neue_signatur
+        return aenderungen
+
+    def _ersetze_thema(self, thema, neue_fragen):
+        """Ersetzt den Fragenbereich eines Themas und verschiebt die nachfolgenden Bereiche."""
+        if thema not in self.bereiche:
+            if neue_fragen:
+                self.bereiche[thema] = (len(self.fragen), len(neue_fragen))
+                self.fragen.extend(neue_fragen)
+            return
+
+        start, anzahl = self.bereiche[thema]
+        self.fragen[start:start + anzahl] = neue_fragen
+        differenz = len(neue_fragen) - anzahl
+        if neue_fragen:
+            self.bereiche[thema] = (start, len(neue_fragen))
+        else:
+            del self.bereiche[thema]
+        if differenz:
+            for anderes, (s, n) in self.bereiche.items():
+                if s > start:
+                    self.bereiche[anderes] = (s + differenz, n)
+
+def aktualisiere_geteilten_katalog(haupt_ordner_pfad=None):
+    """
+    Gibt den prozessweit geteilten Fragenkatalog zurück und übernimmt Änderungen.
+
+    Beim ersten Aufruf wird der Pool vollständig geladen (bevorzugt aus einem
+    Binär-Snapshot, siehe katalog_snapshot). Danach werden nur Themen neu
+    eingelesen, deren Dateien sich geändert haben.
+
+    Args:
+        haupt_ordner_pfad (str): Pfad zum 'pflegepool'-Ordner oder -Archiv (Standard: neben dem Skript)
+
+    Returns:
+        tuple: (Fragenkatalog oder None, dict mit 'hinzugefuegt', 'entfernt', 'aktualisiert')
+    """
+    if haupt_ordner_pfad is None:
+        haupt_ordner_pfad = finde_pflegepool_pfad()
+    schluessel = os.path.realpath(haupt_ordner_pfad)
+
+    with _katalog_lock:
+        eintrag = _geteilte_kataloge.get(schluessel)
+        if eintrag is None:
+            eintrag = KatalogEintrag(schluessel)
+            aenderungen = {'hinzugefuegt': list(eintrag.bereiche), 'entfernt': [], 'aktualisiert': []}
+        else:
+            aenderungen = eintrag.aktualisieren()
+
+        if not eintrag.fragen:
+            _geteilte_kataloge.pop(schluessel, None)
+            return None, aenderungen
+        _geteilte_kataloge[schluessel] = eintrag
+        return eintrag.fragen, aenderungen
+
+def lade_geteilten_katalog(haupt_ordner_pfad=None, neu_laden=False):
+    """
+    Gibt den prozessweit geteilten Fragenkatalog für einen Pool-Pfad zurück.
+
+    Alle Browser-Sitzungen eines Server-Prozesses erhalten dieselbe Sequenz.
+    Geänderte Themen werden inkrementell nachgeladen. Der Katalog darf von
+    den Sitzungen nicht verändert werden.
+
+    Args:
+        haupt_ordner_pfad (str): Pfad zum 'pflegepool'-Ordner (Standard: neben dem Skript)
+        neu_laden (bool): Ob der Pool unabhängig von Änderungen vollständig neu gelesen werden soll
+
+    Returns:
+        Sequence: Der geteilte Fragenkatalog oder None wenn keine Fragen gefunden wurden
+    """
+    if neu_laden:
+        schluessel = os.path.realpath(haupt_ordner_pfad or finde_pflegepool_pfad())
+        with _katalog_lock:
+            _geteilte_kataloge.pop(schluessel, None)
+    return aktualisiere_geteilten_katalog(haupt_ordner_pfad)[0]
+
+def katalog_stand(fragen):
+    """
+    Gibt die Versionskennung eines geteilten Katalogs zurück.
+
+    Indizes in einen Katalog gelten nur für denselben Stand; nach einer
+    Aktualisierung hat der geteilte Katalog einen neuen.
+
+    Args:
+        fragen (Sequence): Der Fragenkatalog
+
+    Returns:
+        str: Kennung oder None wenn der Katalog kein aktueller geteilter Katalog ist
+    """
+    for eintrag in list(_geteilte_kataloge.values()):
+        if eintrag.fragen is fragen:
+            return eintrag.stand
+    return None
+
+def inhalts_stand(fragen):
+    """
+    Gibt die Inhaltskennung eines Katalogs zurück, auch wenn er nicht mehr geteilt wird.
+
+    Anders als katalog_stand() bleibt die Kennung am Katalog selbst (an
+    seinem Themenindex) erhalten, sodass auch Sitzungen über einem älteren
+    Stand oder einem verdrängten Upload sie noch lesen können. Ein
+    Themenindex wird dafür nicht gebaut.
+
+    Args:
+        fragen (Sequence): Der Fragenkatalog
+
+    Returns:
+        str: Kennung oder None wenn der Katalog nicht über katalog.py geladen wurde
+    """
+    return getattr(getattr(fragen, 'themen_index', None), 'stand', None)
+
+def schaetze_katalog_groesse(fragen):
+    """
+    Schätzt den Speicherbedarf eines Fragenkatalogs in Bytes.
+
+    Gezählt werden die Liste, die Fragen-Objekte und ihre Texte. Mehrfach
+    referenzierte Objekte (z.B. Themennamen) werden nur einmal gezählt.
+    """
+    gesehen = set()
+    groesse = sys.getsizeof(fragen)
+
+    def zaehle(obj):
+        if id(obj) in gesehen:
+            return 0
+        gesehen.add(id(obj))
+        return sys.getsizeof(obj)
+
+    for frage in fragen:
+        groesse += zaehle(frage)
+        for feld in frage.keys():
+            wert = frage[feld]
+            groesse += zaehle(wert)
+            if isinstance(wert, (list, tuple)):
+                groesse += sum(zaehle(eintrag) for eintrag in wert)
+    return groesse
+
+class UploadKatalogCache:
+    """
+    LRU-Zwischenspeicher für hochgeladene Fragenpools, adressiert über den Inhalt.
+
+    Identische ZIP-Dateien (gleicher SHA-256) werden nur einmal eingelesen;
+    alle Sitzungen erhalten denselben Katalog. Die ältesten Einträge werden
+    verdrängt, sobald die Anzahl- oder Speichergrenze überschritten wird.
+    """
+
+    def __init__(self, max_eintraege=UPLOAD_CACHE_MAX_EINTRAEGE, max_bytes=UPLOAD_CACHE_MAX_BYTES):
+        self.max_eintraege = max_eintraege
+        self.max_bytes = max_bytes
+        self.treffer = 0
+        self.fehlschlaege = 0
+        self._eintraege = OrderedDict()  # Hash -> (Katalog, geschätzte Größe)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def lade(self, daten):
+        """
+        Gibt den Katalog zu den ZIP-Daten zurück und liest ihn nur bei Bedarf ein.
+
+        Args:
+            daten: Inhalt der ZIP-Datei (bytes oder memoryview)
+
+        Returns:
+            list: Fragenkatalog oder None wenn keine Fragen gefunden wurden
+        """
+        schluessel = hashlib.sha256(daten).hexdigest()
+        with self._lock:
+            if schluessel in self._eintraege:
+                self._eintraege.move_to_end(schluessel)
+                self.treffer += 1
+                return self._eintraege[schluessel][0]
+            self.fehlschlaege += 1
+
+        # Einlesen außerhalb der Sperre, damit andere Uploads nicht warten müssen
+        fragen = lade_fragen_aus_zip(daten)
+        if not fragen:
+            return fragen
+
+        fragen = _als_katalog(fragen)
+        groesse = schaetze_katalog_groesse(fragen)
+        # Der Inhalts-Hash des Uploads kennzeichnet den Katalog
+        _merke_index(fragen, ThemenIndex(fragen, stand=schluessel[:16]))
+        with self._lock:
+            if schluessel in self._eintraege:
+                # Parallel von einer anderen Sitzung eingelesen: deren Kopie teilen
+                return self._eintraege[schluessel][0]
+            self._eintraege[schluessel] = (fragen, groesse)
+            self._bytes += groesse
+            self._verdraengen()
+        return fragen
+
+    def _verdraengen(self):
+        """Entfernt die am längsten ungenutzten Einträge bis die Grenzen eingehalten sind."""
+        while self._eintraege and (
+            len(self._eintraege) > self.max_eintraege or
+            (self._bytes > self.max_bytes and len(self._eintraege) > 1)
+        ):
+            _, (_, groesse) = self._eintraege.popitem(last=False)
+            self._bytes -= groesse
+
+    def statistik(self):
+        """
+        Gibt Kennzahlen des Zwischenspeichers zurück.
+
+        Returns:
+            dict: Treffer, Fehlschläge, Anzahl Einträge und geschätzte Bytes
+        """
+        with self._lock:
+            return {
+                'treffer': self.treffer,
+                'fehlschlaege': self.fehlschlaege,
+                'eintraege': len(self._eintraege),
+                'bytes': self._bytes,
+                'max_eintraege': self.max_eintraege,
+                'max_bytes': self.max_bytes
+            }
+
+# Prozessweiter Zwischenspeicher für hochgeladene Pools
+upload_cache = UploadKatalogCache()
+
+def lade_upload_katalog(daten):
+    """
+    Lädt einen hochgeladenen ZIP-Pool über den prozessweiten Upload-Cache.
+
+    Args:
+        daten: Inhalt der hochgeladenen ZIP-Datei
+
+    Returns:
+        list: Geteilter Fragenkatalog oder None wenn keine Fragen gefunden wurden
+    """
+    return upload_cache.lade(daten)
+
+def _merke_index(fragen, index):
+    """Hängt den Themenindex an den Katalog, sofern dieser Attribute annimmt."""
+    try:
+        fragen.themen_index = index
+    except AttributeError:
+        pass
+    return index
+
+def hole_themen_index(fragen):
+    """
+    Gibt den vorberechneten Themenindex zu einem Katalog zurück.
+
+    Der Index wird einmal je Katalogobjekt gebaut und am Katalog selbst
+    gespeichert. So behalten auch Kataloge, die nicht mehr geteilt werden
+    (ein älterer Stand nach einer Aktualisierung, ein verdrängter Upload),
+    ihren Index, solange Sitzungen sie noch verwenden. Nur für Sequenzen,
+    die keine Attribute annehmen (z.B. eine einfache list), wird er jedes
+    Mal neu berechnet.
+
+    Args:
+        fragen (Sequence): Der Fragenkatalog
+
+    Returns:
+        ThemenIndex: Index des Katalogs
+    """
+    index = getattr(fragen, 'themen_index', None)
+    if index is None:
+        index = _merke_index(fragen, ThemenIndex(fragen))
+    return index
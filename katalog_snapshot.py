@@ -0,0 +1,344 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from file_handler import STANDARD_LADE_THREADS, Frage, lade_fragen_aus_pfad
+
+# Anzahl dekodierter Fragen, die ein SnapshotKatalog je Prozess vorhält
+SNAPSHOT_CACHE_FRAGEN = int(os.environ.get('QUIZMASTER_SNAPSHOT_CACHE_FRAGEN', '4096'))
+
+# Binärformat (alle Zahlen uint32, Byte-Reihenfolge little-endian):
+#   Kopf:      Magic, SHA-256 des Quellbaums, SHA-256 der Dateimetadaten (Pfad, Größe,
+#              mtime_ns), Anzahl Themen/Fragen/Synonyme, reserviert
+#   Themen:    je (Name-Offset, Name-Länge, erste Frage, Anzahl Fragen)
+#   Fragen:    je (Frage-Offset, Frage-Länge, Antwort-Offset, Antwort-Länge,
+#                  erstes Synonym, Anzahl Synonyme, Themen-Nummer)
+#   Synonyme:  je (Offset, Länge)
+#   Texte:     UTF-8-kodierte, deduplizierte Zeichenketten
+SNAPSHOT_MAGIC = b'QMSNAP04'
+_KOPF = struct.Struct('<8s32s32sIIII')
+# Position des Metadaten-Hashs im Kopf (wird nach einer Inhaltsprüfung nachgetragen)
+_STAT_HASH_OFFSET = 8 + 32
+_THEMA_FELDER = 4
+_FRAGE_FELDER = 7
+_SYNONYM_FELDER = 2
+_QUELL_DATEIEN = ('fragen.txt', 'antworten.txt', 'synonyme.txt')
+
+def berechne_inhalts_hash(haupt_ordner_pfad):
+    """
+    Berechnet einen SHA-256-Hash über alle Fragen-, Antwort- und Synonymdateien.
+
+    Args:
+        haupt_ordner_pfad (str): Pfad zum 'pflegepool'-Ordner
+
+    Returns:
+        bytes: 32 Byte langer Hash oder None wenn der Ordner nicht lesbar ist
+    """
+    h = hashlib.sha256()
+    try:
+        themen = [
+            name for name in sorted(os.listdir(haupt_ordner_pfad))
+            if os.path.isdir(os.path.join(haupt_ordner_pfad, name))
+        ]
+        # Dateien parallel lesen, aber in fester Reihenfolge in den Hash einfließen lassen
+        with ThreadPoolExecutor(max_workers=STANDARD_LADE_THREADS) as executor:
+            inhalte = executor.map(lambda name: _lese_quell_dateien(os.path.join(haupt_ordner_pfad, name)), themen)
+            for themen_name, dateien in zip(themen, inhalte):
+                h.update(themen_name.encode('utf-8') + b'\0')
+                for datei_name, inhalt in dateien:
+                    h.update(struct.pack('<Q', len(inhalt)) + datei_name.encode('ascii'))
+                    h.update(inhalt)
+    except OSError:
+        return None
+    return h.digest()
+
+def berechne_stat_hash(haupt_ordner_pfad):
+    """
+    Berechnet einen SHA-256-Hash über Pfad, Größe und mtime_ns aller Quelldateien.
+
+    Liest keine Dateiinhalte und ist deshalb bei jedem Start billig. Stimmt
+    er mit dem Snapshot überein, wird der Inhalts-Hash nicht berechnet.
+
+    Args:
+        haupt_ordner_pfad (str): Pfad zum 'pflegepool'-Ordner
+
+    Returns:
+        bytes: 32 Byte langer Hash oder None wenn der Ordner nicht lesbar ist
+    """
+    h = hashlib.sha256()
+    try:
+        for themen_name in sorted(os.listdir(haupt_ordner_pfad)):
+            themen_pfad = os.path.join(haupt_ordner_pfad, themen_name)
+            if not os.path.isdir(themen_pfad):
+                continue
+            h.update(themen_name.encode('utf-8') + b'\0')
+            for datei_name in _QUELL_DATEIEN:
+                try:
+                    info = os.stat(os.path.join(themen_pfad, datei_name))
+                except FileNotFoundError:
+                    continue
+                h.update(datei_name.encode('ascii') + struct.pack('<QQ', info.st_size, info.st_mtime_ns))
+    except OSError:
+        return None
+    return h.digest()
+
+def _lese_quell_dateien(themen_pfad):
+    """Liest die vorhandenen Quelldateien eines Themenordners als Bytes."""
+    dateien = []
+    for datei_name in _QUELL_DATEIEN:
+        datei_pfad = os.path.join(themen_pfad, datei_name)
+        if os.path.exists(datei_pfad):
+            with open(datei_pfad, 'rb') as f:
+                dateien.append((datei_name, f.read()))
+    return dateien
+
+def snapshot_pfade(haupt_ordner_pfad):
+    """
+    Gibt die möglichen Speicherorte des Snapshots zurück.
+
+    Bevorzugt wird eine Datei neben dem Pool, damit alle Worker eines Hosts
+    dieselbe Datei (und damit dieselben Speicherseiten) verwenden. Ist der
+    Ordner schreibgeschützt, wird auf das temporäre Verzeichnis ausgewichen.
+    """
+    pool = os.path.realpath(haupt_ordner_pfad)
+    kennung = hashlib.sha1(pool.encode('utf-8')).hexdigest()[:16]
+    return [
+        pool + '.katalog',
+        os.path.join(tempfile.gettempdir(), f'quizmaster-{kennung}.katalog'),
+    ]
+
+def schreibe_snapshot(fragen, inhalts_hash, ziel_pfad, stat_hash=bytes(32)):
+    """
+    Schreibt einen Fragenkatalog atomar als Binär-Snapshot.
+
+    Args:
+        fragen (list): Fragenkatalog wie von lade_fragen_aus_pfad() geliefert
+        inhalts_hash (bytes): Hash des Quellbaums aus berechne_inhalts_hash()
+        ziel_pfad (str): Zieldatei
+        stat_hash (bytes): Hash der Dateimetadaten aus berechne_stat_hash()
+    """
+    texte = bytearray()
+    text_offsets = {}
+
+    def text_ablegen(text):
+        if text not in text_offsets:
+            kodiert = text.encode('utf-8')
+            text_offsets[text] = (len(texte), len(kodiert))
+            texte.extend(kodiert)
+        return text_offsets[text]
+
+    themen = []
+    themen_nummern = {}
+    fragen_tabelle = []
+    synonym_tabelle = []
+
+    for i, frage in enumerate(fragen):
+        thema = frage['thema']
+        if not themen or themen[-1][0] != thema:
+            themen_nummern[thema] = len(themen)
+            themen.append([thema, i, 0])
+        themen[-1][2] += 1
+
+        syn_start = len(synonym_tabelle) // _SYNONYM_FELDER
+        for synonym in frage['synonyme']:
+            synonym_tabelle.extend(text_ablegen(synonym))
+        fragen_tabelle.extend(text_ablegen(frage['frage']))
+        fragen_tabelle.extend(text_ablegen(frage['antwort']))
+        fragen_tabelle.extend((syn_start, len(frage['synonyme']), themen_nummern[thema]))
+
+    themen_tabelle = []
+    for name, start, anzahl in themen:
+        themen_tabelle.extend(text_ablegen(name))
+        themen_tabelle.extend((start, anzahl))
+
+    if len(texte) >= 2 ** 32:
+        raise ValueError("Fragenkatalog ist zu groß für das Snapshot-Format")
+
+    kopf = _KOPF.pack(
+        SNAPSHOT_MAGIC, inhalts_hash, stat_hash, len(themen), len(fragen),
+        len(synonym_tabelle) // _SYNONYM_FELDER, 0
+    )
+    temp_pfad = f"{ziel_pfad}.{os.getpid()}.tmp"
+    try:
+        with open(temp_pfad, 'wb') as f:
+            f.write(kopf)
+            for tabelle in (themen_tabelle, fragen_tabelle, synonym_tabelle):
+                f.write(array('I', tabelle).tobytes())
+            f.write(texte)
+        os.replace(temp_pfad, ziel_pfad)
+    except OSError:
+        if os.path.exists(temp_pfad):
+            os.remove(temp_pfad)
+        raise
+
+class SnapshotKatalog(Sequence):
+    """
+    Schreibgeschützter Fragenkatalog direkt aus einer per mmap eingeblendeten Datei.
+
+    Die Tabellen werden ohne Kopie als memoryview gelesen. Erst beim Zugriff
+    auf eine Frage werden deren Texte dekodiert; die zuletzt verwendeten
+    Fragen bleiben in einem LRU-Cache, sodass wiederholte Zugriffe dasselbe
+    Objekt liefern (und Caches, die sich an der Frage festhalten, treffen).
+    Mehrere Prozesse, die dieselbe Datei öffnen, teilen sich die
+    Speicherseiten im Page Cache.
+    """
+
+    def __init__(self, pfad, cache_groesse=SNAPSHOT_CACHE_FRAGEN):
+        with open(pfad, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        daten = memoryview(self._mmap)
+        magic, self.inhalts_hash, self.stat_hash, n_themen, n_fragen, n_synonyme, _ = _KOPF.unpack_from(daten)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"Keine gültige Snapshot-Datei: {pfad}")
+
+        pos = _KOPF.size
+        tabellen = []
+        for anzahl, felder in ((n_themen, _THEMA_FELDER), (n_fragen, _FRAGE_FELDER), (n_synonyme, _SYNONYM_FELDER)):
+            ende = pos + anzahl * felder * 4
+            tabellen.append(daten[pos:ende].cast('I'))
+            pos = ende
+        self._themen, self._fragen, self._synonyme = tabellen
+        self._texte = daten[pos:]
+        self._anzahl = n_fragen
+        self._themen_namen = [
+            self._text(self._themen[i * _THEMA_FELDER], self._themen[i * _THEMA_FELDER + 1])
+            for i in range(n_themen)
+        ]
+        self._dekodiere = lru_cache(maxsize=cache_groesse)(self._dekodiere_frage)
+
+    def _text(self, offset, laenge):
+        return str(self._texte[offset:offset + laenge], 'utf-8')
+
+    def __len__(self):
+        return self._anzahl
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._anzahl))]
+        if index < 0:
+            index += self._anzahl
+        if not 0 <= index < self._anzahl:
+            raise IndexError("Fragenindex außerhalb des Katalogs")
+        return self._dekodiere(index)
+
+    def _dekodiere_frage(self, index):
+        basis = index * _FRAGE_FELDER
+        f = self._fragen[basis:basis + _FRAGE_FELDER]
+        synonyme = [
+            self._text(self._synonyme[s * _SYNONYM_FELDER], self._synonyme[s * _SYNONYM_FELDER + 1])
+            for s in range(f[4], f[4] + f[5])
+        ]
+        return Frage(
+            frage=self._text(f[0], f[1]),
+            antwort=self._text(f[2], f[3]),
+            synonyme=synonyme,
+            thema=self._themen_namen[f[6]]
+        )
+
+    def copy(self):
+        """Gibt eine veränderbare Liste aller Fragen zurück (wie list.copy())."""
+        return list(self)
+
+    def themen_bereiche(self):
+        """
+        Gibt die Themen mit ihrem Fragenbereich im Katalog zurück.
+
+        Returns:
+            list: Tupel (Thema, erster Index, Anzahl Fragen) in Katalogreihenfolge
+        """
+        return [
+            (name, self._themen[i * _THEMA_FELDER + 2], self._themen[i * _THEMA_FELDER + 3])
+            for i, name in enumerate(self._themen_namen)
+        ]
+
+def oeffne_snapshot(pfad, inhalts_hash=None, stat_hash=None):
+    """
+    Öffnet einen Snapshot, wenn er zum erwarteten Inhalts- oder Metadaten-Hash passt.
+
+    Returns:
+        SnapshotKatalog: Der Katalog oder None wenn die Datei fehlt oder veraltet ist
+    """
+    if sys.byteorder != 'little' or not os.path.exists(pfad):
+        return None
+    try:
+        katalog = SnapshotKatalog(pfad)
+    except (OSError, ValueError, TypeError, struct.error):
+        return None
+    if stat_hash is not None and katalog.stat_hash == stat_hash:
+        return katalog
+    if inhalts_hash is not None and katalog.inhalts_hash == inhalts_hash:
+        return katalog
+    return None
+
+def _trage_stat_hash_ein(pfad, stat_hash):
+    """
+    Trägt nach bestätigtem Inhalt den aktuellen Metadaten-Hash in den Snapshot ein.
+
+    So wird z.B. nach einem erneuten Auschecken (neue mtime, gleicher Inhalt)
+    nur beim ersten Start der Inhalt gehasht. Bereits geöffnete Kataloge
+    lesen den Kopf nicht erneut.
+    """
+    try:
+        with open(pfad, 'r+b') as f:
+            f.seek(_STAT_HASH_OFFSET)
+            f.write(stat_hash)
+    except OSError:
+        pass
+
+def lade_fragen_mit_snapshot(haupt_ordner_pfad):
+    """
+    Lädt einen Fragenkatalog bevorzugt aus einem gültigen Binär-Snapshot.
+
+    Ist kein passender Snapshot vorhanden, werden die Textdateien mit
+    lade_fragen_aus_pfad() gelesen und ein neuer Snapshot geschrieben,
+    den weitere Prozesse anschließend direkt einblenden können.
+
+    Geprüft wird zuerst nur anhand der Dateimetadaten (berechne_stat_hash);
+    erst wenn diese abweichen, wird der Inhalt aller Quelldateien gehasht.
+
+    Args:
+        haupt_ordner_pfad (str): Pfad zum 'pflegepool'-Ordner
+
+    Returns:
+        Sequence: SnapshotKatalog, als Rückfall eine Liste oder None
+    """
+    stat_hash = berechne_stat_hash(haupt_ordner_pfad)
+    if stat_hash is None:
+        return lade_fragen_aus_pfad(haupt_ordner_pfad, max_threads=STANDARD_LADE_THREADS)
+
+    pfade = snapshot_pfade(haupt_ordner_pfad)
+    for pfad in pfade:
+        katalog = oeffne_snapshot(pfad, stat_hash=stat_hash)
+        if katalog is not None:
+            return katalog
+
+    inhalts_hash = berechne_inhalts_hash(haupt_ordner_pfad)
+    if inhalts_hash is None:
+        return lade_fragen_aus_pfad(haupt_ordner_pfad, max_threads=STANDARD_LADE_THREADS)
+    for pfad in pfade:
+        katalog = oeffne_snapshot(pfad, inhalts_hash)
+        if katalog is not None:
+            _trage_stat_hash_ein(pfad, stat_hash)
+            return katalog
+
+    fragen = lade_fragen_aus_pfad(haupt_ordner_pfad, max_threads=STANDARD_LADE_THREADS)
+    # Die Tabellen werden nativ geschrieben und gelesen; das Format ist little-endian
+    if not fragen or sys.byteorder != 'little' or array('I').itemsize != 4:
+        return fragen
+
+    for pfad in pfade:
+        try:
+            schreibe_snapshot(fragen, inhalts_hash, pfad, stat_hash)
+        except (OSError, ValueError) as e:
+            print(f"Warnung: Snapshot '{pfad}' konnte nicht geschrieben werden: {e}")
+            continue
+        katalog = oeffne_snapshot(pfad, inhalts_hash)
+        if katalog is not None:
+            return katalog
+    return fragen
@@ -0,0 +1,113 @@
+import random
+
+# Standardumfang einer Prüfungssimulation
+STANDARD_PRUEFUNG_FRAGEN = 40
+
+def verteile_proportional(anzahlen, gesamt):
+    """
+    Verteilt gesamt Fragen proportional zur Größe der Themen.
+
+    Nach dem Verfahren der größten Reste (Hare/Niemeyer): Jedes Thema erhält
+    den ganzzahligen Anteil, die übrigen Plätze gehen an die größten Reste.
+    Kein Thema erhält mehr Fragen als es hat.
+
+    Args:
+        anzahlen (dict): Thema -> Anzahl verfügbarer Fragen
+        gesamt (int): Zu verteilende Anzahl
+
+    Returns:
+        dict: Thema -> Anzahl zu ziehender Fragen
+    """
+    verfuegbar = sum(anzahlen.values())
+    gesamt = min(gesamt, verfuegbar)
+    if gesamt <= 0:
+        return {thema: 0 for thema in anzahlen}
+
+    quoten = {}
+    reste = []
+    for thema, anzahl in anzahlen.items():
+        anteil = gesamt * anzahl / verfuegbar
+        quoten[thema] = int(anteil)
+        reste.append((anteil - int(anteil), anzahl, thema))
+
+    offen = gesamt - sum(quoten.values())
+    # Bei gleichem Rest gewinnt das größere Thema, danach der Name (reproduzierbar)
+    for _, _, thema in sorted(reste, key=lambda r: (-r[0], -r[1], r[2]))[:offen]:
+        quoten[thema] += 1
+    return quoten
+
+class Pruefungsplan:
+    """
+    Bauplan einer Prüfungssimulation: Umfang, Quoten je Thema und Seed.
+
+    Gezogen wird auf den Indizes des ThemenIndex: je Thema eine Stichprobe
+    aus dessen Indexbereich (range oder array), ohne den Katalog zu kopieren.
+    Der Aufwand hängt damit nur von der Prüfungsgröße ab, nicht vom Pool.
+    Mit gleichem Seed und Katalog entsteht dieselbe Prüfung.
+    """
+
+    def __init__(self, gesamt=STANDARD_PRUEFUNG_FRAGEN, quoten=None, seed=None):
+        """
+        Args:
+            gesamt (int): Anzahl der Fragen (None = Summe der Quoten)
+            quoten (dict): Feste Anzahl je Thema; übrige Plätze werden proportional
+                           auf die Themen ohne Quote verteilt
+            seed (int): Startwert für die Auswahl (None = zufällig, wird in self.seed festgehalten)
+        """
+        self.quoten = dict(quoten or {})
+        self.gesamt = sum(self.quoten.values()) if gesamt is None else gesamt
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+
+    def quoten_fuer(self, index):
+        """
+        Berechnet die tatsächlichen Quoten für einen Katalog.
+
+        Feste Quoten werden auf die verfügbaren Fragen des Themas begrenzt,
+        unbekannte Themen ignoriert.
+
+        Args:
+            index (ThemenIndex): Index des Katalogs
+
+        Returns:
+            dict: Thema -> Anzahl zu ziehender Fragen (in der Reihenfolge von index.themen)
+        """
+        quoten = {}
+        for thema, anzahl in self.quoten.items():
+            if thema in index.indizes:
+                quoten[thema] = max(0, min(anzahl, index.anzahl(thema)))
+
+        offen = self.gesamt - sum(quoten.values())
+        if offen > 0:
+            rest = {thema: index.anzahl(thema) for thema in index.themen if thema not in quoten}
+            quoten.update(verteile_proportional(rest, offen))
+        return {thema: quoten[thema] for thema in index.themen if quoten.get(thema)}
+
+    def ziehe_indizes(self, index):
+        """
+        Zieht die Katalogindizes der Prüfungsfragen geschichtet nach Thema.
+
+        Args:
+            index (ThemenIndex): Index des Katalogs
+
+        Returns:
+            list: Katalogindizes in gemischter Reihenfolge
+        """
+        rng = random.Random(self.seed)
+        auswahl = []
+        for thema, anzahl in self.quoten_fuer(index).items():
+            auswahl.extend(rng.sample(index.indizes[thema], anzahl))
+        rng.shuffle(auswahl)
+        return auswahl
+
+    def ziehe_fragen(self, fragen, index):
+        """
+        Stellt die Fragen einer Prüfung zusammen.
+
+        Args:
+            fragen (Sequence): Der Fragenkatalog
+            index (ThemenIndex): Index dieses Katalogs
+
+        Returns:
+            list: Fragen-Objekte in Prüfungsreihenfolge
+        """
+        return [fragen[i] for i in self.ziehe_indizes(index)]
@@ -0,0 +1,478 @@
+"""
+Schlanke JSON-Schnittstelle für LMS-Anbindung und mobile Clients.
+
+Eine ASGI-Anwendung ohne weitere Abhängigkeiten neben der Streamlit-App:
+Sie nutzt denselben prozessweit geteilten Katalog (katalog.py) und
+dieselbe Bewertung (bewertung.py bzw. bewerte_antworten), hält die
+QuizSession-Objekte aber selbst im Speicher statt bei jeder Interaktion
+ein ganzes Skript auszuführen.
+
+Start mit einem beliebigen ASGI-Server, z.B.:
+    uvicorn quiz_api:app --port 8000
+
+Endpunkte (Anfragen und Antworten als JSON):
+    GET    /themen                          Themen mit Anzahl Fragen und Katalogstand
+    GET    /themen/{thema}/fragen           Fragen eines Themas (?start=0&anzahl=50, ohne Lösungen)
+    POST   /bewerten                        {"index", "antwort"} oder {"antworten": [{"index", "antwort"}, ...]},
+                                            optional mit "stand" (409 wenn sich der Katalog geändert hat)
+    POST   /sitzungen                       {"art": "quiz"|"pruefung"|"wiederholung", "thema", "anzahl", "seed", "shuffle"}
+    GET    /sitzungen/{token}               Aktuelle Frage und Fortschritt
+    POST   /sitzungen/{token}/antwort       {"antwort"} -> Bewertung und Musterlösung
+    POST   /sitzungen/{token}/weiter        Zur nächsten Frage
+    POST   /sitzungen/{token}/zurueck       Vorherige Frage (nimmt deren Antwort zurück)
+    GET    /sitzungen/{token}/auswertung    Ergebnis und schwache Themen
+    DELETE /sitzungen/{token}               Sitzung beenden
+    GET    /metriken                        Messwerte im Prometheus-Format (QUIZMASTER_MESSUNG=1)
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote
+
+import instrumentierung
+from bewertung import hole_bewertungs_executor
+from file_handler import bewerte_antworten
+from instrumentierung import messe, zaehle
+from katalog import FrageNichtVerfuegbar, hole_themen_index, katalog_stand, lade_geteilten_katalog
+from pruefungsplan import STANDARD_PRUEFUNG_FRAGEN, Pruefungsplan
+from quiz_logic import STANDARD_MAX_TIPPFEHLER, QuizSession, WiederholungsSession
+from sitzungsspeicher import hole_sitzungsspeicher, neues_token
+
+# Pool der Schnittstelle (None = wie in der App, siehe finde_pflegepool_pfad und QUIZMASTER_POOL_PFAD)
+POOL_PFAD = None
+
+# Sekunden, nach denen der Pool auf geänderte Themen geprüft wird (0 = bei jeder Anfrage)
+AKTUALISIERUNG_S = float(os.environ.get('QUIZMASTER_API_AKTUALISIERUNG_S', '30'))
+
+# Höchstzahl im Speicher gehaltener Sitzungen; die am längsten unbenutzten werden verdrängt
+MAX_SITZUNGEN = int(os.environ.get('QUIZMASTER_API_MAX_SITZUNGEN', '10000'))
+
+# Größe eines Anfrage-Körpers in Bytes
+MAX_KOERPER_BYTES = int(os.environ.get('QUIZMASTER_API_MAX_BYTES', str(1024 * 1024)))
+
+# Größte Seite bei /themen/{thema}/fragen und größter Stapel bei /bewerten
+MAX_SEITE = 500
+MAX_STAPEL = 10000
+
+# Anzahl Sperren für Änderungen an Sitzungen (je Token eine davon)
+SITZUNGS_SPERREN = 64
+
+class ApiFehler(Exception):
+    """Fehler, der als JSON-Antwort mit HTTP-Status an den Client geht."""
+
+    def __init__(self, status, meldung):
+        super().__init__(meldung)
+        self.status = status
+        self.meldung = meldung
+
+class SitzungsVerwaltung:
+    """
+    Serverseitige Quiz-Sitzungen unter zufälligen Tokens.
+
+    Die Sitzungen liegen in einem LRU-Dictionary; bei mehr als max_sitzungen
+    wird die am längsten unbenutzte verdrängt. Ist ein Sitzungsspeicher
+    konfiguriert (QUIZMASTER_SITZUNGEN_DB), wird jede Änderung dort
+    vorgemerkt, sodass verdrängte Sitzungen und Sitzungen anderer Prozesse
+    wiederhergestellt werden können.
+    """
+
+    def __init__(self, max_sitzungen=MAX_SITZUNGEN):
+        self.max_sitzungen = max_sitzungen
+        self._sitzungen = OrderedDict()  # Token -> QuizSession
+        self._lock = threading.Lock()
+        # Anfragen laufen bei Thread- und Prozess-Bewertung parallel; Änderungen einer Sitzung nacheinander
+        self._sperren = [threading.Lock() for _ in range(SITZUNGS_SPERREN)]
+
+    def __len__(self):
+        return len(self._sitzungen)
+
+    def neu(self, quiz):
+        token = neues_token()
+        with self._lock:
+            self._sitzungen[token] = quiz
+            while len(self._sitzungen) > self.max_sitzungen:
+                self._sitzungen.popitem(last=False)
+        self.gespeichert(token, quiz)
+        return token
+
+    def hole(self, token, katalog):
+        """Gibt die Sitzung zurück oder stellt sie aus dem Sitzungsspeicher wieder her."""
+        with self._lock:
+            quiz = self._sitzungen.get(token)
+            if quiz is not None:
+                self._sitzungen.move_to_end(token)
+                return quiz
+
+        speicher = hole_sitzungsspeicher()
+        quiz = speicher.lade(token, katalog) if speicher is not None else None
+        if quiz is None:
+            raise ApiFehler(404, "Unbekannte Sitzung")
+        with self._lock:
+            quiz = self._sitzungen.setdefault(token, quiz)
+            while len(self._sitzungen) > self.max_sitzungen:
+                self._sitzungen.popitem(last=False)
+        return quiz
+
+    def sperre(self, token):
+        """Sperre, unter der eine Sitzung verändert wird."""
+        return self._sperren[hash(token) % len(self._sperren)]
+
+    def gespeichert(self, token, quiz):
+        """Merkt eine geänderte Sitzung im Sitzungsspeicher vor (falls konfiguriert)."""
+        speicher = hole_sitzungsspeicher()
+        if speicher is not None:
+            speicher.speichere(token, quiz)
+
+    def loesche(self, token):
+        with self._lock:
+            vorhanden = self._sitzungen.pop(token, None) is not None
+        speicher = hole_sitzungsspeicher()
+        if speicher is not None:
+            # Auch eine nur gespeicherte (verdrängte) Sitzung zählt als vorhanden
+            vorhanden = speicher.loesche(token) or vorhanden
+        return vorhanden
+
+sitzungen = SitzungsVerwaltung()
+
+_katalog_stand = (None, 0.0, None)  # (Pool-Pfad, Zeitpunkt der Prüfung, Katalog)
+
+def _katalog():
+    """
+    Gibt den geteilten Katalog zurück.
+
+    Das Prüfen auf geänderte Themen kostet je Thema einen Dateizugriff und
+    geschieht deshalb höchstens alle AKTUALISIERUNG_S Sekunden statt bei
+    jeder Anfrage.
+    """
+    global _katalog_stand
+    pfad, geprueft, fragen = _katalog_stand
+    jetzt = time.monotonic()
+    if fragen is None or pfad != POOL_PFAD or jetzt - geprueft >= AKTUALISIERUNG_S:
+        fragen = lade_geteilten_katalog(POOL_PFAD)
+        _katalog_stand = (POOL_PFAD, jetzt, fragen)
+    if not fragen:
+        raise ApiFehler(503, "Keine Fragen gefunden")
+    return fragen
+
+def _ganzzahl(wert, name, minimum=0, maximum=None, aus_text=False):
+    """Prüft eine ganze Zahl aus dem JSON-Körper (bzw. mit aus_text=True aus einem Query-Parameter)."""
+    if aus_text and isinstance(wert, str):
+        try:
+            wert = int(wert)
+        except ValueError:
+            pass
+    if not isinstance(wert, int) or isinstance(wert, bool):
+        raise ApiFehler(400, f"'{name}' muss eine ganze Zahl sein")
+    zahl = wert
+    if zahl < minimum or (maximum is not None and zahl > maximum):
+        raise ApiFehler(400, f"'{name}' liegt außerhalb des erlaubten Bereichs")
+    return zahl
+
+def _frage_daten(frage, index=None):
+    """Frage ohne Musterlösung und Synonyme."""
+    daten = {'frage': frage['frage'], 'thema': frage['thema']}
+    if index is not None:
+        daten['index'] = index
+    return daten
+
+def _sitzung_daten(token, quiz):
+    frage = quiz.get_current_question()
+    return {
+        'token': token,
+        'art': quiz.ART,
+        'modus': quiz.modus,
+        'beendet': quiz.is_finished(),
+        'frage': _frage_daten(frage, quiz.current_index) if frage is not None else None,
+        'beantwortet': len(quiz.antwort_historie) > quiz.current_index,
+        'fortschritt': quiz.get_progress(),
+    }
+
+def themen_liste(anfrage):
+    fragen = _katalog()
+    index = hole_themen_index(fragen)
+    return {
+        'themen': [{'thema': thema, 'fragen': index.anzahl(thema)} for thema in index.themen],
+        'gesamt': index.gesamt,
+        'stand': katalog_stand(fragen),
+    }
+
+def themen_fragen(anfrage, thema):
+    fragen = _katalog()
+    index = hole_themen_index(fragen)
+    indizes = index.indizes.get(thema)
+    if indizes is None:
+        raise ApiFehler(404, "Unbekanntes Thema")
+    start = _ganzzahl(anfrage.parameter('start', 0), 'start', aus_text=True)
+    anzahl = _ganzzahl(anfrage.parameter('anzahl', 50), 'anzahl', 1, MAX_SEITE, aus_text=True)
+    seite = indizes[start:start + anzahl]
+    return {
+        'thema': thema,
+        'gesamt': len(indizes),
+        'start': start,
+        'stand': katalog_stand(fragen),
+        'fragen': [_frage_daten(fragen[i], i) for i in seite],
+    }
+
+def bewerten(anfrage):
+    fragen = _katalog()
+    daten = anfrage.json()
+    stand = daten.get('stand')
+    if stand is not None and stand != katalog_stand(fragen):
+        # Die Indizes stammen aus einer früheren Version des Katalogs
+        raise ApiFehler(409, "Der Fragenkatalog wurde geändert, bitte die Fragen neu abrufen")
+
+    def frage_zu(eintrag):
+        if not isinstance(eintrag, dict):
+            raise ApiFehler(400, "Jede Antwort braucht 'index' und 'antwort'")
+        return fragen[_ganzzahl(eintrag.get('index'), 'index', 0, len(fragen) - 1)]
+
+    if 'antworten' in daten:
+        eintraege = daten['antworten']
+        if not isinstance(eintraege, list) or len(eintraege) > MAX_STAPEL:
+            raise ApiFehler(400, f"'antworten' muss eine Liste mit höchstens {MAX_STAPEL} Einträgen sein")
+        return bewerte_antworten(
+            [(frage_zu(eintrag), eintrag.get('antwort')) for eintrag in eintraege],
+            max_tippfehler=STANDARD_MAX_TIPPFEHLER
+        )
+
+    frage = frage_zu(daten)
+    korrekt = hole_bewertungs_executor().bewerte(
+        daten.get('antwort'), frage['antwort'], frage['synonyme'], max_tippfehler=STANDARD_MAX_TIPPFEHLER
+    )
+    return {
+        'korrekt': korrekt,
+        'musterloesung': frage['antwort'],
+    }
+
+def sitzung_starten(anfrage):
+    fragen = _katalog()
+    index = hole_themen_index(fragen)
+    daten = anfrage.json()
+    art = daten.get('art', 'quiz')
+    thema = daten.get('thema')
+    if thema is not None and not isinstance(thema, str):
+        raise ApiFehler(400, "'thema' muss ein Text sein")
+    if thema is not None and thema not in index.indizes:
+        raise ApiFehler(404, "Unbekanntes Thema")
+
+    if art == 'pruefung':
+        seed = daten.get('seed')
+        plan = Pruefungsplan(
+            _ganzzahl(daten.get('anzahl', STANDARD_PRUEFUNG_FRAGEN), 'anzahl', 1),
+            seed=None if seed is None else _ganzzahl(seed, 'seed')
+        )
+        quiz = QuizSession(fragen, "Prüfungssimulation", indizes=plan.ziehe_indizes(index))
+    elif art in ('quiz', 'wiederholung'):
+        klasse = WiederholungsSession if art == 'wiederholung' else QuizSession
+        indizes = index.indizes[thema] if thema is not None else None
+        quiz = klasse(fragen, thema or "Alle Themen", shuffle=bool(daten.get('shuffle', False)), indizes=indizes)
+    else:
+        raise ApiFehler(400, "'art' muss 'quiz', 'pruefung' oder 'wiederholung' sein")
+
+    token = sitzungen.neu(quiz)
+    antwort = _sitzung_daten(token, quiz)
+    if art == 'pruefung':
+        antwort['seed'] = plan.seed
+    return 201, antwort
+
+def sitzung_anzeigen(anfrage, token):
+    return _sitzung_daten(token, sitzungen.hole(token, _katalog()))
+
+def sitzung_antworten(anfrage, token):
+    quiz = sitzungen.hole(token, _katalog())
+    antwort = anfrage.json().get('antwort')
+    if not isinstance(antwort, str):
+        raise ApiFehler(400, "'antwort' muss ein Text sein")
+    with sitzungen.sperre(token):
+        # Frage und Bewertung aus demselben Stand, auch wenn parallel weitergeschaltet wird
+        frage = quiz.get_current_question()
+        if frage is None:
+            raise ApiFehler(409, "Die Sitzung ist beendet")
+        # Bereits beantwortete Fragen behalten ihre erste Bewertung
+        korrekt = quiz.submit_answer(antwort)
+        sitzungen.gespeichert(token, quiz)
+        fortschritt = quiz.get_progress()
+    return {'korrekt': korrekt, 'musterloesung': frage['antwort'], 'fortschritt': fortschritt}
+
+def sitzung_weiter(anfrage, token):
+    quiz = sitzungen.hole(token, _katalog())
+    with sitzungen.sperre(token):
+        if quiz.is_finished():
+            raise ApiFehler(409, "Die Sitzung ist beendet")
+        if len(quiz.antwort_historie) <= quiz.current_index:
+            raise ApiFehler(409, "Die aktuelle Frage ist noch nicht beantwortet")
+        quiz.next_question()
+        sitzungen.gespeichert(token, quiz)
+    return _sitzung_daten(token, quiz)
+
+def sitzung_zurueck(anfrage, token):
+    quiz = sitzungen.hole(token, _katalog())
+    with sitzungen.sperre(token):
+        if not quiz.undo():
+            raise ApiFehler(409, "Zurück ist hier nicht möglich")
+        sitzungen.gespeichert(token, quiz)
+    return _sitzung_daten(token, quiz)
+
+def sitzung_auswertung(anfrage, token):
+    quiz = sitzungen.hole(token, _katalog())
+    return {'ergebnis': quiz.get_results(), 'auswertung': quiz.auswertung()}
+
+def sitzung_beenden(anfrage, token):
+    if not sitzungen.loesche(token):
+        raise ApiFehler(404, "Unbekannte Sitzung")
+    return 204, None
+
+# (Methode, Pfadsegmente) -> Funktion; '{}' steht für einen Platzhalter
+ROUTEN = {
+    ('GET', ('themen',)): themen_liste,
+    ('GET', ('themen', '{}', 'fragen')): themen_fragen,
+    ('POST', ('bewerten',)): bewerten,
+    ('POST', ('sitzungen',)): sitzung_starten,
+    ('GET', ('sitzungen', '{}')): sitzung_anzeigen,
+    ('DELETE', ('sitzungen', '{}')): sitzung_beenden,
+    ('POST', ('sitzungen', '{}', 'antwort')): sitzung_antworten,
+    ('POST', ('sitzungen', '{}', 'weiter')): sitzung_weiter,
+    ('POST', ('sitzungen', '{}', 'zurueck')): sitzung_zurueck,
+    ('GET', ('sitzungen', '{}', 'auswertung')): sitzung_auswertung,
+}
+
+def finde_route(methode, pfad):
+    """
+    Ordnet eine Anfrage ihrer Funktion zu.
+
+    Returns:
+        tuple: (Funktion, Platzhalterwerte, Name der Route für Messwerte)
+
+    Raises:
+        ApiFehler: 404 für unbekannte Pfade, 405 für falsche Methoden
+    """
+    segmente = tuple(unquote(teil) for teil in pfad.strip('/').split('/') if teil)
+    pfad_bekannt = False
+    for (routen_methode, muster), funktion in ROUTEN.items():
+        if len(muster) != len(segmente):
+            continue
+        werte = []
+        for erwartet, teil in zip(muster, segmente):
+            if erwartet == '{}':
+                werte.append(teil)
+            elif erwartet != teil:
+                break
+        else:
+            pfad_bekannt = True
+            if routen_methode == methode:
+                return funktion, werte, '/'.join(muster)
+    raise ApiFehler(405 if pfad_bekannt else 404, "Methode nicht erlaubt" if pfad_bekannt else "Nicht gefunden")
+
+class Anfrage:
+    """Methode, Query-Parameter und Körper einer HTTP-Anfrage."""
+    __slots__ = ('methode', 'query', 'koerper')
+
+    def __init__(self, methode, query_string, koerper):
+        self.methode = methode
+        self.query = parse_qs(query_string.decode('latin-1')) if query_string else {}
+        self.koerper = koerper
+
+    def parameter(self, name, standard=None):
+        werte = self.query.get(name)
+        return werte[0] if werte else standard
+
+    def json(self):
+        if not self.koerper:
+            return {}
+        try:
+            daten = json.loads(self.koerper)
+        except ValueError:
+            raise ApiFehler(400, "Ungültiges JSON") from None
+        if not isinstance(daten, dict):
+            raise ApiFehler(400, "Erwartet wird ein JSON-Objekt")
+        return daten
+
+def verarbeite(methode, pfad, query_string=b'', koerper=b''):
+    """
+    Verarbeitet eine Anfrage unabhängig vom Server.
+
+    Returns:
+        tuple: (HTTP-Status, Antwort-Körper als bytes, Content-Type)
+    """
+    if methode == 'GET' and pfad.rstrip('/') == '/metriken':
+        return 200, instrumentierung.prometheus_text().encode('utf-8'), b'text/plain; version=0.0.4'
+
+    route = None
+    try:
+        funktion, werte, route = finde_route(methode, pfad)
+        with messe('api', route=f"{methode} /{route}"):
+            ergebnis = funktion(Anfrage(methode, query_string, koerper), *werte)
+        status = 200
+        if isinstance(ergebnis, tuple):
+            status, ergebnis = ergebnis
+    except ApiFehler as e:
+        status, ergebnis = e.status, {'fehler': e.meldung}
+    except FrageNichtVerfuegbar as e:
+        # Das Thema der Frage hat sich geändert; die Sitzung muss neu gestartet werden
+        status, ergebnis = 409, {'fehler': str(e)}
+    except Exception as e:
+        # Unerwartete Fehler gehen als JSON an den Client, ohne Traceback
+        print(f"Warnung: Fehler bei {methode} {pfad}: {e!r}")
+        zaehle('api_fehler', route=f"{methode} /{route}")
+        status, ergebnis = 500, {'fehler': "Interner Fehler"}
+
+    if ergebnis is None:
+        return status, b'', b'application/json'
+    return status, json.dumps(ergebnis, ensure_ascii=False).encode('utf-8'), b'application/json'
+
+async def _lese_koerper(receive):
+    teile = []
+    groesse = 0
+    while True:
+        nachricht = await receive()
+        if nachricht['type'] == 'http.disconnect':
+            return None
+        teil = nachricht.get('body', b'')
+        groesse += len(teil)
+        if groesse > MAX_KOERPER_BYTES:
+            raise ApiFehler(413, "Anfrage zu groß")
+        teile.append(teil)
+        if not nachricht.get('more_body', False):
+            return b''.join(teile)
+
+async def app(scope, receive, send):
+    """ASGI-Einstiegspunkt."""
+    if scope['type'] == 'lifespan':
+        while True:
+            nachricht = await receive()
+            if nachricht['type'] == 'lifespan.startup':
+                # Katalog vor der ersten Anfrage laden, damit sie nicht warten muss
+                try:
+                    _katalog()
+                except ApiFehler:
+                    pass
+                await send({'type': 'lifespan.startup.complete'})
+            elif nachricht['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+
+    try:
+        koerper = await _lese_koerper(receive)
+    except ApiFehler as e:
+        status, antwort, typ = e.status, json.dumps({'fehler': e.meldung}).encode('utf-8'), b'application/json'
+    else:
+        if koerper is None:
+            return
+        argumente = (scope['method'], scope['path'], scope.get('query_string', b''), koerper)
+        if hole_bewertungs_executor().backend == 'inline':
+            status, antwort, typ = verarbeite(*argumente)
+        else:
+            # Die Anfrage wartet auf den Thread- bzw. Prozess-Pool; die Event-Loop läuft derweil weiter
+            status, antwort, typ = await asyncio.get_running_loop().run_in_executor(None, verarbeite, *argumente)
+
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', typ), (b'content-length', str(len(antwort)).encode('ascii'))],
+    })
+    await send({'type': 'http.response.body', 'body': antwort})
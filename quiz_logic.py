@@ -1,31 +1,398 @@
+import base64
+import hashlib
+import heapq
+import json
+import os
 import random
-from file_handler import validiere_antwort
+import sys
+import zlib
+from array import array
+from collections.abc import Sequence
+from bewertung import hole_bewertungs_executor
+from fragenstatistik import erfasse_antwort
+from katalog import inhalts_stand
+
+# Standardmäßig tolerierte Tippfehler je Synonym (0 = nur exakte Treffer)
+STANDARD_MAX_TIPPFEHLER = int(os.environ.get('QUIZMASTER_TIPPFEHLER', '0'))
+
+# Leitner-Karteikasten: Abstand (in beantworteten Fragen) bis zur Wiederholung je Fach.
+# Wer eine Frage im letzten Fach richtig beantwortet, hat sie gelernt.
+LEITNER_INTERVALLE = (2, 5, 12)
+
+# Themen mit einer Erfolgsquote unter diesem Prozentsatz gelten als schwach
+SCHWACH_SCHWELLE = 70
+
+class FragenAuswahl(Sequence):
+    """
+    Schreibgeschützte Sicht auf ausgewählte Fragen eines Katalogs.
+
+    Hält nur eine Referenz auf den (geteilten) Katalog und die Indizes der
+    Fragen als range oder array, statt die Fragen-Objekte zu kopieren.
+    """
+    __slots__ = ('katalog', 'indizes')
+
+    def __init__(self, katalog, indizes):
+        self.katalog = katalog
+        self.indizes = indizes
+
+    def __len__(self):
+        return len(self.indizes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.katalog[i] for i in self.indizes[index]]
+        return self.katalog[self.indizes[index]]
+
+    def __iter__(self):
+        katalog = self.katalog
+        for i in self.indizes:
+            yield katalog[i]
+
+    def copy(self):
+        """Gibt eine veränderbare Liste der Fragen zurück (wie list.copy())."""
+        return list(self)
+
+class BitListe:
+    """
+    Kompakte Liste von Wahrheitswerten mit einem Bit je Eintrag.
+
+    Unterstützt die von der Antworthistorie genutzten Listenoperationen
+    (append, pop, Indexzugriff, Iteration, len) und zählt die gesetzten
+    Bits mit, sodass die Anzahl richtiger Antworten nichts kostet.
+    """
+    __slots__ = ('_bytes', '_laenge', 'gesetzt')
+
+    def __init__(self, werte=()):
+        self._bytes = bytearray()
+        self._laenge = 0
+        self.gesetzt = 0
+        for wert in werte:
+            self.append(wert)
+
+    def __len__(self):
+        return self._laenge
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._laenge))]
+        if index < 0:
+            index += self._laenge
+        if not 0 <= index < self._laenge:
+            raise IndexError("Index außerhalb der Antworthistorie")
+        return bool(self._bytes[index >> 3] & (1 << (index & 7)))
+
+    def __iter__(self):
+        for i in range(self._laenge):
+            yield bool(self._bytes[i >> 3] & (1 << (i & 7)))
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"BitListe({list(self)!r})"
+
+    def als_bytes(self):
+        """Gibt die Bits als Bytes zurück (Eintrag i in Byte i // 8, Bit i % 8)."""
+        return bytes(self._bytes)
+
+    @classmethod
+    def aus_bytes(cls, daten, laenge):
+        """Stellt eine BitListe aus als_bytes() und der Anzahl der Einträge wieder her."""
+        liste = cls()
+        liste._bytes = bytearray(daten[:(laenge + 7) // 8])
+        liste._laenge = laenge
+        liste.gesetzt = sum(liste)
+        return liste
+
+    def append(self, wert):
+        if self._laenge & 7 == 0:
+            self._bytes.append(0)
+        if wert:
+            self._bytes[self._laenge >> 3] |= 1 << (self._laenge & 7)
+            self.gesetzt += 1
+        self._laenge += 1
+
+    def pop(self):
+        if not self._laenge:
+            raise IndexError("pop aus leerer Antworthistorie")
+        wert = self[self._laenge - 1]
+        self._laenge -= 1
+        if wert:
+            self._bytes[self._laenge >> 3] &= ~(1 << (self._laenge & 7)) & 0xFF
+            self.gesetzt -= 1
+        if self._laenge & 7 == 0:
+            self._bytes.pop()
+        return wert
+
+def _indizes_als_daten(indizes):
+    """Kodiert eine Indexfolge (range oder array) JSON-fähig."""
+    if isinstance(indizes, range):
+        return {'start': indizes.start, 'stop': indizes.stop, 'step': indizes.step}
+    return {'array': base64.b64encode(array('I', indizes).tobytes()).decode('ascii')}
+
+def _indizes_aus_daten(daten):
+    if 'array' in daten:
+        indizes = array('I')
+        indizes.frombytes(base64.b64decode(daten['array']))
+        return indizes
+    return range(daten['start'], daten['stop'], daten['step'])
 
 class QuizSession:
     """
     Verwaltet eine Quiz-Sitzung mit Fortschritt, Bewertung und Zustand.
+    
+    Die Sitzung kopiert keine Fragen: Sie hält eine Referenz auf den Katalog,
+    die Reihenfolge als range bzw. array von Indizes und die Bewertungen als
+    Bits. Der Speicherbedarf je Sitzung wächst so nur mit den gestellten
+    Fragen, nicht mit der Größe des Katalogs.
     """
     
-    def __init__(self, fragen_liste, modus, shuffle=False):
+    ART = 'quiz'
+    
+    def __init__(self, fragen_liste, modus, shuffle=False, max_tippfehler=None, indizes=None):
         """
         Initialisiert eine neue Quiz-Sitzung.
         
         Args:
-            fragen_liste (list): Liste der Fragen für das Quiz
+            fragen_liste (Sequence): Fragenkatalog (wird nicht kopiert) oder eine FragenAuswahl
             modus (str): Name des Quiz-Modus (z.B. "Lernmodus" oder "Prüfungssimulation")
             shuffle (bool): Ob die Fragen gemischt werden sollen
+            max_tippfehler (int): Tolerierte Tippfehler je Synonym (Standard: STANDARD_MAX_TIPPFEHLER)
+            indizes (Sequence): Indizes der abzufragenden Fragen im Katalog (Standard: alle)
         """
-        self.original_fragen = fragen_liste.copy()
+        if isinstance(fragen_liste, FragenAuswahl) and indizes is None:
+            # z.B. original_fragen einer früheren Sitzung: direkt auf den Katalog verweisen
+            fragen_liste, indizes = fragen_liste.katalog, fragen_liste.indizes
+        if indizes is None:
+            indizes = range(len(fragen_liste))
+        elif not isinstance(indizes, (range, array)):
+            indizes = array('I', indizes)
+        
+        self.katalog = fragen_liste
         self.modus = modus
-        self.fragen = fragen_liste.copy()
+        self.max_tippfehler = STANDARD_MAX_TIPPFEHLER if max_tippfehler is None else max_tippfehler
+        self._original_indizes = indizes
+        self._reihenfolge = indizes
         
         if shuffle:
-            random.shuffle(self.fragen)
+            self._mische()
         
+        self._leere_ergebnisse()
+        self._fingerabdruck = None
+        # Zustand als komprimiertes JSON, solange die Sitzung kompaktiert ist (siehe kompaktiere())
+        self._kompakt = None
+    
+    def _leere_ergebnisse(self):
+        """Setzt Position, Antworten und alle Zähler auf den Anfang."""
         self.current_index = 0
         self.richtige_antworten = 0
-        self.antwort_historie = []
+        self._historie = BitListe()
         self.user_antworten = []
+        # Thema -> [beantwortet, richtig], laufend in submit_answer() und undo() gepflegt
+        self._themen_statistik = {}
+        self._schwache_themen = set()
+    
+    def _mische(self):
+        """Mischt die Reihenfolge; eine geteilte Indexfolge wird dafür einmalig kopiert."""
+        if self._reihenfolge is self._original_indizes or isinstance(self._reihenfolge, range):
+            self._reihenfolge = array('I', self._original_indizes)
+        random.shuffle(self._reihenfolge)
+    
+    @property
+    def fragen(self):
+        """Die Fragen in Abfragereihenfolge (schreibgeschützte Sicht auf den Katalog)."""
+        return FragenAuswahl(self.katalog, self._reihenfolge)
+    
+    @property
+    def original_fragen(self):
+        """Die Fragen in ursprünglicher Reihenfolge (schreibgeschützte Sicht auf den Katalog)."""
+        return FragenAuswahl(self.katalog, self._original_indizes)
+    
+    @property
+    def antwort_historie(self):
+        """Bewertung je beantworteter Frage als BitListe (append/pop wie eine Liste)."""
+        return self._historie
+    
+    @antwort_historie.setter
+    def antwort_historie(self, werte):
+        self._historie = werte if isinstance(werte, BitListe) else BitListe(werte)
+        self._berechne_themen_statistik()
+    
+    def _zaehle_thema(self, thema, korrekt, richtung=1):
+        """Passt die Zähler eines Themas um eine Antwort an (richtung=-1 nimmt sie zurück)."""
+        zaehler = self._themen_statistik.get(thema)
+        if zaehler is None:
+            zaehler = self._themen_statistik[thema] = [0, 0]
+        zaehler[0] += richtung
+        if korrekt:
+            zaehler[1] += richtung
+        
+        if zaehler[0] <= 0:
+            del self._themen_statistik[thema]
+            self._schwache_themen.discard(thema)
+        elif zaehler[1] * 100 < SCHWACH_SCHWELLE * zaehler[0]:
+            self._schwache_themen.add(thema)
+        else:
+            self._schwache_themen.discard(thema)
+    
+    def _berechne_themen_statistik(self):
+        """Baut die Themenzähler einmalig aus der Historie auf (z.B. nach dem Wiederherstellen)."""
+        self._themen_statistik = {}
+        self._schwache_themen = set()
+        for position, korrekt in enumerate(self._historie):
+            self._zaehle_thema(self.katalog[self._reihenfolge[position]]['thema'], korrekt)
+    
+    def fingerabdruck(self):
+        """
+        Prüfsumme über den Katalogstand und die ausgewählten Indizes der Sitzung.
+
+        Damit lässt sich erkennen, ob eine gespeicherte Sitzung noch zum
+        aktuellen Katalog passt. Kennt der Katalog seinen Stand (siehe
+        katalog.inhalts_stand), werden keine Fragen gelesen; sonst fließen
+        die Fragentexte der Auswahl ein. Wird einmal je Sitzung berechnet.
+        """
+        if self._fingerabdruck is None:
+            h = hashlib.sha1()
+            stand = inhalts_stand(self.katalog)
+            indizes = self._original_indizes
+            if isinstance(indizes, range):
+                h.update(f"{indizes.start}:{indizes.stop}:{indizes.step}".encode('ascii'))
+            else:
+                h.update(indizes.tobytes())
+            if stand is not None:
+                h.update(b'\0' + stand.encode('ascii'))
+            else:
+                for i in indizes:
+                    h.update(self.katalog[i]['frage'].encode('utf-8') + b'\0')
+            self._fingerabdruck = h.hexdigest()
+        return self._fingerabdruck
+    
+    def zustand(self):
+        """
+        Gibt den Zustand der Sitzung als JSON-fähiges Dictionary zurück.
+        
+        Enthält Reihenfolge, Position, Bewertungen und Antworten, aber keine
+        Fragen; diese werden beim Wiederherstellen aus dem Katalog gelesen.
+        
+        Returns:
+            dict: Zustand für aus_zustand()
+        """
+        return {
+            'version': 1,
+            'art': self.ART,
+            'modus': self.modus,
+            'max_tippfehler': self.max_tippfehler,
+            'original': _indizes_als_daten(self._original_indizes),
+            'reihenfolge': None if self._reihenfolge is self._original_indizes else _indizes_als_daten(self._reihenfolge),
+            'current_index': self.current_index,
+            'richtige_antworten': self.richtige_antworten,
+            'historie': base64.b64encode(self._historie.als_bytes()).decode('ascii'),
+            'historie_laenge': len(self._historie),
+            'user_antworten': self.user_antworten,
+            'fingerabdruck': self.fingerabdruck(),
+        }
+    
+    @classmethod
+    def aus_zustand(cls, katalog, zustand):
+        """
+        Stellt eine Sitzung aus zustand() über dem gegebenen Katalog wieder her.
+        
+        Args:
+            katalog (Sequence): Der Fragenkatalog, über dem die Sitzung lief
+            zustand (dict): Zustand aus zustand()
+        
+        Returns:
+            QuizSession: Die Sitzung oder None wenn der Zustand nicht (mehr) zum Katalog passt
+        """
+        if zustand.get('version') != 1:
+            return None
+        try:
+            original = _indizes_aus_daten(zustand['original'])
+            reihenfolge = original if zustand['reihenfolge'] is None else _indizes_aus_daten(zustand['reihenfolge'])
+            if len(original) and max(original) >= len(katalog):
+                return None
+            quiz = cls(katalog, zustand['modus'], max_tippfehler=zustand['max_tippfehler'], indizes=original)
+            if quiz.fingerabdruck() != zustand['fingerabdruck']:
+                return None
+            quiz._reihenfolge = reihenfolge
+            quiz.current_index = zustand['current_index']
+            quiz.richtige_antworten = zustand['richtige_antworten']
+            quiz._historie = BitListe.aus_bytes(base64.b64decode(zustand['historie']), zustand['historie_laenge'])
+            quiz.user_antworten = list(zustand['user_antworten'])
+            quiz._berechne_themen_statistik()
+        except (KeyError, TypeError, ValueError, IndexError) as e:
+            print(f"Warnung: Gespeicherte Quiz-Sitzung ist ungültig: {e}")
+            return None
+        return quiz
+    
+    @property
+    def ist_kompaktiert(self):
+        return self._kompakt is not None
+    
+    def speicherbedarf(self):
+        """
+        Schätzt den Speicher der sitzungseigenen Daten in Bytes.
+        
+        Der geteilte Katalog zählt nicht mit, Indexfolgen und Antworttexte
+        dagegen schon (auch wenn eine Indexfolge aus dem ThemenIndex stammt).
+        
+        Returns:
+            int: Geschätzte Größe
+        """
+        groesse = sys.getsizeof(self) + sys.getsizeof(self.__dict__)
+        for name, wert in self.__dict__.items():
+            if name == 'katalog':
+                continue
+            if isinstance(wert, BitListe):
+                groesse += sys.getsizeof(wert) + sys.getsizeof(wert._bytes)
+                continue
+            groesse += sys.getsizeof(wert)
+            if isinstance(wert, (list, set)):
+                groesse += sum(sys.getsizeof(eintrag) for eintrag in wert)
+            elif isinstance(wert, dict):
+                groesse += sum(sys.getsizeof(schluessel) + sys.getsizeof(eintrag) for schluessel, eintrag in wert.items())
+        return groesse
+    
+    def kompaktiere(self):
+        """
+        Ersetzt den Zustand einer ruhenden Sitzung durch komprimiertes JSON.
+        
+        Danach sind nur noch Katalogreferenz und der komprimierte zustand()
+        vorhanden; vor der nächsten Benutzung muss entpacke() aufgerufen
+        werden (siehe sitzungsbudget).
+        
+        Returns:
+            int: Eingesparte Bytes (geschätzt), 0 wenn bereits kompaktiert
+        """
+        if self._kompakt is not None:
+            return 0
+        vorher = self.speicherbedarf()
+        daten = zlib.compress(
+            json.dumps(self.zustand(), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        )
+        katalog = self.katalog
+        self.__dict__.clear()
+        self.katalog = katalog
+        self._kompakt = daten
+        return max(0, vorher - self.speicherbedarf())
+    
+    def entpacke(self):
+        """
+        Stellt eine kompaktierte Sitzung wieder her.
+        
+        Returns:
+            bool: True wenn die Sitzung benutzbar ist, False wenn ihr Zustand
+                  nicht mehr zum Katalog passt
+        """
+        if self._kompakt is None:
+            return True
+        zustand = json.loads(zlib.decompress(self._kompakt))
+        quiz = type(self).aus_zustand(self.katalog, zustand)
+        if quiz is None:
+            return False
+        self.__dict__.clear()
+        self.__dict__.update(quiz.__dict__)
+        return True
     
     def get_current_question(self):
         """
@@ -34,8 +401,8 @@ class QuizSession:
         Returns:
             dict: Das aktuelle Fragen-Objekt oder None wenn das Quiz beendet ist
         """
-        if self.current_index < len(self.fragen):
-            return self.fragen[self.current_index]
+        if self.current_index < len(self._reihenfolge):
+            return self.katalog[self._reihenfolge[self.current_index]]
         return None
     
     def submit_answer(self, user_antwort):
@@ -48,24 +415,30 @@ class QuizSession:
         Returns:
             bool: True wenn die Antwort korrekt war, False sonst
         """
-        if self.current_index >= len(self.fragen):
+        if self.current_index >= len(self._reihenfolge):
             return False
+        if len(self._historie) > self.current_index:
+            # Bereits beantwortet: Die erste Bewertung bleibt bestehen
+            return self._historie[self.current_index]
         
-        current_question = self.fragen[self.current_index]
+        current_question = self.katalog[self._reihenfolge[self.current_index]]
         
-        # Antwort validieren
-        is_correct = validiere_antwort(
+        # Antwort validieren (je nach QUIZMASTER_BEWERTUNG im Thread- oder Prozess-Pool, mit Timeout)
+        is_correct = hole_bewertungs_executor().bewerte(
             user_antwort, 
             current_question['antwort'], 
-            current_question['synonyme']
+            current_question['synonyme'],
+            max_tippfehler=self.max_tippfehler
         )
         
         # Ergebnisse speichern
-        self.antwort_historie.append(is_correct)
+        self._historie.append(is_correct)
         self.user_antworten.append(user_antwort)
         
         if is_correct:
             self.richtige_antworten += 1
+        self._zaehle_thema(current_question['thema'], is_correct)
+        erfasse_antwort(current_question, is_correct)
         
         return is_correct
     
@@ -75,6 +448,72 @@ class QuizSession:
         """
         self.current_index += 1
     
+    def undo(self):
+        """
+        Kehrt zur vorherigen Frage zurück und nimmt deren Antwort zurück.
+        
+        Eine bereits abgegebene Antwort auf die aktuelle Frage wird ebenfalls
+        verworfen. Die Historie dient als Journal: Die i-te Bewertung gehört
+        zur i-ten Frage der Reihenfolge, daher ist jedes Zurücknehmen O(1)
+        und alle Zähler bleiben konsistent.
+        
+        Returns:
+            bool: True wenn zurückgegangen wurde, False am Anfang des Quiz
+        """
+        if self.current_index <= 0:
+            return False
+        ziel = self.current_index - 1
+        while len(self._historie) > ziel:
+            position = len(self._historie) - 1
+            korrekt = self._historie.pop()
+            self.user_antworten.pop()
+            if korrekt:
+                self.richtige_antworten -= 1
+            frage = self.katalog[self._reihenfolge[position]]
+            self._zaehle_thema(frage['thema'], korrekt, -1)
+            erfasse_antwort(frage, korrekt, -1)
+        self.current_index = ziel
+        return True
+    
+    def auswertung(self, schwelle=SCHWACH_SCHWELLE):
+        """
+        Gibt die laufend gepflegte Auswertung nach Themen zurück.
+        
+        Args:
+            schwelle (float): Erfolgsquote in Prozent, unter der ein Thema als schwach gilt
+        
+        Returns:
+            dict: 'total_questions', 'correct_answers', 'percentage', 'topic_analysis'
+                  (Thema -> {'total', 'correct'}) und 'weak_topics' (Liste von
+                  (Thema, Prozent, Fehler), schwächstes zuerst) oder None ohne Antworten
+        """
+        beantwortet = len(self._historie)
+        if not beantwortet:
+            return None
+        
+        if schwelle == SCHWACH_SCHWELLE:
+            schwache = self._schwache_themen
+        else:
+            schwache = [
+                thema for thema, (total, correct) in self._themen_statistik.items()
+                if correct * 100 < schwelle * total
+            ]
+        weak_topics = []
+        for thema in schwache:
+            total, correct = self._themen_statistik[thema]
+            weak_topics.append((thema, (correct / total) * 100, total - correct))
+        
+        return {
+            'total_questions': beantwortet,
+            'correct_answers': self.richtige_antworten,
+            'percentage': (self.richtige_antworten / beantwortet) * 100,
+            'topic_analysis': {
+                thema: {'total': total, 'correct': correct}
+                for thema, (total, correct) in self._themen_statistik.items()
+            },
+            'weak_topics': sorted(weak_topics, key=lambda x: x[1])
+        }
+    
     def is_finished(self):
         """
         Prüft ob das Quiz beendet ist.
@@ -82,7 +521,7 @@ class QuizSession:
         Returns:
             bool: True wenn alle Fragen bearbeitet wurden
         """
-        return self.current_index >= len(self.fragen)
+        return self.current_index >= len(self._reihenfolge)
     
     def get_progress(self):
         """
@@ -91,10 +530,11 @@ class QuizSession:
         Returns:
             dict: Dictionary mit Fortschrittsinformationen
         """
+        total = len(self._reihenfolge)
         return {
             'current': self.current_index,
-            'total': len(self.fragen),
-            'percentage': (self.current_index / len(self.fragen)) * 100 if self.fragen else 0,
+            'total': total,
+            'percentage': (self.current_index / total) * 100 if total else 0,
             'correct': self.richtige_antworten,
             'accuracy': (self.richtige_antworten / self.current_index) * 100 if self.current_index > 0 else 0
         }
@@ -106,7 +546,7 @@ class QuizSession:
         Returns:
             dict: Dictionary mit Endergebnissen
         """
-        total_questions = len(self.fragen)
+        total_questions = len(self._reihenfolge)
         percentage = (self.richtige_antworten / total_questions) * 100 if total_questions > 0 else 0
         
         return {
@@ -145,15 +585,11 @@ class QuizSession:
         """
         Setzt das Quiz zurück auf den Anfang.
         """
-        self.current_index = 0
-        self.richtige_antworten = 0
-        self.antwort_historie = []
-        self.user_antworten = []
+        self._leere_ergebnisse()
         
         # Fragen erneut mischen wenn es eine Prüfungssimulation ist
         if self.modus == "Prüfungssimulation":
-            self.fragen = self.original_fragen.copy()
-            random.shuffle(self.fragen)
+            self._mische()
     
     def get_question_details(self, question_index):
         """
@@ -165,12 +601,181 @@ class QuizSession:
         Returns:
             dict: Details zur Frage inkl. Benutzerantwort und Bewertung
         """
-        if 0 <= question_index < len(self.fragen) and question_index < len(self.antwort_historie):
-            question = self.fragen[question_index]
+        if 0 <= question_index < len(self._reihenfolge) and question_index < len(self._historie):
+            question = self.katalog[self._reihenfolge[question_index]]
             return {
                 'question': question,
                 'user_answer': self.user_antworten[question_index] if question_index < len(self.user_antworten) else "",
-                'was_correct': self.antwort_historie[question_index],
+                'was_correct': self._historie[question_index],
                 'correct_answer': question['antwort']
             }
         return None
+
+class WiederholungsSession(QuizSession):
+    """
+    Lernsitzung mit verteilter Wiederholung nach dem Leitner-System.
+    
+    Jede Frage liegt in einem Fach (ein Byte je Frage). Eine richtige Antwort
+    schiebt sie ein Fach weiter, eine falsche zurück ins erste. Je Fach ist
+    in LEITNER_INTERVALLE festgelegt, nach wie vielen weiteren Antworten die
+    Frage wieder fällig wird; die Fälligkeiten liegen in einem Heap, sodass
+    die nächste Frage in O(log n) bestimmt wird. Ist nichts fällig, kommt
+    eine neue Frage an die Reihe, sonst die am frühesten fällige. Die
+    Sitzung endet, wenn alle Fragen gelernt sind.
+    
+    Gestellte Fragen werden wie bei QuizSession an die Reihenfolge angehängt,
+    sodass Historie, Antworten und Auswertung unverändert funktionieren.
+    """
+    
+    ART = 'wiederholung'
+    
+    def __init__(self, fragen_liste, modus, shuffle=False, max_tippfehler=None, indizes=None):
+        """
+        Args:
+            Wie QuizSession; shuffle mischt die Reihenfolge, in der neue Fragen hinzukommen.
+        """
+        super().__init__(fragen_liste, modus, max_tippfehler=max_tippfehler, indizes=indizes)
+        self.shuffle = shuffle
+        self._starte_plan()
+    
+    def _starte_plan(self):
+        anzahl = len(self._original_indizes)
+        # Positionen im Bereich, in der Reihenfolge, in der neue Fragen hinzukommen
+        self._neue_fragen = range(anzahl)
+        if self.shuffle:
+            self._neue_fragen = array('I', self._neue_fragen)
+            random.shuffle(self._neue_fragen)
+        self._naechste_neue = 0
+        self._faecher = bytearray(anzahl)
+        # Heap-Einträge als eine Zahl: Fälligkeit << 32 | Position (kompakter als Tupel)
+        self._faellig = []
+        self.gelernt = 0
+        self._reihenfolge = array('I')
+        self._position = None
+        self._waehle_naechste()
+    
+    def _waehle_naechste(self):
+        """Bestimmt die nächste Frage und hängt sie an die Reihenfolge an."""
+        schritt = len(self._historie)
+        if self._faellig and self._faellig[0] >> 32 <= schritt:
+            position = heapq.heappop(self._faellig) & 0xFFFFFFFF
+        elif self._naechste_neue < len(self._neue_fragen):
+            position = self._neue_fragen[self._naechste_neue]
+            self._naechste_neue += 1
+        elif self._faellig:
+            position = heapq.heappop(self._faellig) & 0xFFFFFFFF
+        else:
+            self._position = None
+            return
+        self._position = position
+        self._reihenfolge.append(self._original_indizes[position])
+    
+    def submit_answer(self, user_antwort):
+        """
+        Bewertet die Antwort wie QuizSession und plant die Frage neu ein.
+        
+        Returns:
+            bool: True wenn die Antwort korrekt war, False sonst
+        """
+        # Jede gestellte Frage wird genau einmal bewertet
+        if self._position is None or len(self._historie) != self.current_index:
+            return False
+        is_correct = super().submit_answer(user_antwort)
+        
+        position = self._position
+        fach = self._faecher[position] + 1 if is_correct else 0
+        if fach >= len(LEITNER_INTERVALLE):
+            self.gelernt += 1
+            self._faecher[position] = len(LEITNER_INTERVALLE)
+        else:
+            self._faecher[position] = fach
+            faellig = len(self._historie) + LEITNER_INTERVALLE[fach]
+            heapq.heappush(self._faellig, (faellig << 32) | position)
+        return is_correct
+    
+    def next_question(self):
+        """
+        Geht zur nächsten fälligen Frage über.
+        """
+        self.current_index += 1
+        if self.current_index >= len(self._reihenfolge):
+            self._waehle_naechste()
+    
+    def get_progress(self):
+        """
+        Gibt den Lernfortschritt zurück ('current'/'total' zählen gelernte Fragen).
+        
+        Returns:
+            dict: Dictionary mit Fortschrittsinformationen
+        """
+        total = len(self._original_indizes)
+        return {
+            'current': self.gelernt,
+            'total': total,
+            'percentage': (self.gelernt / total) * 100 if total else 0,
+            'correct': self.richtige_antworten,
+            'accuracy': (self.richtige_antworten / self.current_index) * 100 if self.current_index > 0 else 0
+        }
+    
+    def reset(self):
+        """
+        Setzt Karteikasten und Fortschritt zurück.
+        """
+        self._leere_ergebnisse()
+        self._starte_plan()
+    
+    def undo(self):
+        """
+        Wird nicht unterstützt: Die beantwortete Frage ist bereits neu eingeplant.
+        
+        Returns:
+            bool: Immer False
+        """
+        return False
+    
+    def zustand(self):
+        """Wie QuizSession.zustand(), zusätzlich mit Fächern und Fälligkeiten."""
+        zustand = super().zustand()
+        zustand['wiederholung'] = {
+            'neue_fragen': _indizes_als_daten(self._neue_fragen),
+            'naechste_neue': self._naechste_neue,
+            'faecher': base64.b64encode(bytes(self._faecher)).decode('ascii'),
+            'faellig': self._faellig,
+            'gelernt': self.gelernt,
+            'position': self._position,
+        }
+        return zustand
+    
+    @classmethod
+    def aus_zustand(cls, katalog, zustand):
+        quiz = super().aus_zustand(katalog, zustand)
+        if quiz is None:
+            return None
+        try:
+            plan = zustand['wiederholung']
+            quiz._neue_fragen = _indizes_aus_daten(plan['neue_fragen'])
+            quiz.shuffle = isinstance(quiz._neue_fragen, array)
+            quiz._naechste_neue = plan['naechste_neue']
+            quiz._faecher = bytearray(base64.b64decode(plan['faecher']))
+            quiz._faellig = list(plan['faellig'])
+            heapq.heapify(quiz._faellig)
+            quiz.gelernt = plan['gelernt']
+            quiz._position = plan['position']
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Warnung: Gespeicherte Quiz-Sitzung ist ungültig: {e}")
+            return None
+        return quiz
+
+_SITZUNGS_ARTEN = {klasse.ART: klasse for klasse in (QuizSession, WiederholungsSession)}
+
+def sitzung_aus_zustand(katalog, zustand):
+    """
+    Stellt eine Sitzung passender Art (Quiz oder Wiederholung) aus ihrem Zustand wieder her.
+    
+    Returns:
+        QuizSession: Die Sitzung oder None wenn der Zustand ungültig ist
+    """
+    klasse = _SITZUNGS_ARTEN.get(zustand.get('art', 'quiz'))
+    if klasse is None:
+        return None
+    return klasse.aus_zustand(katalog, zustand)
@@ -0,0 +1,236 @@
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from instrumentierung import zaehle
+
+# Speicherbudget je Sitzung in KB; größere Sitzungen werden kompaktiert, sobald sie BUDGET_LEERLAUF_S ruhen (0 = aus)
+SITZUNG_BUDGET_KB = float(os.environ.get('QUIZMASTER_SITZUNG_BUDGET_KB', '512'))
+
+# Budget aller Sitzungen des Prozesses in MB; darüber werden die am längsten ruhenden kompaktiert (0 = aus)
+GESAMT_BUDGET_MB = float(os.environ.get('QUIZMASTER_SITZUNGEN_BUDGET_MB', '0'))
+
+# Sitzungen ohne Rerun seit so vielen Sekunden werden kompaktiert (0 = nie)
+LEERLAUF_S = float(os.environ.get('QUIZMASTER_SITZUNG_LEERLAUF_S', '600'))
+
+# Mindestruhe in Sekunden, bevor eine Sitzung wegen eines Budgets kompaktiert wird
+BUDGET_LEERLAUF_S = float(os.environ.get('QUIZMASTER_SITZUNG_BUDGET_LEERLAUF_S', '60'))
+
+class _Eintrag:
+    __slots__ = ('quiz', 'bytes', 'zuletzt', 'aktiv', 'sperre')
+
+    def __init__(self):
+        self.quiz = None     # weakref auf die QuizSession, damit das Register sie nicht festhält
+        self.bytes = 0
+        self.zuletzt = time.monotonic()
+        self.aktiv = 0       # laufende Reruns dieser Sitzung
+        self.sperre = threading.Lock()  # schützt Kompaktieren und Entpacken dieser Sitzung
+
+    def hole_quiz(self):
+        return self.quiz() if self.quiz is not None else None
+
+class SitzungsRegister:
+    """
+    Prozessweite Übersicht über den Speicher der Quiz-Sitzungen.
+
+    Jede Browser-Sitzung meldet sich zu Beginn eines Reruns mit betrete()
+    und am Ende mit verlasse() samt ihrer QuizSession. Das Register hält
+    die Sitzungen nur schwach referenziert in LRU-Reihenfolge (zuletzt
+    aktiv am Ende), sodass geschlossene Tabs weiterhin freigegeben werden.
+
+    Ruhende Sitzungen werden von aufraeumen() (regelmäßig in einem
+    Hintergrund-Thread) kompaktiert (QuizSession.kompaktiere(): der Zustand
+    als komprimiertes JSON), und zwar
+      - nach LEERLAUF_S Sekunden ohne Rerun,
+      - wenn sie SITZUNG_BUDGET_KB überschreiten, nach BUDGET_LEERLAUF_S,
+      - in LRU-Reihenfolge, solange alle zusammen GESAMT_BUDGET_MB
+        überschreiten, ebenfalls erst nach BUDGET_LEERLAUF_S.
+    Beim nächsten betrete() wird die Sitzung transparent entpackt. Sitzungen
+    in Benutzung werden nie kompaktiert, auch große nicht: Die Kosten sollen
+    nicht bei jedem Klick anfallen. Kompaktiert und entpackt wird außerhalb
+    der Registersperre, unter der Sperre der jeweiligen Sitzung.
+    """
+
+    def __init__(self, sitzung_budget_kb=SITZUNG_BUDGET_KB, gesamt_budget_mb=GESAMT_BUDGET_MB,
+                 leerlauf_s=LEERLAUF_S, budget_leerlauf_s=BUDGET_LEERLAUF_S):
+        self.sitzung_budget = int(sitzung_budget_kb * 1024)
+        self.gesamt_budget = int(gesamt_budget_mb * 1024 * 1024)
+        self.leerlauf_s = leerlauf_s
+        self.budget_leerlauf_s = budget_leerlauf_s
+        self._eintraege = OrderedDict()  # Sitzungs-ID -> _Eintrag
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _starte_aufraeumen(self):
+        if self._thread is not None:
+            return
+        fristen = [self.leerlauf_s] if self.leerlauf_s > 0 else []
+        if self.sitzung_budget or self.gesamt_budget:
+            fristen.append(max(self.budget_leerlauf_s, 1.0))
+        if not fristen:
+            return
+        intervall = min(30.0, min(fristen) / 2)
+
+        def schleife():
+            while True:
+                time.sleep(intervall)
+                self.aufraeumen()
+
+        self._thread = threading.Thread(target=schleife, name='sitzungsbudget', daemon=True)
+        self._thread.start()
+
+    def betrete(self, sitzungs_id):
+        """
+        Markiert die Sitzung als aktiv und entpackt ihre QuizSession bei Bedarf.
+
+        Returns:
+            bool: False wenn die kompaktierte Sitzung nicht wiederhergestellt
+                  werden konnte (z.B. weil sich der Katalog geändert hat)
+        """
+        with self._lock:
+            eintrag = self._eintraege.get(sitzungs_id)
+            if eintrag is None:
+                eintrag = self._eintraege[sitzungs_id] = _Eintrag()
+                self._starte_aufraeumen()
+            else:
+                self._eintraege.move_to_end(sitzungs_id)
+            eintrag.aktiv += 1
+            quiz = eintrag.hole_quiz()
+
+        if quiz is None:
+            return True
+        # Wartet ggf. auf ein laufendes Kompaktieren; danach ist die Sitzung aktiv und bleibt unberührt
+        with eintrag.sperre:
+            if not quiz.ist_kompaktiert:
+                return True
+            zaehle('sitzung_entpackt')
+            return quiz.entpacke()
+
+    def verlasse(self, sitzungs_id, quiz):
+        """
+        Beendet einen Rerun und erfasst den Speicher der aktuellen QuizSession.
+
+        Args:
+            sitzungs_id (str): ID der Browser-Sitzung
+            quiz (QuizSession): Die Sitzung nach dem Rerun oder None
+        """
+        groesse = quiz.speicherbedarf() if quiz is not None and not quiz.ist_kompaktiert else 0
+        with self._lock:
+            eintrag = self._eintraege.get(sitzungs_id)
+            if eintrag is None:
+                eintrag = self._eintraege[sitzungs_id] = _Eintrag()
+                self._starte_aufraeumen()
+            eintrag.aktiv = max(0, eintrag.aktiv - 1)
+            eintrag.quiz = weakref.ref(quiz) if quiz is not None else None
+            eintrag.bytes = groesse
+            eintrag.zuletzt = time.monotonic()
+            self._eintraege.move_to_end(sitzungs_id)
+
+    def entferne(self, sitzungs_id):
+        """Vergisst eine Sitzung (z.B. wenn sie beendet wurde)."""
+        with self._lock:
+            self._eintraege.pop(sitzungs_id, None)
+
+    def _kompaktiere(self, eintrag, quiz, grund):
+        """Kompaktiert eine ruhende Sitzung (Aufruf ohne self._lock)."""
+        with eintrag.sperre:
+            # Inzwischen wieder benutzt oder schon kompaktiert: nichts tun
+            if eintrag.aktiv or quiz.ist_kompaktiert:
+                return False
+            gespart = quiz.kompaktiere()
+        with self._lock:
+            eintrag.bytes = max(0, eintrag.bytes - gespart)
+        zaehle('sitzung_kompaktiert', grund=grund)
+        return True
+
+    def aufraeumen(self):
+        """
+        Kompaktiert ruhende Sitzungen und vergisst freigegebene.
+
+        Returns:
+            int: Anzahl der dabei kompaktierten Sitzungen
+        """
+        jetzt = time.monotonic()
+        leerlauf_grenze = jetzt - self.leerlauf_s
+        budget_grenze = jetzt - self.budget_leerlauf_s
+        kandidaten = []  # (Eintrag, QuizSession, Grund) in LRU-Reihenfolge
+        with self._lock:
+            gesamt = 0
+            for sitzungs_id, eintrag in list(self._eintraege.items()):
+                quiz = eintrag.hole_quiz()
+                if quiz is None:
+                    if eintrag.quiz is not None or (not eintrag.aktiv and eintrag.zuletzt < leerlauf_grenze):
+                        # Sitzung geschlossen bzw. ohne Quiz und lange unbenutzt
+                        del self._eintraege[sitzungs_id]
+                    continue
+                gesamt += eintrag.bytes
+                if eintrag.aktiv or quiz.ist_kompaktiert:
+                    continue
+                if self.leerlauf_s > 0 and eintrag.zuletzt < leerlauf_grenze:
+                    kandidaten.append((eintrag, quiz, 'leerlauf'))
+                elif self.sitzung_budget and eintrag.bytes > self.sitzung_budget and eintrag.zuletzt < budget_grenze:
+                    kandidaten.append((eintrag, quiz, 'budget'))
+                elif self.gesamt_budget and eintrag.zuletzt < budget_grenze:
+                    kandidaten.append((eintrag, quiz, 'gesamtbudget'))
+
+        kompaktiert = 0
+        for eintrag, quiz, grund in kandidaten:
+            if grund == 'gesamtbudget' and gesamt <= self.gesamt_budget:
+                continue
+            vorher = eintrag.bytes
+            if self._kompaktiere(eintrag, quiz, grund):
+                gesamt -= vorher - eintrag.bytes
+                kompaktiert += 1
+        return kompaktiert
+
+    def uebersicht(self):
+        """
+        Speicher aller bekannten Sitzungen, größte zuerst.
+
+        Returns:
+            dict: 'sitzungen' (Liste mit id, bytes, leerlauf_s, kompaktiert, art,
+                  fragen, beantwortet), 'gesamt_bytes', 'kompaktiert', 'budget_bytes'
+        """
+        jetzt = time.monotonic()
+        with self._lock:
+            eintraege = [(sitzungs_id, eintrag, eintrag.hole_quiz()) for sitzungs_id, eintrag in self._eintraege.items()]
+        sitzungen = []
+        for sitzungs_id, eintrag, quiz in eintraege:
+            if quiz is None:
+                continue
+            with eintrag.sperre:
+                kompaktiert = quiz.ist_kompaktiert
+                sitzungen.append({
+                    'id': sitzungs_id,
+                    'bytes': eintrag.bytes,
+                    'leerlauf_s': round(jetzt - eintrag.zuletzt, 1),
+                    'kompaktiert': kompaktiert,
+                    'art': quiz.ART,
+                    'fragen': None if kompaktiert else len(quiz._reihenfolge),
+                    'beantwortet': None if kompaktiert else len(quiz.antwort_historie),
+                })
+        sitzungen.sort(key=lambda s: s['bytes'], reverse=True)
+        return {
+            'sitzungen': sitzungen,
+            'gesamt_bytes': sum(s['bytes'] for s in sitzungen),
+            'kompaktiert': sum(1 for s in sitzungen if s['kompaktiert']),
+            'budget_bytes': self.sitzung_budget,
+        }
+
+_register = None
+_register_lock = threading.Lock()
+
+def hole_sitzungsregister():
+    """
+    Gibt das prozessweite Sitzungsregister zurück.
+
+    Returns:
+        SitzungsRegister: Das gemeinsame Register
+    """
+    global _register
+    if _register is None:
+        with _register_lock:
+            if _register is None:
+                _register = SitzungsRegister()
+    return _register
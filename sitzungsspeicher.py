@@ -0,0 +1,227 @@
+import atexit
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from quiz_logic import sitzung_aus_zustand
+
+# Persistenz nur wenn ein Datenbankpfad gesetzt ist, z.B. QUIZMASTER_SITZUNGEN_DB=sitzungen.db
+SITZUNGEN_DB = os.environ.get('QUIZMASTER_SITZUNGEN_DB', '').strip()
+
+# Abstand der gesammelten Schreibvorgänge in Sekunden
+FLUSH_INTERVALL_S = float(os.environ.get('QUIZMASTER_SITZUNGEN_FLUSH_S', '2.0'))
+
+# Nicht mehr genutzte Sitzungen werden nach dieser Zeit gelöscht
+MAX_ALTER_TAGE = float(os.environ.get('QUIZMASTER_SITZUNGEN_MAX_ALTER_TAGE', '7'))
+
+def neues_token():
+    """Erzeugt ein zufälliges Token, unter dem eine Sitzung fortgesetzt werden kann."""
+    return secrets.token_urlsafe(16)
+
+class SitzungsSpeicher:
+    """
+    Dauerhafte Ablage von Quiz-Sitzungen in SQLite.
+
+    speichere() legt den Zustand nur im Speicher ab; ein Hintergrund-Thread
+    schreibt alle seit dem letzten Durchlauf geänderten Sitzungen in einer
+    einzigen Transaktion. Mehrere Änderungen derselben Sitzung innerhalb
+    eines Intervalls werden so zu einem Schreibvorgang zusammengefasst.
+    """
+
+    def __init__(self, pfad, flush_intervall=FLUSH_INTERVALL_S, max_alter_tage=MAX_ALTER_TAGE):
+        """
+        Args:
+            pfad (str): Pfad der SQLite-Datenbank (wird bei Bedarf angelegt)
+            flush_intervall (float): Sekunden zwischen zwei Schreibvorgängen
+            max_alter_tage (float): Sitzungen ohne Änderung seit so vielen Tagen werden gelöscht
+        """
+        self.pfad = pfad
+        self.flush_intervall = flush_intervall
+        self._verbindung = sqlite3.connect(pfad, check_same_thread=False, isolation_level=None)
+        # WAL: Leser blockieren den Schreiber nicht; NORMAL: kein fsync je Transaktion
+        self._verbindung.execute("PRAGMA journal_mode=WAL")
+        self._verbindung.execute("PRAGMA synchronous=NORMAL")
+        self._verbindung.execute(
+            "CREATE TABLE IF NOT EXISTS sitzungen ("
+            "token TEXT PRIMARY KEY, zustand TEXT NOT NULL, aktualisiert REAL NOT NULL)"
+        )
+        if max_alter_tage > 0:
+            self._verbindung.execute(
+                "DELETE FROM sitzungen WHERE aktualisiert < ?",
+                (time.time() - max_alter_tage * 86400,)
+            )
+
+        self._lock = threading.Lock()     # schützt _ausstehend, _in_arbeit, _zuletzt
+        self._db_lock = threading.Lock()  # eine Verbindung, ein Schreiber
+        self._ausstehend = {}  # Token -> (JSON, Zeitpunkt) oder None zum Löschen
+        self._in_arbeit = {}   # gerade geschriebener Stapel, bis zum Commit sichtbar
+        self._zuletzt = {}     # Token -> zuletzt übergebener JSON-Text (unverändert = nichts tun)
+        self._stopp = threading.Event()
+        self._thread = threading.Thread(target=self._flush_schleife, name='sitzungsspeicher', daemon=True)
+        self._thread.start()
+        atexit.register(self.schliessen)
+
+    def speichere(self, token, quiz):
+        """
+        Merkt den aktuellen Zustand einer Sitzung zum Schreiben vor.
+
+        Args:
+            token (str): Token der Sitzung
+            quiz (QuizSession): Die zu sichernde Sitzung
+        """
+        daten = json.dumps(quiz.zustand(), ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            if self._zuletzt.get(token) == daten:
+                return
+            self._zuletzt[token] = daten
+            self._ausstehend[token] = (daten, time.time())
+
+    def loesche(self, token):
+        """
+        Entfernt eine Sitzung (z.B. nach Rückkehr ins Hauptmenü).
+
+        Returns:
+            bool: Ob die Sitzung gespeichert oder zum Speichern vorgemerkt war
+        """
+        with self._lock:
+            self._zuletzt.pop(token, None)
+            if token in self._ausstehend:
+                vorhanden = self._ausstehend[token] is not None
+            elif token in self._in_arbeit:
+                vorhanden = self._in_arbeit[token] is not None
+            else:
+                vorhanden = None
+        if vorhanden is None:
+            with self._db_lock:
+                vorhanden = self._verbindung.execute(
+                    "SELECT 1 FROM sitzungen WHERE token = ?", (token,)
+                ).fetchone() is not None
+        with self._lock:
+            self._ausstehend[token] = None
+        return vorhanden
+
+    def lade(self, token, katalog):
+        """
+        Stellt eine gespeicherte Sitzung wieder her.
+
+        Args:
+            token (str): Token der Sitzung
+            katalog (Sequence): Aktueller Fragenkatalog
+
+        Returns:
+            QuizSession: Die Sitzung oder None wenn das Token unbekannt ist
+                         oder nicht mehr zum Katalog passt
+        """
+        with self._lock:
+            if token in self._ausstehend:
+                eintrag = self._ausstehend[token]
+            elif token in self._in_arbeit:
+                eintrag = self._in_arbeit[token]
+            else:
+                eintrag = False
+        if eintrag is None:
+            return None
+        if eintrag is not False:
+            daten = eintrag[0]
+        else:
+            with self._db_lock:
+                zeile = self._verbindung.execute(
+                    "SELECT zustand FROM sitzungen WHERE token = ?", (token,)
+                ).fetchone()
+            if zeile is None:
+                return None
+            daten = zeile[0]
+
+        try:
+            zustand = json.loads(daten)
+        except ValueError as e:
+            print(f"Warnung: Gespeicherte Quiz-Sitzung ist ungültig: {e}")
+            return None
+        quiz = sitzung_aus_zustand(katalog, zustand)
+        if quiz is not None:
+            with self._lock:
+                self._zuletzt[token] = daten
+        return quiz
+
+    def flush(self):
+        """
+        Schreibt alle vorgemerkten Änderungen in einer Transaktion.
+
+        Returns:
+            int: Anzahl geschriebener bzw. gelöschter Sitzungen
+        """
+        with self._lock:
+            if not self._ausstehend:
+                return 0
+            stapel = self._ausstehend
+            self._ausstehend = {}
+            self._in_arbeit = stapel
+
+        schreiben = [(token, eintrag[0], eintrag[1]) for token, eintrag in stapel.items() if eintrag is not None]
+        loeschen = [(token,) for token, eintrag in stapel.items() if eintrag is None]
+        try:
+            with self._db_lock:
+                self._verbindung.execute("BEGIN")
+                try:
+                    self._verbindung.executemany(
+                        "INSERT INTO sitzungen (token, zustand, aktualisiert) VALUES (?, ?, ?) "
+                        "ON CONFLICT(token) DO UPDATE SET zustand = excluded.zustand, aktualisiert = excluded.aktualisiert",
+                        schreiben
+                    )
+                    self._verbindung.executemany("DELETE FROM sitzungen WHERE token = ?", loeschen)
+                    self._verbindung.execute("COMMIT")
+                except sqlite3.Error:
+                    self._verbindung.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            print(f"Warnung: Quiz-Sitzungen konnten nicht gespeichert werden: {e}")
+            with self._lock:
+                # Beim nächsten Durchlauf erneut versuchen, sofern inzwischen nichts Neueres vorliegt
+                for token, eintrag in stapel.items():
+                    self._ausstehend.setdefault(token, eintrag)
+                self._in_arbeit = {}
+            return 0
+
+        with self._lock:
+            self._in_arbeit = {}
+        return len(stapel)
+
+    def _flush_schleife(self):
+        while not self._stopp.wait(self.flush_intervall):
+            self.flush()
+
+    def schliessen(self):
+        """Schreibt ausstehende Änderungen und schließt die Datenbank."""
+        if self._stopp.is_set():
+            return
+        self._stopp.set()
+        self._thread.join()
+        self.flush()
+        with self._db_lock:
+            self._verbindung.close()
+
+_speicher = None
+_speicher_fehlgeschlagen = False
+_speicher_lock = threading.Lock()
+
+def hole_sitzungsspeicher():
+    """
+    Gibt den prozessweiten Sitzungsspeicher zurück.
+
+    Returns:
+        SitzungsSpeicher: Der Speicher oder None wenn QUIZMASTER_SITZUNGEN_DB nicht gesetzt ist
+    """
+    global _speicher, _speicher_fehlgeschlagen
+    if not SITZUNGEN_DB or _speicher_fehlgeschlagen:
+        return None
+    with _speicher_lock:
+        if _speicher is None:
+            try:
+                _speicher = SitzungsSpeicher(SITZUNGEN_DB)
+            except sqlite3.Error as e:
+                print(f"Warnung: Sitzungsdatenbank '{SITZUNGEN_DB}' kann nicht geöffnet werden: {e}")
+                _speicher_fehlgeschlagen = True
+                return None
+        return _speicher
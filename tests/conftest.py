@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+
+def _schreibe_thema(pool, thema, fragen, synonyme=None):
+    """Legt einen Themenordner an; die Musterlösung zu "X?" ist "Antwort X?"."""
+    ordner = os.path.join(pool, thema)
+    os.makedirs(ordner, exist_ok=True)
+    with open(os.path.join(ordner, 'fragen.txt'), 'w', encoding='utf-8') as datei:
+        datei.write(''.join(f"{frage}\n" for frage in fragen))
+    with open(os.path.join(ordner, 'antworten.txt'), 'w', encoding='utf-8') as datei:
+        datei.write(''.join(f"Antwort {frage}\n" for frage in fragen))
+    if synonyme is not None:
+        with open(os.path.join(ordner, 'synonyme.txt'), 'w', encoding='utf-8') as datei:
+            datei.write(''.join(f"{zeile}\n" for zeile in synonyme))
+
+
+@pytest.fixture
+def schreibe_thema():
+    return _schreibe_thema
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """Ordner-Pool mit den Themen A und B zu je zwei Fragen."""
+    pfad = str(tmp_path / 'pool')
+    _schreibe_thema(pfad, 'A', ['A1?', 'A2?'])
+    _schreibe_thema(pfad, 'B', ['B1?', 'B2?'])
+    return pfad
@@ -0,0 +1,94 @@
+import pytest
+
+from file_handler import validiere_antwort
+from text_normalisierung import normalisiere_synonym
+
+
+def _synonyme(*texte):
+    return [normalisiere_synonym(text) for text in texte]
+
+
+@pytest.mark.parametrize('antwort, synonym', [
+    ("bar mitte", "arm"),
+    ("Die Isolation", "eis"),
+    ("Blut Druck", "Blutdruck"),
+])
+def test_kein_treffer_ueber_wortgrenzen_der_antwort(antwort, synonym):
+    assert not validiere_antwort(antwort, "", _synonyme(synonym))
+    assert not validiere_antwort(antwort, "", _synonyme(synonym), stemming=True)
+
+
+@pytest.mark.parametrize('antwort', ["Blutdruck", "Blut-Druck", "blut druck", "Der Blutdruck steigt"])
+def test_leerzeichen_und_bindestriche_im_synonym_zaehlen_nicht(antwort):
+    assert validiere_antwort(antwort, "", _synonyme("Blut-Druck"))
+    assert validiere_antwort(antwort, "", _synonyme("blut druck"))
+
+
+def test_dreiteiliges_synonym_in_jeder_schreibweise():
+    synonyme = _synonyme("Blut Druck Messung")
+    for antwort in ("Blutdruckmessung", "Blutdruck-Messung", "Blut Druckmessung", "blut druck messung"):
+        assert validiere_antwort(antwort, "", synonyme)
+    assert not validiere_antwort("Blut und Druck", "", synonyme)
+
+
+def test_teilwort_innerhalb_eines_antwortworts_trifft_weiterhin():
+    assert validiere_antwort("Blutdruckmessung", "", _synonyme("Blutdruck"))
+    assert validiere_antwort("Blutdruckmeßung", "", _synonyme("Blut-Druck Messung"))
+
+
+def test_stemming_mit_mehrteiligem_synonym():
+    synonyme = _synonyme("Kinder Betten")
+    assert validiere_antwort("Kinderbetten", "", synonyme, stemming=True)
+    assert validiere_antwort("Kinder-Bett", "", synonyme, stemming=True)
+    assert validiere_antwort("kind bett", "", synonyme, stemming=True)
+    assert not validiere_antwort("Kinder Garten", "", synonyme, stemming=True)
+
+
+def test_rueckfall_auf_musterloesung():
+    assert validiere_antwort("Es ist die Atmung", "Atmung und Puls", [])
+    assert not validiere_antwort("Atm ung", "Atmung", [])
+
+
+def test_viele_synonyme_mit_muster():
+    synonyme = _synonyme(*(f"begriff{i}" for i in range(60)), "Blut Druck")
+    assert validiere_antwort("hoher Blutdruck", "", synonyme)
+    assert not validiere_antwort("bar mitte", "", synonyme + ["arm"])
+
+
+def test_tippfehler_nur_fuer_ganze_woerter():
+    synonyme = _synonyme("Blutdruck")
+    assert validiere_antwort("Blutdruk", "", synonyme, max_tippfehler=1)
+    assert validiere_antwort("Blut Druk", "", synonyme, max_tippfehler=1)
+    assert not validiere_antwort("Die Isolation", "", _synonyme("eis"), max_tippfehler=1)
+
+
+def test_stapel_gruppiert_nach_frageinhalt(monkeypatch):
+    import file_handler
+
+    gebaut = []
+    original = file_handler.hole_matcher
+
+    def gezaehlt(antwort, synonyme, *args):
+        gebaut.append((antwort, tuple(synonyme)))
+        return original(antwort, synonyme, *args)
+
+    monkeypatch.setattr(file_handler, 'hole_matcher', gezaehlt)
+
+    def frage(thema, synonym):
+        # Jedes Paar bekommt ein eigenes Objekt, wie bei einem Snapshot ohne Cache
+        return {'frage': '?', 'antwort': synonym, 'synonyme': _synonyme(synonym), 'thema': thema}
+
+    paare = [
+        (frage('Kreislauf', 'Blutdruck'), 'Blutdruck'),
+        (frage('Atmung', 'Atemfrequenz'), 'Puls'),
+        (frage('Kreislauf', 'Blutdruck'), 'Blut Druck'),
+        (frage('Kreislauf', 'Blutdruck'), None),
+        (frage('Atmung', 'Atemfrequenz'), 'Atemfrequenz'),
+    ]
+    ergebnis = file_handler.bewerte_antworten(paare)
+
+    assert ergebnis['ergebnisse'] == [True, False, False, False, True]
+    assert ergebnis['total'] == 5 and ergebnis['correct'] == 2
+    assert ergebnis['themen']['Kreislauf'] == {'total': 3, 'correct': 1, 'percentage': pytest.approx(100 / 3)}
+    assert ergebnis['themen']['Atmung']['correct'] == 1
+    assert sorted(gebaut) == [('Atemfrequenz', ('atemfrequenz',)), ('Blutdruck', ('blutdruck',))]
@@ -0,0 +1,78 @@
+import random
+
+from quiz_logic import BitListe, QuizSession
+
+
+def _fragen():
+    return [
+        {'frage': f"{thema}{i}", 'antwort': "richtig", 'synonyme': ["richtig"], 'thema': thema}
+        for thema in ("Atmung", "Kreislauf", "Haut") for i in range(4)
+    ]
+
+
+def _neu_berechnet(quiz):
+    """Auswertung wie vor den laufenden Zählern: einmal über alle Antworten."""
+    themen = {}
+    for position, korrekt in enumerate(quiz.antwort_historie):
+        zaehler = themen.setdefault(quiz.katalog[quiz._reihenfolge[position]]['thema'], [0, 0])
+        zaehler[0] += 1
+        zaehler[1] += korrekt
+    return {thema: {'total': total, 'correct': correct} for thema, (total, correct) in themen.items()}
+
+
+def test_laufende_zaehler_entsprechen_neuberechnung_auch_nach_undo():
+    rng = random.Random(3)
+    quiz = QuizSession(_fragen(), "Alle Themen", shuffle=True)
+    for _ in range(40):
+        if quiz.current_index and rng.random() < 0.3:
+            assert quiz.undo()
+        elif not quiz.is_finished():
+            quiz.submit_answer("richtig" if rng.random() < 0.6 else "falsch")
+            quiz.next_question()
+        auswertung = quiz.auswertung()
+        if auswertung is None:
+            assert not quiz.antwort_historie
+            continue
+        assert auswertung['topic_analysis'] == _neu_berechnet(quiz)
+        assert auswertung['correct_answers'] == sum(quiz.antwort_historie) == quiz.richtige_antworten
+        assert auswertung['total_questions'] == len(quiz.user_antworten) == quiz.current_index
+
+
+def test_schwache_themen_folgen_der_schwelle():
+    quiz = QuizSession(_fragen(), "Alle Themen")
+    for antwort in ("richtig", "falsch", "falsch", "richtig", "richtig", "richtig", "richtig", "richtig"):
+        quiz.submit_answer(antwort)
+        quiz.next_question()
+    auswertung = quiz.auswertung()
+    assert auswertung['weak_topics'] == [("Atmung", 50.0, 2)]
+    assert {thema for thema, _, _ in quiz.auswertung(schwelle=101)['weak_topics']} == {"Atmung", "Kreislauf"}
+
+    # Zurücknehmen bis vor die falschen Antworten: kein schwaches Thema mehr
+    for _ in range(7):
+        quiz.undo()
+    assert quiz.current_index == 1
+    assert quiz.auswertung()['weak_topics'] == []
+
+
+def test_undo_am_anfang_und_verworfene_antwort_der_aktuellen_frage():
+    quiz = QuizSession(_fragen(), "Alle Themen")
+    assert quiz.undo() is False
+    quiz.submit_answer("richtig")
+    quiz.next_question()
+    quiz.submit_answer("falsch")
+    assert quiz.undo()
+    assert quiz.current_index == 0
+    assert list(quiz.antwort_historie) == []
+    assert quiz.auswertung() is None
+
+
+def test_bitliste_verhaelt_sich_wie_eine_liste():
+    werte = [random.Random(5).random() < 0.5 for _ in range(70)]
+    bits = BitListe(werte)
+    assert list(bits) == werte and len(bits) == 70
+    assert sum(bits) == sum(werte)
+    assert bits[-1] == werte[-1]
+    assert bits.pop() == werte.pop()
+    bits.append(True)
+    werte.append(True)
+    assert list(BitListe.aus_bytes(bits.als_bytes(), len(bits))) == werte
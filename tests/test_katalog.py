@@ -0,0 +1,52 @@
+import pytest
+
+from katalog import FrageNichtVerfuegbar, KatalogEintrag, LazyKatalog, hole_themen_index
+from quiz_logic import QuizSession
+
+
+def _themen_in_reihenfolge(katalog):
+    return [thema for thema, _, _ in sorted(katalog.themen_bereiche(), key=lambda b: b[1])]
+
+
+def test_verworfenes_thema_verschiebt_keine_indizes(pool, schreibe_thema):
+    katalog = LazyKatalog(pool)
+    vorne, hinten = _themen_in_reihenfolge(katalog)
+    indizes = hole_themen_index(katalog).indizes[hinten]
+    assert list(indizes) == [2, 3]
+
+    quiz = QuizSession(katalog, "Lernmodus", indizes=indizes)
+    assert quiz.get_current_question()['frage'] == f"{hinten}1?"
+
+    # Das vordere Thema ändert sich, bevor es eingelesen wurde
+    schreibe_thema(pool, vorne, [f"{vorne}1?", f"{vorne}2?", f"{vorne}3?"])
+    with pytest.raises(FrageNichtVerfuegbar):
+        katalog[0]
+
+    assert len(katalog) == 4
+    assert quiz.submit_answer(f"Antwort {hinten}1?")
+    quiz.next_question()
+    assert quiz.get_current_question()['frage'] == f"{hinten}2?"
+    assert katalog.themen_bereiche() == [(hinten, 2, 2)]
+    assert [frage['frage'] for frage in katalog] == [f"{hinten}1?", f"{hinten}2?"]
+    assert hole_themen_index(katalog).gesamt == 2
+
+
+def test_aktualisierung_entfernt_verworfenes_thema_nur_im_neuen_katalog(pool, schreibe_thema):
+    eintrag = KatalogEintrag(pool, lazy=True)
+    alt = eintrag.fragen
+    vorne, hinten = _themen_in_reihenfolge(alt)
+
+    # Gleiche Signatur, aber eine Zeile mehr: erst beim Einlesen bemerkt
+    schreibe_thema(pool, vorne, [f"{vorne}1?", f"{vorne}2?", f"{vorne}3?"])
+    eintrag.signaturen = dict(eintrag.signaturen)
+    with pytest.raises(FrageNichtVerfuegbar):
+        alt[0]
+    eintrag.aktualisieren()
+
+    assert eintrag.fragen is not alt
+    assert len(alt) == 4
+    assert alt[2]['frage'] == f"{hinten}1?"
+    neu = eintrag.fragen
+    assert [frage['frage'] for frage in neu.fragen_zum_thema(vorne)] == [f"{vorne}1?", f"{vorne}2?", f"{vorne}3?"]
+    assert eintrag.index.anzahl(vorne) == 3
+    assert eintrag.index.gesamt == len(neu) == 5
@@ -0,0 +1,55 @@
+import pytest
+
+import katalog
+from katalog import aktualisiere_geteilten_katalog, hole_themen_index, katalog_stand, lade_geteilten_katalog
+from quiz_logic import FragenAuswahl, QuizSession
+
+
+@pytest.fixture(params=[False, True], ids=['eager', 'lazy'])
+def lazy(request, monkeypatch):
+    # Der Standardwert von lazy wird beim Import aus QUIZMASTER_LAZY_LADEN gelesen
+    monkeypatch.setattr(katalog.KatalogEintrag.__init__, '__defaults__', (request.param,))
+    return request.param
+
+
+def test_sitzung_kopiert_keine_fragen(pool, lazy):
+    fragen = lade_geteilten_katalog(pool)
+    assert isinstance(fragen, katalog.LazyKatalog) == lazy
+    quiz = QuizSession(fragen, "Alle Themen")
+    assert quiz.katalog is fragen
+    assert isinstance(quiz.fragen, FragenAuswahl)
+    assert quiz.fragen.katalog is fragen
+    assert [frage['frage'] for frage in quiz.fragen] == [frage['frage'] for frage in fragen]
+
+
+def test_aktualisierung_ersetzt_katalog_statt_ihn_zu_aendern(pool, schreibe_thema, lazy):
+    alt = lade_geteilten_katalog(pool)
+    alter_index = hole_themen_index(alt)
+    alter_stand = katalog_stand(alt)
+    quiz = QuizSession(alt, "B", indizes=alter_index.indizes['B'])
+    vorher = [frage['frage'] for frage in quiz.fragen]
+
+    schreibe_thema(pool, 'A', ['A1?', 'A2?', 'A3?', 'A4?', 'A5?'])
+    neu, aenderungen = aktualisiere_geteilten_katalog(pool)
+
+    assert neu is not alt
+    assert aenderungen['aktualisiert'] == ['A']
+    assert katalog_stand(neu) != alter_stand
+    assert katalog_stand(alt) is None
+    # Die laufende Sitzung sieht weiter ihre Fragen im alten Katalog
+    assert quiz.katalog is alt
+    assert [frage['frage'] for frage in quiz.fragen] == vorher
+    assert len(alt) == 4
+    assert hole_themen_index(alt) is alter_index
+
+    neuer_index = hole_themen_index(neu)
+    assert neuer_index.anzahl('A') == 5
+    assert [neu[i]['frage'] for i in neuer_index.indizes['B']] == ['B1?', 'B2?']
+    assert lade_geteilten_katalog(pool) is neu
+
+
+def test_ohne_aenderung_bleibt_der_katalog(pool, lazy):
+    alt = lade_geteilten_katalog(pool)
+    neu, aenderungen = aktualisiere_geteilten_katalog(pool)
+    assert neu is alt
+    assert not any(aenderungen.values())
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+import katalog_snapshot
+from katalog_snapshot import SnapshotKatalog, lade_fragen_mit_snapshot
+
+
+@pytest.fixture
+def inhalts_hashes(monkeypatch):
+    """Zählt, wie oft der Inhalt der Quelldateien gehasht wird."""
+    aufrufe = []
+    original = katalog_snapshot.berechne_inhalts_hash
+
+    def gezaehlt(pfad):
+        aufrufe.append(pfad)
+        return original(pfad)
+
+    monkeypatch.setattr(katalog_snapshot, 'berechne_inhalts_hash', gezaehlt)
+    return aufrufe
+
+
+def test_wiederholter_zugriff_liefert_dasselbe_objekt(pool):
+    katalog = lade_fragen_mit_snapshot(pool)
+    assert isinstance(katalog, SnapshotKatalog)
+    assert katalog[0] is katalog[0]
+    assert katalog[-1] is katalog[len(katalog) - 1]
+    assert sorted(frage['frage'] for frage in katalog) == ['A1?', 'A2?', 'B1?', 'B2?']
+
+
+def test_cache_groesse_begrenzt_dekodierte_fragen(pool):
+    lade_fragen_mit_snapshot(pool)
+    katalog = SnapshotKatalog(katalog_snapshot.snapshot_pfade(pool)[0], cache_groesse=1)
+    erste = katalog[0]
+    katalog[1]
+    assert katalog[0] is not erste
+    assert katalog[0] == erste
+
+
+def test_unveraenderter_pool_wird_inhalts_hashes_geoeffnet(pool, inhalts_hashes):
+    lade_fragen_mit_snapshot(pool)
+    assert len(inhalts_hashes) == 1
+
+    katalog = lade_fragen_mit_snapshot(pool)
+    assert isinstance(katalog, SnapshotKatalog)
+    assert len(inhalts_hashes) == 1
+
+
+def test_neue_mtime_ohne_inhaltsaenderung_hasht_nur_einmal(pool, inhalts_hashes):
+    erster = lade_fragen_mit_snapshot(pool)
+    datei = os.path.join(pool, 'A', 'fragen.txt')
+    info = os.stat(datei)
+    os.utime(datei, ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+
+    katalog = lade_fragen_mit_snapshot(pool)
+    assert isinstance(katalog, SnapshotKatalog)
+    assert katalog.inhalts_hash == erster.inhalts_hash
+    assert len(inhalts_hashes) == 2
+
+    # Der Metadaten-Hash wurde nachgetragen
+    lade_fragen_mit_snapshot(pool)
+    assert len(inhalts_hashes) == 2
+
+
+def test_geaenderter_inhalt_baut_neuen_snapshot(pool, schreibe_thema):
+    erster = lade_fragen_mit_snapshot(pool)
+    schreibe_thema(pool, 'A', ['A1?', 'A2?', 'A3?'])
+
+    katalog = lade_fragen_mit_snapshot(pool)
+    assert katalog.inhalts_hash != erster.inhalts_hash
+    assert 'A3?' in [frage['frage'] for frage in katalog]
+    # Der bereits geöffnete Katalog bleibt unverändert
+    assert len(erster) == 4
@@ -0,0 +1,45 @@
+import argparse
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import bench_last
+from pool_generator import schreibe_pool
+
+
+def test_perzentil_nach_nearest_rank():
+    werte = [5, 1, 4, 2, 3]
+    assert bench_last.perzentil(werte, 50) == 3
+    assert bench_last.perzentil(werte, 95) == 5
+    assert bench_last.perzentil(werte, 0) == 1
+    assert bench_last.perzentil([], 50) is None
+
+
+def test_obergrenze_ist_die_gesaettigte_stufe():
+    stufen = [
+        {'nutzer': 1, 'reruns_pro_sekunde': 10.0},
+        {'nutzer': 5, 'reruns_pro_sekunde': 40.0},
+        {'nutzer': 10, 'reruns_pro_sekunde': 42.0},
+        {'nutzer': 25, 'reruns_pro_sekunde': 80.0},
+    ]
+    assert bench_last.obergrenze(stufen) == {'nutzer': 5, 'reruns_pro_sekunde': 40.0}
+    assert bench_last.obergrenze(stufen, min_zuwachs=0) == {'nutzer': 25, 'reruns_pro_sekunde': 80.0}
+    assert bench_last.obergrenze([{'nutzer': 1, 'reruns_pro_sekunde': None}]) is None
+
+
+@pytest.mark.skipif(bench_last.AppTest is None, reason="Streamlit AppTest nicht verfügbar")
+def test_stufe_durchlaeuft_ein_quiz(tmp_path, monkeypatch):
+    monkeypatch.setenv('QUIZMASTER_POOL_PFAD', schreibe_pool(str(tmp_path), themen=2, fragen_je_thema=3, seed=1))
+    args = argparse.Namespace(
+        seed=1, denkzeit=[0.0, 0.0], rampe=0.0, durchlaeufe=1, max_fragen=2, timeout=60
+    )
+    ergebnis = bench_last.stufe(2, args, themen=2)
+
+    assert ergebnis['fehler'] == []
+    # Je Nutzer: Menü, Lernmodus, Start, 2 x (Eingabe, Antwort, Weiter), Hauptmenü
+    assert ergebnis['reruns'] == 2 * 10
+    assert set(ergebnis['schritte_p95_ms']) == {'menue', 'lernmodus', 'quiz_start', 'eingabe', 'antwort', 'weiter', 'hauptmenue'}
+    assert ergebnis['p50_ms'] <= ergebnis['p95_ms'] <= ergebnis['p99_ms']
@@ -0,0 +1,48 @@
+from katalog import ThemenIndex
+from pruefungsplan import Pruefungsplan, verteile_proportional
+
+
+def _katalog(anzahlen):
+    fragen = []
+    for thema, anzahl in anzahlen.items():
+        fragen += [{'frage': f"{thema}{i}?", 'antwort': '', 'synonyme': [], 'thema': thema} for i in range(anzahl)]
+    return fragen
+
+
+def test_verteilung_nach_groessten_resten():
+    assert verteile_proportional({'A': 50, 'B': 30, 'C': 20}, 10) == {'A': 5, 'B': 3, 'C': 2}
+    # 7 Plätze auf drei gleich große Themen: der Name entscheidet über den letzten Platz
+    assert verteile_proportional({'B': 10, 'A': 10, 'C': 10}, 7) == {'A': 3, 'B': 2, 'C': 2}
+    assert verteile_proportional({'A': 2, 'B': 1}, 10) == {'A': 2, 'B': 1}
+    assert verteile_proportional({'A': 5}, 0) == {'A': 0}
+
+
+def test_quoten_sind_begrenzt_und_rest_wird_verteilt():
+    index = ThemenIndex(_katalog({'A': 3, 'B': 40, 'C': 60}))
+    plan = Pruefungsplan(20, quoten={'A': 5, 'X': 4})
+    quoten = plan.quoten_fuer(index)
+    assert quoten['A'] == 3
+    assert 'X' not in quoten
+    assert sum(quoten.values()) == 20
+    assert quoten['C'] > quoten['B']
+
+
+def test_geschichtete_ziehung_ist_reproduzierbar_und_ohne_doppelte():
+    fragen = _katalog({'A': 30, 'B': 60, 'C': 10})
+    index = ThemenIndex(fragen)
+    plan = Pruefungsplan(20, seed=7)
+
+    indizes = plan.ziehe_indizes(index)
+    assert indizes == Pruefungsplan(20, seed=7).ziehe_indizes(index)
+    assert len(set(indizes)) == 20
+
+    je_thema = {}
+    for i in indizes:
+        je_thema[fragen[i]['thema']] = je_thema.get(fragen[i]['thema'], 0) + 1
+    assert je_thema == plan.quoten_fuer(index) == {'A': 6, 'B': 12, 'C': 2}
+    assert [frage['frage'] for frage in plan.ziehe_fragen(fragen, index)] == [fragen[i]['frage'] for i in indizes]
+
+
+def test_pruefung_groesser_als_pool_nimmt_alle_fragen():
+    fragen = _katalog({'A': 2, 'B': 3})
+    assert sorted(Pruefungsplan(40, seed=1).ziehe_indizes(ThemenIndex(fragen))) == list(range(5))
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+import quiz_api
+
+
+@pytest.fixture
+def api(tmp_path, schreibe_thema, monkeypatch):
+    pfad = str(tmp_path / 'api_pool')
+    schreibe_thema(pfad, 'Kreislauf', ['Was misst man am Oberarm?'], synonyme=['Blutdruck'])
+    monkeypatch.setattr(quiz_api, 'POOL_PFAD', pfad)
+    monkeypatch.setattr(quiz_api, '_katalog_stand', (None, 0.0, None))
+
+    def anfrage(methode, pfad, daten=None):
+        koerper = json.dumps(daten).encode('utf-8') if daten is not None else b''
+        status, antwort, _ = quiz_api.verarbeite(methode, pfad, b'', koerper)
+        return status, json.loads(antwort) if antwort else None
+
+    return anfrage
+
+
+def test_bewerten_nutzt_eingestellte_tippfehler(api, monkeypatch):
+    monkeypatch.setattr(quiz_api, 'STANDARD_MAX_TIPPFEHLER', 0)
+    assert api('POST', '/bewerten', {'index': 0, 'antwort': 'Blutdruk'})[1]['korrekt'] is False
+
+    monkeypatch.setattr(quiz_api, 'STANDARD_MAX_TIPPFEHLER', 1)
+    status, ergebnis = api('POST', '/bewerten', {'index': 0, 'antwort': 'Blutdruk'})
+    assert status == 200 and ergebnis['korrekt'] is True
+    status, ergebnis = api('POST', '/bewerten', {'antworten': [{'index': 0, 'antwort': 'Blutdruk'}]})
+    assert status == 200 and ergebnis['ergebnisse'] == [True]
+
+
+def test_sitzung_antwort_bewertet_aktuelle_frage(api):
+    status, sitzung = api('POST', '/sitzungen', {'thema': 'Kreislauf'})
+    assert status == 201
+    token = sitzung['token']
+
+    status, ergebnis = api('POST', f'/sitzungen/{token}/antwort', {'antwort': 'Blutdruck'})
+    assert status == 200
+    assert ergebnis['korrekt'] is True
+    assert ergebnis['musterloesung'] == 'Antwort Was misst man am Oberarm?'
+
+    api('POST', f'/sitzungen/{token}/weiter')
+    status, ergebnis = api('POST', f'/sitzungen/{token}/antwort', {'antwort': 'Blutdruck'})
+    assert status == 409
+    assert api('DELETE', f'/sitzungen/{token}') == (204, None)
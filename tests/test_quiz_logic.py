@@ -0,0 +1,56 @@
+from katalog import KatalogEintrag, hole_themen_index
+from quiz_logic import QuizSession, sitzung_aus_zustand
+
+
+class ZaehlenderKatalog(list):
+    """Liste, die Zugriffe auf einzelne Fragen mitzählt."""
+    __slots__ = ('themen_index', 'zugriffe')
+
+    def __getitem__(self, index):
+        self.zugriffe += 1
+        return super().__getitem__(index)
+
+
+def test_fingerabdruck_liest_keine_fragen_bei_bekanntem_stand(pool):
+    eintrag = KatalogEintrag(pool, lazy=False)
+    katalog = ZaehlenderKatalog(eintrag.fragen)
+    katalog.themen_index = eintrag.index
+    katalog.zugriffe = 0
+
+    quiz = QuizSession(katalog, "Alle Themen")
+    assert quiz.fingerabdruck()
+    assert katalog.zugriffe == 0
+
+
+def test_fingerabdruck_unterscheidet_auswahl_und_stand(pool, schreibe_thema):
+    eintrag = KatalogEintrag(pool, lazy=False)
+    alt = eintrag.fragen
+    index = hole_themen_index(alt)
+    a = QuizSession(alt, "A", indizes=index.indizes['A'])
+    b = QuizSession(alt, "B", indizes=index.indizes['B'])
+    assert a.fingerabdruck() != b.fingerabdruck()
+
+    zustand = a.zustand()
+    assert sitzung_aus_zustand(alt, zustand) is not None
+
+    # Gleich viele Fragen, aber anderer Text: der neue Stand passt nicht mehr
+    schreibe_thema(pool, 'A', ['A1 neu?', 'A2 neu?'])
+    eintrag.signaturen = {thema: None for thema in eintrag.signaturen}
+    eintrag.aktualisieren()
+    assert eintrag.fragen is not alt
+    assert sitzung_aus_zustand(eintrag.fragen, zustand) is None
+    # Über dem alten Katalog lässt sich die Sitzung weiter wiederherstellen
+    assert sitzung_aus_zustand(alt, zustand) is not None
+
+
+def test_fingerabdruck_ohne_stand_nutzt_fragentexte():
+    fragen = [
+        {'frage': 'Eins?', 'antwort': 'eins', 'synonyme': [], 'thema': 'T'},
+        {'frage': 'Zwei?', 'antwort': 'zwei', 'synonyme': [], 'thema': 'T'},
+    ]
+    zustand = QuizSession(fragen, "T").zustand()
+    assert sitzung_aus_zustand(list(fragen), zustand) is not None
+
+    geaendert = [dict(fragen[0], frage='Drei?'), fragen[1]]
+    assert sitzung_aus_zustand(geaendert, zustand) is None
+
@@ -0,0 +1,108 @@
+import gc
+import time
+
+import pytest
+
+from quiz_logic import QuizSession, WiederholungsSession
+from sitzungsbudget import SitzungsRegister
+
+
+def _fragen(anzahl=30):
+    return [{'frage': f"F{i}", 'antwort': "richtig", 'synonyme': ["richtig"], 'thema': f"T{i % 3}"} for i in range(anzahl)]
+
+
+def _beantwortet(klasse=QuizSession, antworten=("richtig", "falsch", "richtig")):
+    quiz = klasse(_fragen(), "Lernmodus", shuffle=True)
+    for antwort in antworten:
+        quiz.submit_answer(antwort)
+        quiz.next_question()
+    return quiz
+
+
+@pytest.fixture(autouse=True)
+def ohne_hintergrund_thread(monkeypatch):
+    # aufraeumen() wird in den Tests direkt aufgerufen
+    monkeypatch.setattr(SitzungsRegister, '_starte_aufraeumen', lambda self: None)
+
+
+@pytest.mark.parametrize('klasse', [QuizSession, WiederholungsSession])
+def test_kompaktieren_und_entpacken_erhalten_den_zustand(klasse):
+    quiz = _beantwortet(klasse)
+    vorher = quiz.zustand()
+    bedarf = quiz.speicherbedarf()
+
+    assert quiz.kompaktiere() > 0
+    assert quiz.ist_kompaktiert
+    assert quiz.speicherbedarf() < bedarf
+    assert quiz.kompaktiere() == 0
+
+    assert quiz.entpacke()
+    assert not quiz.ist_kompaktiert
+    assert quiz.zustand() == vorher
+    assert quiz.get_current_question()['frage'] == quiz.katalog[quiz._reihenfolge[3]]['frage']
+
+
+def test_ruhende_sitzung_ueber_budget_wird_kompaktiert_und_beim_betreten_entpackt():
+    register = SitzungsRegister(sitzung_budget_kb=0.001, gesamt_budget_mb=0, leerlauf_s=0, budget_leerlauf_s=0)
+    quiz = _beantwortet()
+    vorher = quiz.zustand()
+    register.betrete('s')
+    register.verlasse('s', quiz)
+
+    assert register.aufraeumen() == 1
+    assert quiz.ist_kompaktiert
+    assert register.uebersicht()['kompaktiert'] == 1
+
+    assert register.betrete('s') is True
+    assert not quiz.ist_kompaktiert
+    assert quiz.zustand() == vorher
+
+
+def test_aktive_sitzung_wird_nie_kompaktiert():
+    register = SitzungsRegister(sitzung_budget_kb=0.001, gesamt_budget_mb=0, leerlauf_s=0, budget_leerlauf_s=0)
+    quiz = _beantwortet()
+    register.verlasse('s', quiz)
+    register.betrete('s')  # Rerun läuft
+
+    assert register.aufraeumen() == 0
+    assert not quiz.ist_kompaktiert
+
+
+def test_budget_gilt_erst_nach_der_mindestruhe():
+    register = SitzungsRegister(sitzung_budget_kb=0.001, gesamt_budget_mb=0, leerlauf_s=0, budget_leerlauf_s=3600)
+    quiz = _beantwortet()
+    register.verlasse('s', quiz)
+    assert register.aufraeumen() == 0
+
+
+def test_leerlauf_kompaktiert_auch_kleine_sitzungen():
+    register = SitzungsRegister(sitzung_budget_kb=0, gesamt_budget_mb=0, leerlauf_s=0.01, budget_leerlauf_s=0)
+    quiz = _beantwortet()
+    register.verlasse('s', quiz)
+    time.sleep(0.02)
+    assert register.aufraeumen() == 1
+
+
+def test_gesamtbudget_kompaktiert_die_am_laengsten_ruhenden_zuerst():
+    register = SitzungsRegister(sitzung_budget_kb=0, gesamt_budget_mb=1, leerlauf_s=0, budget_leerlauf_s=0)
+    sitzungen = {name: _beantwortet() for name in ('alt', 'mittel', 'neu')}
+    for name, quiz in sitzungen.items():
+        register.verlasse(name, quiz)
+    je_sitzung = register.uebersicht()['gesamt_bytes'] // 3
+    # Platz für knapp zwei Sitzungen: nur die älteste muss weichen
+    register.gesamt_budget = 2 * je_sitzung + je_sitzung // 2
+
+    assert register.aufraeumen() == 1
+    assert [name for name, quiz in sitzungen.items() if quiz.ist_kompaktiert] == ['alt']
+
+
+def test_geschlossene_sitzungen_werden_vergessen():
+    register = SitzungsRegister(sitzung_budget_kb=0, gesamt_budget_mb=0, leerlauf_s=600, budget_leerlauf_s=0)
+    quiz = _beantwortet()
+    register.verlasse('s', quiz)
+    assert len(register.uebersicht()['sitzungen']) == 1
+
+    del quiz
+    gc.collect()
+    register.aufraeumen()
+    assert 's' not in register._eintraege
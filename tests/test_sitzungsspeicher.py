@@ -0,0 +1,88 @@
+import sqlite3
+
+import pytest
+
+from katalog import KatalogEintrag
+from quiz_logic import QuizSession, WiederholungsSession
+from sitzungsspeicher import SitzungsSpeicher
+
+
+@pytest.fixture
+def speicher(tmp_path):
+    # Sehr langes Intervall: geschrieben wird nur bei flush() im Test
+    speicher = SitzungsSpeicher(str(tmp_path / 'sitzungen.db'), flush_intervall=3600)
+    yield speicher
+    speicher.schliessen()
+
+
+@pytest.fixture
+def fragen(pool):
+    return KatalogEintrag(pool, lazy=False).fragen
+
+
+def _zeilen(speicher):
+    with sqlite3.connect(speicher.pfad) as verbindung:
+        return dict(verbindung.execute("SELECT token, zustand FROM sitzungen"))
+
+
+def test_aenderungen_werden_gesammelt_geschrieben(speicher, fragen):
+    quiz = QuizSession(fragen, "Alle Themen")
+    speicher.speichere('a', quiz)
+    quiz.submit_answer("Antwort A1?")
+    speicher.speichere('a', quiz)
+    speicher.speichere('b', QuizSession(fragen, "Alle Themen"))
+    assert _zeilen(speicher) == {}
+
+    # Beide Stände von 'a' ergeben einen Schreibvorgang
+    assert speicher.flush() == 2
+    assert set(_zeilen(speicher)) == {'a', 'b'}
+    assert speicher.flush() == 0
+
+    # Unveränderte Sitzungen werden nicht erneut vorgemerkt
+    speicher.speichere('a', quiz)
+    assert speicher.flush() == 0
+
+
+def test_laden_vor_und_nach_dem_schreiben(speicher, fragen):
+    quiz = QuizSession(fragen, "Alle Themen")
+    quiz.submit_answer("Antwort A1?")
+    speicher.speichere('a', quiz)
+
+    vor_flush = speicher.lade('a', fragen)
+    assert vor_flush.user_antworten == ["Antwort A1?"]
+    speicher.flush()
+    nach_flush = speicher.lade('a', fragen)
+    assert nach_flush.antwort_historie[0] == quiz.antwort_historie[0]
+    assert nach_flush.current_index == quiz.current_index
+    assert speicher.lade('unbekannt', fragen) is None
+
+
+def test_art_der_sitzung_bleibt_erhalten(speicher, fragen):
+    speicher.speichere('w', WiederholungsSession(fragen, "Alle Themen"))
+    speicher.flush()
+    assert isinstance(speicher.lade('w', fragen), WiederholungsSession)
+
+
+def test_loeschen_ist_ebenfalls_gesammelt(speicher, fragen):
+    speicher.speichere('a', QuizSession(fragen, "Alle Themen"))
+    speicher.flush()
+
+    assert speicher.loesche('a') is True
+    assert speicher.lade('a', fragen) is None
+    assert 'a' in _zeilen(speicher)
+    speicher.flush()
+    assert _zeilen(speicher) == {}
+    assert speicher.loesche('a') is False
+
+
+def test_schliessen_schreibt_ausstehende_aenderungen(tmp_path, fragen):
+    pfad = str(tmp_path / 'sitzungen.db')
+    speicher = SitzungsSpeicher(pfad, flush_intervall=3600)
+    speicher.speichere('a', QuizSession(fragen, "Alle Themen"))
+    speicher.schliessen()
+
+    wieder = SitzungsSpeicher(pfad, flush_intervall=3600)
+    try:
+        assert wieder.lade('a', fragen) is not None
+    finally:
+        wieder.schliessen()
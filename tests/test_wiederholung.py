@@ -0,0 +1,57 @@
+from quiz_logic import LEITNER_INTERVALLE, WiederholungsSession, sitzung_aus_zustand
+
+
+def _fragen(anzahl):
+    return [{'frage': f"F{i}", 'antwort': "richtig", 'synonyme': ["richtig"], 'thema': "T"} for i in range(anzahl)]
+
+
+def _beantworte(quiz, korrekt):
+    frage = quiz.get_current_question()['frage']
+    quiz.submit_answer("richtig" if korrekt else "falsch")
+    quiz.next_question()
+    return frage
+
+
+def test_falsche_antwort_kommt_nach_dem_ersten_intervall_wieder():
+    assert LEITNER_INTERVALLE[:2] == (2, 5)
+    quiz = WiederholungsSession(_fragen(3), "Lernmodus")
+    gestellt = [_beantworte(quiz, korrekt) for korrekt in (False, True, True)]
+    # F0 ist nach zwei weiteren Antworten fällig, vor allen anderen
+    gestellt.append(_beantworte(quiz, True))
+    # Nichts fällig und keine neue Frage: die am frühesten fällige (F1)
+    gestellt.append(_beantworte(quiz, True))
+    assert gestellt == ["F0", "F1", "F2", "F0", "F1"]
+
+
+def test_sitzung_endet_wenn_alles_gelernt_ist():
+    quiz = WiederholungsSession(_fragen(3), "Lernmodus")
+    antworten = 0
+    while not quiz.is_finished():
+        _beantworte(quiz, True)
+        antworten += 1
+        assert antworten <= 20
+    assert antworten == 3 * len(LEITNER_INTERVALLE)
+    assert quiz.gelernt == 3
+    assert quiz.get_progress()['percentage'] == 100
+
+
+def test_jede_gestellte_frage_wird_nur_einmal_bewertet():
+    quiz = WiederholungsSession(_fragen(2), "Lernmodus")
+    assert quiz.submit_answer("falsch") is False
+    assert quiz.submit_answer("richtig") is False
+    assert list(quiz.antwort_historie) == [False]
+    assert quiz.undo() is False
+
+
+def test_zustand_setzt_den_plan_fort():
+    fragen = _fragen(4)
+    quiz = WiederholungsSession(fragen, "Lernmodus", shuffle=True)
+    for korrekt in (False, True, True):
+        _beantworte(quiz, korrekt)
+
+    wieder = sitzung_aus_zustand(fragen, quiz.zustand())
+    assert isinstance(wieder, WiederholungsSession)
+    while not quiz.is_finished():
+        assert _beantworte(wieder, True) == _beantworte(quiz, True)
+    assert wieder.is_finished()
+    assert wieder.gelernt == quiz.gelernt == 4
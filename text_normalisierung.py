@@ -0,0 +1,103 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+# Anzahl vorgehaltener normalisierter Wörter (Antworten wiederholen sich stark)
+TOKEN_CACHE_GROESSE = 200000
+
+# Anzahl vorgehaltener Vergleichsformen ganzer Antworten (siehe vergleichsform)
+ANTWORT_CACHE_GROESSE = 65536
+
+# Trennzeichen zwischen Wörtern: Leerraum, Binde- und Gedankenstriche, Schrägstriche
+_TRENNER = re.compile(r'[\s\-‐-―_/]+')
+
+# Umlaute werden wie ihre Umschreibung behandelt ("ä" == "ae")
+_UMLAUTE = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue'})
+
+# Leichte Stammformreduktion: höchstens eine dieser Endungen wird entfernt
+_ENDUNGEN = ('ern', 'en', 'er', 'es', 'e', 'n', 's')
+_MIN_STAMM_LAENGE = 4
+
+@lru_cache(maxsize=TOKEN_CACHE_GROESSE)
+def normalisiere_wort(wort, stemming=False):
+    """
+    Normalisiert ein einzelnes Wort für den Antwortvergleich.
+
+    Schritte: Türkisches İ/ı -> i, Casefolding (ß -> ss), Umlaute -> ae/oe/ue,
+    Entfernen weiterer diakritischer Zeichen (ş -> s, é -> e) und aller
+    Satzzeichen. Optional wird eine häufige deutsche Endung abgeschnitten.
+
+    Args:
+        wort (str): Ein Wort ohne Leerraum
+        stemming (bool): Ob eine Endung entfernt werden soll
+
+    Returns:
+        str: Das normalisierte Wort (kann leer sein)
+    """
+    text = unicodedata.normalize('NFC', wort).replace('İ', 'i').replace('ı', 'i')
+    text = text.casefold().translate(_UMLAUTE)
+    text = ''.join(
+        zeichen for zeichen in unicodedata.normalize('NFKD', text)
+        if zeichen.isalnum() and not unicodedata.combining(zeichen)
+    )
+    if stemming:
+        for endung in _ENDUNGEN:
+            if text.endswith(endung) and len(text) - len(endung) >= _MIN_STAMM_LAENGE:
+                return text[:-len(endung)]
+    return text
+
+def zerlege_woerter(text, stemming=False):
+    """
+    Zerlegt einen Text an Leerraum und Bindestrichen in normalisierte Wörter.
+
+    Returns:
+        list: Normalisierte, nicht-leere Wörter in Textreihenfolge
+    """
+    woerter = (normalisiere_wort(wort, stemming) for wort in _TRENNER.split(text))
+    return [wort for wort in woerter if wort]
+
+def normalisiere_text(text, stemming=False):
+    """
+    Normalisiert einen Text zu einer kompakten Vergleichsform.
+
+    Die normalisierten Wörter werden ohne Trenner aneinandergehängt, sodass
+    "Blut-Druck Messung" und "Blutdruckmessung" dieselbe Form ergeben.
+
+    Args:
+        text (str): Antwort oder Synonym
+        stemming (bool): Ob je Wort eine Endung entfernt werden soll
+
+    Returns:
+        str: Kompakte Vergleichsform
+    """
+    return ''.join(zerlege_woerter(text, stemming))
+
+def normalisiere_synonym(text):
+    """
+    Normalisiert ein Synonym für die Ablage im Katalog.
+
+    Anders als bei normalisiere_text() bleiben die Wortgrenzen als einzelne
+    Leerzeichen erhalten ("Kinder-Betten" -> "kinder betten"). So kann der
+    Matcher mit stemming jedes Wort einzeln kürzen, genau wie die Antwort.
+    """
+    return ' '.join(zerlege_woerter(text))
+
+@lru_cache(maxsize=ANTWORT_CACHE_GROESSE)
+def vergleichsform(text, stemming=False):
+    """
+    Zerlegt und normalisiert eine Antwort, einmal je Antworttext.
+
+    Gleiche Antworten (z.B. bei vielen Prüflingen oder erneutem Absenden)
+    werden nicht erneut zerlegt. Die Wörter bleiben durch ein Leerzeichen
+    getrennt, damit ein Begriff nicht über eine Wortgrenze hinweg gefunden
+    wird ("bar mitte" enthält nicht "arm").
+
+    Args:
+        text (str): Antwort des Benutzers
+        stemming (bool): Ob je Wort eine Endung entfernt werden soll
+
+    Returns:
+        tuple: (Vergleichsform mit einzelnen Leerzeichen zwischen den Wörtern, Wörter als Tupel)
+    """
+    woerter = tuple(zerlege_woerter(text, stemming))
+    return ' '.join(woerter), woerter